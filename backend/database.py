@@ -7,8 +7,20 @@ from sqlalchemy.orm import sessionmaker
 DATABASE_PATH = os.environ.get("DATABASE_PATH", "./db.sqlite3")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 
+# Sync endpoints run in AnyIO's threadpool (40 threads by default), each
+# holding a session for the whole request. SQLAlchemy's default QueuePool
+# (5 + 10 overflow) makes the rest wait for a connection, so size the pool to
+# the threadpool. Raise DB_POOL_SIZE / DB_MAX_OVERFLOW together with the
+# worker thread count. SQLite connections are local file handles, so
+# pool_pre_ping / pool_recycle would only add work on checkout.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
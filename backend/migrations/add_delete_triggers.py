@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Database migration: Add delete triggers for member tables
+---------------------------------------------------------
+managed_by_id refers to a user or a guest depending on managed_by_type, so it
+cannot carry a foreign key with ON DELETE SET NULL. Instead, AFTER DELETE
+triggers on group_members and guest_members clear the managed_by fields of
+everyone the deleted row was managing. Deleting a guest also cascades to its
+expense splits and to the expenses it paid for, which share the same
+polymorphic user/guest id columns. The routers then remove a member or guest
+with a single DELETE and no follow-up statements.
+
+New databases get the triggers from models.py when the tables are created;
+this script installs them on existing databases.
+
+Usage:
+    python migrations/add_delete_triggers.py [--dry-run] [--db-path <path>]
+
+Options:
+    --dry-run       Show what would be done without making changes
+    --db-path       Path to SQLite database (default: db.sqlite3)
+"""
+
+import sqlite3
+import sys
+import argparse
+from contextlib import closing
+from pathlib import Path
+
+
+class MigrationError(Exception):
+    """Custom exception for migration errors"""
+    pass
+
+
+# (trigger name, table, CREATE TRIGGER statement) - keep in sync with models.py
+TRIGGERS = [
+    ("trg_group_members_unlink_managed", "group_members", """
+        CREATE TRIGGER IF NOT EXISTS trg_group_members_unlink_managed
+        AFTER DELETE ON group_members
+        BEGIN
+            UPDATE guest_members SET managed_by_id = NULL, managed_by_type = NULL
+            WHERE group_id = OLD.group_id AND managed_by_id = OLD.user_id AND managed_by_type = 'user';
+            UPDATE group_members SET managed_by_id = NULL, managed_by_type = NULL
+            WHERE group_id = OLD.group_id AND managed_by_id = OLD.user_id AND managed_by_type = 'user';
+        END
+    """),
+    ("trg_guest_members_unlink_managed", "guest_members", """
+        CREATE TRIGGER IF NOT EXISTS trg_guest_members_unlink_managed
+        AFTER DELETE ON guest_members
+        BEGIN
+            UPDATE guest_members SET managed_by_id = NULL, managed_by_type = NULL
+            WHERE managed_by_id = OLD.id AND managed_by_type = 'guest';
+            UPDATE group_members SET managed_by_id = NULL, managed_by_type = NULL
+            WHERE managed_by_id = OLD.id AND managed_by_type = 'guest';
+        END
+    """),
+    ("trg_guest_members_cascade_expenses", "guest_members", """
+        CREATE TRIGGER IF NOT EXISTS trg_guest_members_cascade_expenses
+        AFTER DELETE ON guest_members
+        BEGIN
+            DELETE FROM expense_splits WHERE user_id = OLD.id AND is_guest = 1;
+            DELETE FROM expenses WHERE payer_id = OLD.id AND payer_is_guest = 1;
+        END
+    """),
+]
+
+
+def get_existing_triggers(cursor):
+    """Return the names of all triggers in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_existing_tables(cursor):
+    """Return the names of all tables in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def run_migration(db_path, dry_run=False):
+    """
+    Run the migration to add the delete triggers
+
+    Args:
+        db_path: Path to the SQLite database file
+        dry_run: If True, only show what would be done
+
+    Returns:
+        bool: True if migration completed successfully
+    """
+    print(f"{'[DRY RUN] ' if dry_run else ''}Starting migration...")
+    print(f"Database: {db_path}")
+    print()
+
+    # Check if database exists
+    if not Path(db_path).exists():
+        raise MigrationError(f"Database file not found: {db_path}")
+
+    # Connect to database; closing() releases the connection and the
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        cursor = conn.cursor()
+
+        tables = get_existing_tables(cursor)
+        missing_tables = {table for _, table, _ in TRIGGERS} - tables
+        if missing_tables:
+            raise MigrationError(f"Tables not found in database: {', '.join(sorted(missing_tables))}")
+
+        existing = get_existing_triggers(cursor)
+        pending = [(name, sql) for name, _, sql in TRIGGERS if name not in existing]
+
+        for name, _, _ in TRIGGERS:
+            if name in existing:
+                print(f"✓ {name} trigger already exists")
+
+        if not pending:
+            print()
+            print("✓ Migration already applied - no changes needed!")
+            return True
+
+        print()
+        print("Changes to be applied:")
+        for i, (name, _) in enumerate(pending, 1):
+            print(f"  {i}. Add trigger {name}")
+        print()
+
+        if dry_run:
+            print("[DRY RUN] Migration would complete successfully")
+            print("[DRY RUN] No changes were made to the database")
+            return True
+
+        try:
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
+
+                for name, sql in pending:
+                    cursor.execute(sql)
+                    print(f"✓ {name} trigger added")
+
+                # Verify changes
+                print()
+                print("Verifying changes...")
+
+                missing = {name for name, _ in pending} - get_existing_triggers(cursor)
+                if missing:
+                    raise MigrationError(f"Verification failed: triggers not found: {', '.join(sorted(missing))}")
+
+                print("✓ All changes verified successfully")
+                print()
+
+        except Exception as e:
+            raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
+
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Changes applied: {len(pending)}")
+
+        return True
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Add member delete triggers to Splitwiser database",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run migration on default database
+  python migrations/add_delete_triggers.py
+
+  # Dry run to see what would change
+  python migrations/add_delete_triggers.py --dry-run
+
+  # Run migration on specific database
+  python migrations/add_delete_triggers.py --db-path /path/to/db.sqlite3
+        """
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be done without making changes"
+    )
+
+    parser.add_argument(
+        "--db-path",
+        default="db.sqlite3",
+        help="Path to SQLite database file (default: db.sqlite3)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        success = run_migration(args.db_path, dry_run=args.dry_run)
+        sys.exit(0 if success else 1)
+
+    except MigrationError as e:
+        print()
+        print(f"❌ Migration Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        print()
+        print("❌ Migration cancelled by user", file=sys.stderr)
+        sys.exit(1)
+
+    except Exception as e:
+        print()
+        print(f"❌ Unexpected error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,30 @@ Adds indexes to improve performance of friend expense and balance queries.
 
 import sqlite3
 import os
+from contextlib import closing
+
+# Covering definition of idx_expense_splits_user_guest
+SPLITS_INDEX_COLUMNS = ["user_id", "is_guest", "expense_id"]
+
+# Replaces an older idx_expense_splits_user_guest with the covering definition
+REBUILD_SPLITS_INDEX_SQL = [
+    "DROP INDEX IF EXISTS idx_expense_splits_user_guest",
+    f"""CREATE INDEX idx_expense_splits_user_guest
+                ON expense_splits({", ".join(SPLITS_INDEX_COLUMNS)})""",
+]
+
+FRIENDSHIP_INDEX_SQL = [
+    """CREATE INDEX IF NOT EXISTS idx_friendships_pair
+                ON friendships(user_id1, user_id2)""",
+    """CREATE INDEX IF NOT EXISTS idx_friendships_pair_reverse
+                ON friendships(user_id2, user_id1)""",
+]
+
+def get_index_columns(cursor, index_name):
+    """Return an index's column names in order ([] if the index does not exist)"""
+    return [row[0] for row in cursor.execute(
+        "SELECT name FROM pragma_index_info(?) ORDER BY seqno", (index_name,)
+    )]
 
 def run_migration():
     # Find the database
@@ -18,58 +42,62 @@ def run_migration():
     
     print(f"Using database: {db_path}")
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
     try:
-        # Index for expense_splits lookups by user_id and is_guest
-        # This helps the subqueries that find expenses where a user is a participant
-        print("Creating index on expense_splits(user_id, is_guest)...")
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_expense_splits_user_guest 
-            ON expense_splits(user_id, is_guest)
-        """)
-        print("✓ Created idx_expense_splits_user_guest")
-        
-        # Index for guest_members lookups by group_id and managed_by_id
-        # This helps the managed guest queries
-        print("Creating index on guest_members(group_id, managed_by_id)...")
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_guest_members_group_managed 
-            ON guest_members(group_id, managed_by_id)
-        """)
-        print("✓ Created idx_guest_members_group_managed")
-        
-        # Index for group_members lookups by group_id and managed_by_id
-        # This helps the managed member queries
-        print("Creating index on group_members(group_id, managed_by_id)...")
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_group_members_group_managed 
-            ON group_members(group_id, managed_by_id)
-        """)
-        print("✓ Created idx_group_members_group_managed")
-        
-        # Index for group_members lookups by user_id
-        # This helps finding groups a user is in
-        print("Creating index on group_members(user_id)...")
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_group_members_user_id 
-            ON group_members(user_id)
-        """)
-        print("✓ Created idx_group_members_user_id")
-        
-        conn.commit()
+        # closing() releases the connection; `with conn:` rolls back if the
+        # script fails part-way
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            cursor = conn.cursor()
+
+            # All indexes are created in one script and one transaction: a single
+            # schema-write lock and a single fsync at COMMIT.
+            #
+            # idx_expense_splits_user_guest covers expense_id as well, so the
+            # "expenses where this user/guest is a participant" subqueries are
+            # answered from the index alone without touching the table rows.
+            # Older databases have a two-column version; only then is it dropped
+            # so the covering definition replaces it - an index that already
+            # matches is left alone instead of being rebuilt on every run.
+            #
+            # Friendships are looked up in both orientations (user_id1, user_id2)
+            # and (user_id2, user_id1), so each gets its own index to seek on.
+            splits_columns = get_index_columns(cursor, "idx_expense_splits_user_guest")
+            if splits_columns == SPLITS_INDEX_COLUMNS:
+                splits_index_sql = ""
+            else:
+                splits_index_sql = "".join(f"{sql};\n" for sql in REBUILD_SPLITS_INDEX_SQL)
+            friendship_index_sql = "".join(f"{sql};\n" for sql in FRIENDSHIP_INDEX_SQL)
+
+            print("Creating friend query indexes...")
+            cursor.executescript(f"""
+                BEGIN;
+                {splits_index_sql}
+                CREATE INDEX IF NOT EXISTS idx_guest_members_group_managed
+                ON guest_members(group_id, managed_by_id);
+
+                CREATE INDEX IF NOT EXISTS idx_group_members_group_managed
+                ON group_members(group_id, managed_by_id);
+
+                CREATE INDEX IF NOT EXISTS idx_group_members_user_id
+                ON group_members(user_id);
+
+                {friendship_index_sql}
+                COMMIT;
+            """)
+            if splits_index_sql:
+                print("✓ Created idx_expense_splits_user_guest (user_id, is_guest, expense_id)")
+            else:
+                print("✓ idx_expense_splits_user_guest already covers (user_id, is_guest, expense_id)")
+            print("✓ Created idx_guest_members_group_managed")
+            print("✓ Created idx_group_members_group_managed")
+            print("✓ Created idx_group_members_user_id")
+            print("✓ Created idx_friendships_pair / idx_friendships_pair_reverse")
+
         print("\n✅ Migration completed successfully!")
         return True
         
     except Exception as e:
         print(f"Error running migration: {e}")
-        conn.rollback()
         return False
-        
-    finally:
-        conn.close()
-
 
 if __name__ == "__main__":
     run_migration()
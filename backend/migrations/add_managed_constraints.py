@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Database migration: Constrain guest manager columns
+---------------------------------------------------
+Adds a CHECK constraint so guest_members.managed_by_type can only be 'user',
+'guest' or NULL, and a partial index on managed_by_id covering only guests
+that actually have a manager. The index keeps the orphan scan in
+cleanup_orphans.py proportional to managed guests instead of the whole table.
+
+SQLite cannot add a CHECK constraint to an existing table, so the table is
+rebuilt: the current CREATE TABLE statement gets the constraint appended, the
+rows are copied across and the existing indexes are recreated, all in one
+transaction.
+
+Usage:
+    python migrations/add_managed_constraints.py [--dry-run] [--db-path <path>]
+
+Options:
+    --dry-run       Show what would be done without making changes
+    --db-path       Path to SQLite database (default: db.sqlite3)
+"""
+
+import sqlite3
+import sys
+import argparse
+from contextlib import closing
+from pathlib import Path
+
+
+class MigrationError(Exception):
+    """Custom exception for migration errors"""
+    pass
+
+
+CHECK_NAME = "ck_guest_members_managed_by_type"
+CHECK_CONSTRAINT = (
+    f"CONSTRAINT {CHECK_NAME} "
+    "CHECK (managed_by_type IN ('user', 'guest') OR managed_by_type IS NULL)"
+)
+
+PARTIAL_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_gm_managed
+    ON guest_members(managed_by_id) WHERE managed_by_id IS NOT NULL
+"""
+
+
+def get_table_sql(cursor, table_name):
+    """Return the CREATE TABLE statement stored for a table, or None"""
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name=?",
+        (table_name,)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def get_index_sql(cursor, table_name):
+    """Return the CREATE INDEX statements of a table's explicit indexes"""
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+        (table_name,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def get_trigger_sql(cursor, table_name):
+    """Return (name, CREATE TRIGGER statement) of every trigger that mentions a table"""
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type='trigger' AND (tbl_name=? OR sql LIKE '%' || ? || '%')",
+        (table_name, table_name)
+    )
+    return cursor.fetchall()
+
+
+def get_row_count(cursor, table_name):
+    """Get the number of rows in a table"""
+    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+    return cursor.fetchone()[0]
+
+
+def rebuild_with_check(cursor, table_sql):
+    """Recreate guest_members with CHECK_CONSTRAINT, keeping rows, indexes and triggers"""
+    index_sql = get_index_sql(cursor, "guest_members")
+
+    # ALTER TABLE ... RENAME refuses to run while any trigger refers to a
+    # table that does not exist, so triggers on or touching guest_members
+    # are dropped for the rebuild and recreated afterwards
+    trigger_sql = get_trigger_sql(cursor, "guest_members")
+    for name, _ in trigger_sql:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(guest_members)")]
+    column_list = ", ".join(columns)
+
+    # Append the constraint before the closing parenthesis of the definition
+    body, _, _ = table_sql.rpartition(")")
+    new_sql = body.rstrip().replace("guest_members", "guest_members_new", 1) + f",\n\t{CHECK_CONSTRAINT}\n)"
+
+    cursor.execute(new_sql)
+    cursor.execute(
+        f"INSERT INTO guest_members_new ({column_list}) SELECT {column_list} FROM guest_members"
+    )
+    cursor.execute("DROP TABLE guest_members")
+    cursor.execute("ALTER TABLE guest_members_new RENAME TO guest_members")
+    for sql in index_sql:
+        cursor.execute(sql)
+    for _, sql in trigger_sql:
+        cursor.execute(sql)
+
+
+def run_migration(db_path, dry_run=False):
+    """
+    Run the migration to constrain guest manager columns
+
+    Args:
+        db_path: Path to the SQLite database file
+        dry_run: If True, only show what would be done
+
+    Returns:
+        bool: True if migration completed successfully
+    """
+    print(f"{'[DRY RUN] ' if dry_run else ''}Starting migration...")
+    print(f"Database: {db_path}")
+    print()
+
+    # Check if database exists
+    if not Path(db_path).exists():
+        raise MigrationError(f"Database file not found: {db_path}")
+
+    # Connect to database; closing() releases the connection and the
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        cursor = conn.cursor()
+
+        table_sql = get_table_sql(cursor, "guest_members")
+        if table_sql is None:
+            raise MigrationError("guest_members table not found in database")
+
+        has_check = CHECK_NAME in table_sql
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_gm_managed'")
+        has_index = cursor.fetchone() is not None
+
+        changes_needed = []
+
+        if not has_check:
+            changes_needed.append("Rebuild guest_members with managed_by_type CHECK constraint")
+        else:
+            print("✓ managed_by_type CHECK constraint already exists")
+
+        if not has_index:
+            changes_needed.append("Add partial index idx_gm_managed")
+        else:
+            print("✓ idx_gm_managed index already exists")
+
+        if not changes_needed:
+            print()
+            print("✓ Migration already applied - no changes needed!")
+            return True
+
+        # Rows the constraint would reject must be fixed by hand first
+        cursor.execute("""
+            SELECT id, name, managed_by_type FROM guest_members
+            WHERE managed_by_type IS NOT NULL AND managed_by_type NOT IN ('user', 'guest')
+        """)
+        violations = cursor.fetchall()
+        if violations and not has_check:
+            for guest_id, name, managed_by_type in violations:
+                print(f"  • Guest '{name}' (ID: {guest_id}) has managed_by_type={managed_by_type!r}")
+            raise MigrationError(
+                f"{len(violations)} guest(s) have an invalid managed_by_type; fix them before adding the constraint"
+            )
+
+        guest_count = get_row_count(cursor, "guest_members")
+
+        print()
+        print("Changes to be applied:")
+        for i, change in enumerate(changes_needed, 1):
+            print(f"  {i}. {change}")
+        print()
+
+        if dry_run:
+            print("[DRY RUN] Migration would complete successfully")
+            print("[DRY RUN] No changes were made to the database")
+            return True
+
+        try:
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
+
+                if not has_check:
+                    print("Rebuilding guest_members...")
+                    rebuild_with_check(cursor, table_sql)
+                    print("✓ CHECK constraint added")
+
+                if not has_index:
+                    cursor.execute(PARTIAL_INDEX_SQL)
+                    print("✓ idx_gm_managed index added")
+
+                # Verify changes
+                print()
+                print("Verifying changes...")
+
+                if CHECK_NAME not in get_table_sql(cursor, "guest_members"):
+                    raise MigrationError("Verification failed: CHECK constraint not found after rebuild")
+
+                new_guest_count = get_row_count(cursor, "guest_members")
+                if new_guest_count != guest_count:
+                    raise MigrationError(
+                        f"Data loss detected: expected {guest_count} rows, found {new_guest_count}"
+                    )
+
+                print("✓ All changes verified successfully")
+                print()
+
+        except Exception as e:
+            raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
+
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Guest members: {guest_count}")
+        print(f"  - Changes applied: {len(changes_needed)}")
+
+        return True
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Constrain guest manager columns in Splitwiser database",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run migration on default database
+  python migrations/add_managed_constraints.py
+
+  # Dry run to see what would change
+  python migrations/add_managed_constraints.py --dry-run
+
+  # Run migration on specific database
+  python migrations/add_managed_constraints.py --db-path /path/to/db.sqlite3
+        """
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be done without making changes"
+    )
+
+    parser.add_argument(
+        "--db-path",
+        default="db.sqlite3",
+        help="Path to SQLite database file (default: db.sqlite3)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        success = run_migration(args.db_path, dry_run=args.dry_run)
+        sys.exit(0 if success else 1)
+
+    except MigrationError as e:
+        print()
+        print(f"❌ Migration Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        print()
+        print("❌ Migration cancelled by user", file=sys.stderr)
+        sys.exit(1)
+
+    except Exception as e:
+        print()
+        print(f"❌ Unexpected error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
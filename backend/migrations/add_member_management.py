@@ -16,6 +16,7 @@ Options:
 import sqlite3
 import sys
 import argparse
+from contextlib import closing
 from pathlib import Path
 
 
@@ -26,9 +27,11 @@ class MigrationError(Exception):
 
 def check_column_exists(cursor, table_name, column_name):
     """Check if a column exists in a table"""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = [row[1] for row in cursor.fetchall()]
-    return column_name in columns
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1",
+        (table_name, column_name)
+    )
+    return cursor.fetchone() is not None
 
 
 def verify_table_exists(cursor, table_name):
@@ -65,11 +68,11 @@ def run_migration(db_path, dry_run=False):
     if not Path(db_path).exists():
         raise MigrationError(f"Database file not found: {db_path}")
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Connect to database; closing() releases the connection and each
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        cursor = conn.cursor()
 
-    try:
         # Verify group_members table exists
         print("✓ Checking if group_members table exists...")
         if not verify_table_exists(cursor, "group_members"):
@@ -111,65 +114,57 @@ def run_migration(db_path, dry_run=False):
             print("[DRY RUN] No changes were made to the database")
             return True
 
-        # Begin transaction
-        cursor.execute("BEGIN TRANSACTION")
-
         try:
-            # Add managed_by_id column if needed
-            if not has_managed_by_id:
-                print("Adding managed_by_id column...")
-                cursor.execute(
-                    "ALTER TABLE group_members ADD COLUMN managed_by_id INTEGER DEFAULT NULL"
-                )
-                print("✓ managed_by_id column added")
-
-            # Add managed_by_type column if needed
-            if not has_managed_by_type:
-                print("Adding managed_by_type column...")
-                cursor.execute(
-                    "ALTER TABLE group_members ADD COLUMN managed_by_type TEXT DEFAULT NULL"
-                )
-                print("✓ managed_by_type column added")
-
-            # Verify changes
-            print()
-            print("Verifying changes...")
-
-            if not check_column_exists(cursor, "group_members", "managed_by_id"):
-                raise MigrationError("Verification failed: managed_by_id column not found after creation")
-
-            if not check_column_exists(cursor, "group_members", "managed_by_type"):
-                raise MigrationError("Verification failed: managed_by_type column not found after creation")
-
-            # Check that no data was lost
-            new_member_count = get_row_count(cursor, "group_members")
-            if new_member_count != member_count:
-                raise MigrationError(
-                    f"Data loss detected: expected {member_count} rows, found {new_member_count}"
-                )
-
-            print("✓ All changes verified successfully")
-            print()
-
-            # Commit transaction
-            conn.commit()
-            print("✓ Migration completed successfully!")
-            print()
-            print("Summary:")
-            print(f"  - Database: {db_path}")
-            print(f"  - Group members: {member_count}")
-            print(f"  - Columns added: {len(changes_needed)}")
-
-            return True
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
+
+                # Add managed_by_id column if needed
+                if not has_managed_by_id:
+                    print("Adding managed_by_id column...")
+                    cursor.execute(
+                        "ALTER TABLE group_members ADD COLUMN managed_by_id INTEGER DEFAULT NULL"
+                    )
+                    print("✓ managed_by_id column added")
+
+                # Add managed_by_type column if needed
+                if not has_managed_by_type:
+                    print("Adding managed_by_type column...")
+                    cursor.execute(
+                        "ALTER TABLE group_members ADD COLUMN managed_by_type TEXT DEFAULT NULL"
+                    )
+                    print("✓ managed_by_type column added")
+
+                # Verify changes
+                print()
+                print("Verifying changes...")
+
+                if not check_column_exists(cursor, "group_members", "managed_by_id"):
+                    raise MigrationError("Verification failed: managed_by_id column not found after creation")
+
+                if not check_column_exists(cursor, "group_members", "managed_by_type"):
+                    raise MigrationError("Verification failed: managed_by_type column not found after creation")
+
+                # Check that no data was lost
+                new_member_count = get_row_count(cursor, "group_members")
+                if new_member_count != member_count:
+                    raise MigrationError(
+                        f"Data loss detected: expected {member_count} rows, found {new_member_count}"
+                    )
+
+                print("✓ All changes verified successfully")
+                print()
 
         except Exception as e:
-            # Rollback on error
-            conn.rollback()
             raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
 
-    finally:
-        cursor.close()
-        conn.close()
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Group members: {member_count}")
+        print(f"  - Columns added: {len(changes_needed)}")
+
+        return True
 
 
 def main():
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Database migration: Add indexes for member lookups
+--------------------------------------------------
+Adds the indexes behind the members router's most frequent filters:
+
+- idx_group_members_group_user: UNIQUE (group_id, user_id) on group_members,
+  used by every membership check and guaranteeing a user joins a group once
+- idx_guest_members_unknown: partial index on guest_members(group_id) for the
+  Unknown placeholder rows only
+- idx_item_assignments_user_guest: (user_id, is_guest) on
+  expense_item_assignments, for looking up a user's or guest's assignments
+
+password_reset_tokens.token_hash already has a unique index, so it needs
+nothing here.
+
+The unique index cannot be created while a user is a member of the same
+group twice; the migration lists such rows and stops so they can be removed
+by hand first.
+
+Usage:
+    python migrations/add_member_query_indexes.py [--dry-run] [--db-path <path>]
+
+Options:
+    --dry-run       Show what would be done without making changes
+    --db-path       Path to SQLite database (default: db.sqlite3)
+"""
+
+import sqlite3
+import sys
+import argparse
+from contextlib import closing
+from pathlib import Path
+
+
+class MigrationError(Exception):
+    """Custom exception for migration errors"""
+    pass
+
+
+# (index name, CREATE INDEX statement) - keep in sync with models.py
+INDEXES = [
+    ("idx_group_members_group_user", """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_group_members_group_user
+        ON group_members(group_id, user_id)
+    """),
+    ("idx_guest_members_unknown", """
+        CREATE INDEX IF NOT EXISTS idx_guest_members_unknown
+        ON guest_members(group_id) WHERE is_unknown_placeholder = 1
+    """),
+    ("idx_item_assignments_user_guest", """
+        CREATE INDEX IF NOT EXISTS idx_item_assignments_user_guest
+        ON expense_item_assignments(user_id, is_guest)
+    """),
+]
+
+
+def get_existing_indexes(cursor):
+    """Return the names of all indexes in the database"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def find_duplicate_memberships(cursor):
+    """Return (group_id, user_id, count) for users listed in a group more than once"""
+    cursor.execute("""
+        SELECT group_id, user_id, COUNT(*) FROM group_members
+        GROUP BY group_id, user_id
+        HAVING COUNT(*) > 1
+    """)
+    return cursor.fetchall()
+
+
+def run_migration(db_path, dry_run=False):
+    """
+    Run the migration to add the member query indexes
+
+    Args:
+        db_path: Path to the SQLite database file
+        dry_run: If True, only show what would be done
+
+    Returns:
+        bool: True if migration completed successfully
+    """
+    print(f"{'[DRY RUN] ' if dry_run else ''}Starting migration...")
+    print(f"Database: {db_path}")
+    print()
+
+    # Check if database exists
+    if not Path(db_path).exists():
+        raise MigrationError(f"Database file not found: {db_path}")
+
+    # Connect to database; closing() releases the connection and the
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        cursor = conn.cursor()
+
+        existing = get_existing_indexes(cursor)
+        pending = [(name, sql) for name, sql in INDEXES if name not in existing]
+
+        for name, _ in INDEXES:
+            if name in existing:
+                print(f"✓ {name} index already exists")
+
+        if not pending:
+            print()
+            print("✓ Migration already applied - no changes needed!")
+            return True
+
+        # Duplicate memberships would make the unique index fail
+        if "idx_group_members_group_user" in {name for name, _ in pending}:
+            duplicates = find_duplicate_memberships(cursor)
+            if duplicates:
+                for group_id, user_id, count in duplicates:
+                    print(f"  • User {user_id} is a member of group {group_id} {count} times")
+                raise MigrationError(
+                    f"{len(duplicates)} duplicate membership(s) found; remove them before adding the unique index"
+                )
+
+        print()
+        print("Changes to be applied:")
+        for i, (name, _) in enumerate(pending, 1):
+            print(f"  {i}. Add index {name}")
+        print()
+
+        if dry_run:
+            print("[DRY RUN] Migration would complete successfully")
+            print("[DRY RUN] No changes were made to the database")
+            return True
+
+        try:
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
+
+                for name, sql in pending:
+                    cursor.execute(sql)
+                    print(f"✓ {name} index added")
+
+                # Verify changes
+                print()
+                print("Verifying changes...")
+
+                missing = {name for name, _ in pending} - get_existing_indexes(cursor)
+                if missing:
+                    raise MigrationError(f"Verification failed: indexes not found: {', '.join(sorted(missing))}")
+
+                print("✓ All changes verified successfully")
+                print()
+
+        except Exception as e:
+            raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
+
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Changes applied: {len(pending)}")
+
+        return True
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Add member lookup indexes to Splitwiser database",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run migration on default database
+  python migrations/add_member_query_indexes.py
+
+  # Dry run to see what would change
+  python migrations/add_member_query_indexes.py --dry-run
+
+  # Run migration on specific database
+  python migrations/add_member_query_indexes.py --db-path /path/to/db.sqlite3
+        """
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be done without making changes"
+    )
+
+    parser.add_argument(
+        "--db-path",
+        default="db.sqlite3",
+        help="Path to SQLite database file (default: db.sqlite3)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        success = run_migration(args.db_path, dry_run=args.dry_run)
+        sys.exit(0 if success else 1)
+
+    except MigrationError as e:
+        print()
+        print(f"❌ Migration Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        print()
+        print("❌ Migration cancelled by user", file=sys.stderr)
+        sys.exit(1)
+
+    except Exception as e:
+        print()
+        print(f"❌ Unexpected error: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import argparse
 import sqlite3
 import sys
 import os
+from contextlib import closing
 
 def check_index_exists(cursor, index_name):
     # For SQLite, we check sqlite_master
@@ -23,9 +24,6 @@ def migrate(db_path, dry_run=False):
         print(f"Error: Database file not found at {db_path}")
         return False
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
     # List of (index_name, table_name, column_name)
     indexes_to_add = [
         ("ix_expenses_group_id", "expenses", "group_id"),
@@ -34,42 +32,42 @@ def migrate(db_path, dry_run=False):
     ]
 
     try:
-        changes_pending = False
-
-        # Check existing indexes
-        for index_name, table, column in indexes_to_add:
-            if check_index_exists(cursor, index_name):
-                print(f"✓ Index {index_name} already exists on {table}({column})")
-            else:
-                changes_pending = True
-                print(f"  Pending: Add index {index_name} on {table}({column})")
-
-        if not changes_pending:
-            print("No changes needed.")
-            return True
-
-        if dry_run:
-            print("\nDry run completed. No changes made.")
-            return True
-
-        print("\nApplying changes...")
-
-        for index_name, table, column in indexes_to_add:
-            if not check_index_exists(cursor, index_name):
-                print(f"Adding index {index_name}...")
-                cursor.execute(f"CREATE INDEX {index_name} ON {table}({column})")
-                print(f"✓ Created index {index_name}")
+        # closing() releases the connection; `with conn:` commits on success
+        # or rolls back on error
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            cursor = conn.cursor()
+            changes_pending = False
+
+            # Check existing indexes
+            for index_name, table, column in indexes_to_add:
+                if check_index_exists(cursor, index_name):
+                    print(f"✓ Index {index_name} already exists on {table}({column})")
+                else:
+                    changes_pending = True
+                    print(f"  Pending: Add index {index_name} on {table}({column})")
+
+            if not changes_pending:
+                print("No changes needed.")
+                return True
+
+            if dry_run:
+                print("\nDry run completed. No changes made.")
+                return True
+
+            print("\nApplying changes...")
+
+            for index_name, table, column in indexes_to_add:
+                if not check_index_exists(cursor, index_name):
+                    print(f"Adding index {index_name}...")
+                    cursor.execute(f"CREATE INDEX {index_name} ON {table}({column})")
+                    print(f"✓ Created index {index_name}")
 
-        conn.commit()
         print("\nMigration completed successfully!")
         return True
 
     except Exception as e:
-        conn.rollback()
         print(f"\nError applying migration: {e}")
         return False
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Add performance indexes")
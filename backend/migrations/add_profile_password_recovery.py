@@ -17,6 +17,7 @@ import sqlite3
 import os
 import sys
 import argparse
+from contextlib import closing
 from pathlib import Path
 
 
@@ -27,9 +28,11 @@ class MigrationError(Exception):
 
 def check_column_exists(cursor, table_name, column_name):
     """Check if a column exists in a table"""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = [row[1] for row in cursor.fetchall()]
-    return column_name in columns
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1",
+        (table_name, column_name)
+    )
+    return cursor.fetchone() is not None
 
 
 def verify_table_exists(cursor, table_name):
@@ -66,11 +69,11 @@ def run_migration(db_path, dry_run=False):
     if not Path(db_path).exists():
         raise MigrationError(f"Database file not found: {db_path}")
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Connect to database; closing() releases the connection and each
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        cursor = conn.cursor()
 
-    try:
         # Verify users table exists
         print("✓ Checking if users table exists...")
         if not verify_table_exists(cursor, "users"):
@@ -127,122 +130,114 @@ def run_migration(db_path, dry_run=False):
             print("[DRY RUN] No changes were made to the database")
             return True
 
-        # Begin transaction
-        cursor.execute("BEGIN TRANSACTION")
-
         try:
-            # Create password_reset_tokens table if needed
-            if not verify_table_exists(cursor, "password_reset_tokens"):
-                print("Creating password_reset_tokens table...")
-                cursor.execute("""
-                    CREATE TABLE password_reset_tokens (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        token_hash TEXT UNIQUE NOT NULL,
-                        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        expires_at DATETIME NOT NULL,
-                        used BOOLEAN NOT NULL DEFAULT 0,
-                        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                    )
-                """)
-                cursor.execute("CREATE INDEX idx_password_reset_tokens_token_hash ON password_reset_tokens(token_hash)")
-                cursor.execute("CREATE INDEX idx_password_reset_tokens_expires_at ON password_reset_tokens(expires_at)")
-                cursor.execute("CREATE INDEX idx_password_reset_tokens_user_id ON password_reset_tokens(user_id)")
-                print("✓ password_reset_tokens table created")
-
-            # Create email_verification_tokens table if needed
-            if not verify_table_exists(cursor, "email_verification_tokens"):
-                print("Creating email_verification_tokens table...")
-                cursor.execute("""
-                    CREATE TABLE email_verification_tokens (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        new_email TEXT NOT NULL,
-                        token_hash TEXT UNIQUE NOT NULL,
-                        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        expires_at DATETIME NOT NULL,
-                        used BOOLEAN NOT NULL DEFAULT 0,
-                        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                    )
-                """)
-                cursor.execute("CREATE INDEX idx_email_verification_tokens_token_hash ON email_verification_tokens(token_hash)")
-                cursor.execute("CREATE INDEX idx_email_verification_tokens_expires_at ON email_verification_tokens(expires_at)")
-                cursor.execute("CREATE INDEX idx_email_verification_tokens_user_id ON email_verification_tokens(user_id)")
-                print("✓ email_verification_tokens table created")
-
-            # Add password_changed_at column if needed
-            if not check_column_exists(cursor, "users", "password_changed_at"):
-                print("Adding password_changed_at column...")
-                cursor.execute("ALTER TABLE users ADD COLUMN password_changed_at DATETIME DEFAULT NULL")
-                print("✓ password_changed_at column added")
-
-            # Add email_verified column if needed
-            if not check_column_exists(cursor, "users", "email_verified"):
-                print("Adding email_verified column...")
-                cursor.execute("ALTER TABLE users ADD COLUMN email_verified BOOLEAN DEFAULT 0")
-                print("✓ email_verified column added")
-
-            # Add last_login_at column if needed
-            if not check_column_exists(cursor, "users", "last_login_at"):
-                print("Adding last_login_at column...")
-                cursor.execute("ALTER TABLE users ADD COLUMN last_login_at DATETIME DEFAULT NULL")
-                print("✓ last_login_at column added")
-
-            # Verify changes
-            print()
-            print("Verifying changes...")
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
 
-            # Verify tables
-            if "Create password_reset_tokens table" in changes_needed:
+                # Create password_reset_tokens table if needed
                 if not verify_table_exists(cursor, "password_reset_tokens"):
-                    raise MigrationError("Verification failed: password_reset_tokens table not found after creation")
-
-            if "Create email_verification_tokens table" in changes_needed:
+                    print("Creating password_reset_tokens table...")
+                    cursor.execute("""
+                        CREATE TABLE password_reset_tokens (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            user_id INTEGER NOT NULL,
+                            token_hash TEXT UNIQUE NOT NULL,
+                            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                            expires_at DATETIME NOT NULL,
+                            used BOOLEAN NOT NULL DEFAULT 0,
+                            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+                        )
+                    """)
+                    cursor.execute("CREATE INDEX idx_password_reset_tokens_token_hash ON password_reset_tokens(token_hash)")
+                    cursor.execute("CREATE INDEX idx_password_reset_tokens_expires_at ON password_reset_tokens(expires_at)")
+                    cursor.execute("CREATE INDEX idx_password_reset_tokens_user_id ON password_reset_tokens(user_id)")
+                    print("✓ password_reset_tokens table created")
+
+                # Create email_verification_tokens table if needed
                 if not verify_table_exists(cursor, "email_verification_tokens"):
-                    raise MigrationError("Verification failed: email_verification_tokens table not found after creation")
-
-            # Verify columns
-            if "Add password_changed_at column to users" in changes_needed:
+                    print("Creating email_verification_tokens table...")
+                    cursor.execute("""
+                        CREATE TABLE email_verification_tokens (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            user_id INTEGER NOT NULL,
+                            new_email TEXT NOT NULL,
+                            token_hash TEXT UNIQUE NOT NULL,
+                            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                            expires_at DATETIME NOT NULL,
+                            used BOOLEAN NOT NULL DEFAULT 0,
+                            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+                        )
+                    """)
+                    cursor.execute("CREATE INDEX idx_email_verification_tokens_token_hash ON email_verification_tokens(token_hash)")
+                    cursor.execute("CREATE INDEX idx_email_verification_tokens_expires_at ON email_verification_tokens(expires_at)")
+                    cursor.execute("CREATE INDEX idx_email_verification_tokens_user_id ON email_verification_tokens(user_id)")
+                    print("✓ email_verification_tokens table created")
+
+                # Add password_changed_at column if needed
                 if not check_column_exists(cursor, "users", "password_changed_at"):
-                    raise MigrationError("Verification failed: password_changed_at column not found after creation")
+                    print("Adding password_changed_at column...")
+                    cursor.execute("ALTER TABLE users ADD COLUMN password_changed_at DATETIME DEFAULT NULL")
+                    print("✓ password_changed_at column added")
 
-            if "Add email_verified column to users" in changes_needed:
+                # Add email_verified column if needed
                 if not check_column_exists(cursor, "users", "email_verified"):
-                    raise MigrationError("Verification failed: email_verified column not found after creation")
+                    print("Adding email_verified column...")
+                    cursor.execute("ALTER TABLE users ADD COLUMN email_verified BOOLEAN DEFAULT 0")
+                    print("✓ email_verified column added")
 
-            if "Add last_login_at column to users" in changes_needed:
+                # Add last_login_at column if needed
                 if not check_column_exists(cursor, "users", "last_login_at"):
-                    raise MigrationError("Verification failed: last_login_at column not found after creation")
-
-            # Check that no data was lost
-            new_user_count = get_row_count(cursor, "users")
-            if new_user_count != user_count:
-                raise MigrationError(
-                    f"Data loss detected: expected {user_count} rows, found {new_user_count}"
-                )
-
-            print("✓ All changes verified successfully")
-            print()
-
-            # Commit transaction
-            conn.commit()
-            print("✓ Migration completed successfully!")
-            print()
-            print("Summary:")
-            print(f"  - Database: {db_path}")
-            print(f"  - Users: {user_count}")
-            print(f"  - Changes applied: {len(changes_needed)}")
+                    print("Adding last_login_at column...")
+                    cursor.execute("ALTER TABLE users ADD COLUMN last_login_at DATETIME DEFAULT NULL")
+                    print("✓ last_login_at column added")
+
+                # Verify changes
+                print()
+                print("Verifying changes...")
+
+                # Verify tables
+                if "Create password_reset_tokens table" in changes_needed:
+                    if not verify_table_exists(cursor, "password_reset_tokens"):
+                        raise MigrationError("Verification failed: password_reset_tokens table not found after creation")
+
+                if "Create email_verification_tokens table" in changes_needed:
+                    if not verify_table_exists(cursor, "email_verification_tokens"):
+                        raise MigrationError("Verification failed: email_verification_tokens table not found after creation")
+
+                # Verify columns
+                if "Add password_changed_at column to users" in changes_needed:
+                    if not check_column_exists(cursor, "users", "password_changed_at"):
+                        raise MigrationError("Verification failed: password_changed_at column not found after creation")
+
+                if "Add email_verified column to users" in changes_needed:
+                    if not check_column_exists(cursor, "users", "email_verified"):
+                        raise MigrationError("Verification failed: email_verified column not found after creation")
+
+                if "Add last_login_at column to users" in changes_needed:
+                    if not check_column_exists(cursor, "users", "last_login_at"):
+                        raise MigrationError("Verification failed: last_login_at column not found after creation")
+
+                # Check that no data was lost
+                new_user_count = get_row_count(cursor, "users")
+                if new_user_count != user_count:
+                    raise MigrationError(
+                        f"Data loss detected: expected {user_count} rows, found {new_user_count}"
+                    )
 
-            return True
+                print("✓ All changes verified successfully")
+                print()
 
         except Exception as e:
-            # Rollback on error
-            conn.rollback()
             raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
 
-    finally:
-        cursor.close()
-        conn.close()
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Users: {user_count}")
+        print(f"  - Changes applied: {len(changes_needed)}")
+
+        return True
 
 
 def main():
@@ -16,6 +16,7 @@ Options:
 import sqlite3
 import sys
 import argparse
+from contextlib import closing
 from pathlib import Path
 
 
@@ -26,9 +27,11 @@ class MigrationError(Exception):
 
 def check_column_exists(cursor, table_name, column_name):
     """Check if a column exists in a table"""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = [row[1] for row in cursor.fetchall()]
-    return column_name in columns
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1",
+        (table_name, column_name)
+    )
+    return cursor.fetchone() is not None
 
 
 def verify_table_exists(cursor, table_name):
@@ -65,11 +68,11 @@ def run_migration(db_path, dry_run=False):
     if not Path(db_path).exists():
         raise MigrationError(f"Database file not found: {db_path}")
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Connect to database; closing() releases the connection and each
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        cursor = conn.cursor()
 
-    try:
         # Verify guest_members table exists
         print("✓ Checking if guest_members table exists...")
         if not verify_table_exists(cursor, "guest_members"):
@@ -105,54 +108,46 @@ def run_migration(db_path, dry_run=False):
             print("[DRY RUN] No changes were made to the database")
             return True
 
-        # Begin transaction
-        cursor.execute("BEGIN TRANSACTION")
-
         try:
-            # Add is_unknown_placeholder column if needed
-            if not has_is_unknown_placeholder:
-                print("Adding is_unknown_placeholder column...")
-                cursor.execute(
-                    "ALTER TABLE guest_members ADD COLUMN is_unknown_placeholder BOOLEAN DEFAULT 0"
-                )
-                print("✓ is_unknown_placeholder column added")
-
-            # Verify changes
-            print()
-            print("Verifying changes...")
-
-            if not check_column_exists(cursor, "guest_members", "is_unknown_placeholder"):
-                raise MigrationError("Verification failed: is_unknown_placeholder column not found after creation")
-
-            # Check that no data was lost
-            new_guest_count = get_row_count(cursor, "guest_members")
-            if new_guest_count != guest_count:
-                raise MigrationError(
-                    f"Data loss detected: expected {guest_count} rows, found {new_guest_count}"
-                )
-
-            print("✓ All changes verified successfully")
-            print()
-
-            # Commit transaction
-            conn.commit()
-            print("✓ Migration completed successfully!")
-            print()
-            print("Summary:")
-            print(f"  - Database: {db_path}")
-            print(f"  - Guest members: {guest_count}")
-            print(f"  - Columns added: {len(changes_needed)}")
-
-            return True
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
+
+                # Add is_unknown_placeholder column if needed
+                if not has_is_unknown_placeholder:
+                    print("Adding is_unknown_placeholder column...")
+                    cursor.execute(
+                        "ALTER TABLE guest_members ADD COLUMN is_unknown_placeholder BOOLEAN DEFAULT 0"
+                    )
+                    print("✓ is_unknown_placeholder column added")
+
+                # Verify changes
+                print()
+                print("Verifying changes...")
+
+                if not check_column_exists(cursor, "guest_members", "is_unknown_placeholder"):
+                    raise MigrationError("Verification failed: is_unknown_placeholder column not found after creation")
+
+                # Check that no data was lost
+                new_guest_count = get_row_count(cursor, "guest_members")
+                if new_guest_count != guest_count:
+                    raise MigrationError(
+                        f"Data loss detected: expected {guest_count} rows, found {new_guest_count}"
+                    )
+
+                print("✓ All changes verified successfully")
+                print()
 
         except Exception as e:
-            # Rollback on error
-            conn.rollback()
             raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
 
-    finally:
-        cursor.close()
-        conn.close()
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Guest members: {guest_count}")
+        print(f"  - Columns added: {len(changes_needed)}")
+
+        return True
 
 
 def main():
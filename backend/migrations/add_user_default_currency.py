@@ -11,17 +11,22 @@ Usage:
 import sqlite3
 import sys
 import os
+from contextlib import closing
 from pathlib import Path
 
+from sqlite_pragmas import tune_connection
+
 # Default to the database file in the backend directory
 DEFAULT_DB_PATH = Path(__file__).parent.parent / "db.sqlite3"
 
 
 def check_column_exists(cursor, table_name: str, column_name: str) -> bool:
     """Check if a column exists in a table."""
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = [row[1] for row in cursor.fetchall()]
-    return column_name in columns
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ? LIMIT 1",
+        (table_name, column_name)
+    )
+    return cursor.fetchone() is not None
 
 
 def run_migration(db_path: str, dry_run: bool = False) -> None:
@@ -38,29 +43,31 @@ def run_migration(db_path: str, dry_run: bool = False) -> None:
     
     print(f"📂 Using database: {db_path}")
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
     try:
-        # Check if column already exists
-        if check_column_exists(cursor, "users", "default_currency"):
-            print("✅ Column 'default_currency' already exists in users table. Nothing to do.")
-            return
-        
-        print("🔄 Adding 'default_currency' column to users table...")
-        
-        if dry_run:
-            print("   [DRY RUN] Would execute:")
-            print("   ALTER TABLE users ADD COLUMN default_currency VARCHAR DEFAULT 'USD'")
-        else:
+        # closing() releases the connection; `with conn:` commits on success
+        # or rolls back on error
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            tune_connection(conn)
+            cursor = conn.cursor()
+
+            # Check if column already exists
+            if check_column_exists(cursor, "users", "default_currency"):
+                print("✅ Column 'default_currency' already exists in users table. Nothing to do.")
+                return
+            
+            print("🔄 Adding 'default_currency' column to users table...")
+            
+            if dry_run:
+                print("   [DRY RUN] Would execute:")
+                print("   ALTER TABLE users ADD COLUMN default_currency VARCHAR DEFAULT 'USD'")
+                return
+
             cursor.execute(
                 "ALTER TABLE users ADD COLUMN default_currency VARCHAR DEFAULT 'USD'"
             )
-            conn.commit()
             print("✅ Successfully added 'default_currency' column with default 'USD'")
-        
-        # Verify the migration
-        if not dry_run:
+            
+            # Verify the migration
             if check_column_exists(cursor, "users", "default_currency"):
                 print("✅ Verification passed: Column exists")
             else:
@@ -69,12 +76,7 @@ def run_migration(db_path: str, dry_run: bool = False) -> None:
     
     except Exception as e:
         print(f"❌ Migration failed: {e}")
-        conn.rollback()
         sys.exit(1)
-    
-    finally:
-        conn.close()
-
 
 if __name__ == "__main__":
     import argparse
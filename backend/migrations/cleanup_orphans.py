@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Clean up guests whose manager no longer exists
+----------------------------------------------
+remove_guest() deletes a guest without touching the guests it manages, which
+leaves their managed_by_id pointing at a row that is gone. The balance view
+then aggregates those guests into a manager that cannot be displayed.
+
+This script finds every orphaned guest with a single anti-join against both
+manager tables and clears the dangling managed_by fields with a single UPDATE. Orphans that
+share their name with another guest in the same group are renamed to
+"<name> (Recovered)" so the two can be told apart once unlinked; when that
+name is taken too (several orphans with one name, or an earlier run), they
+become "<name> (Recovered 2)", "<name> (Recovered 3)" and so on.
+
+Usage:
+    python migrations/cleanup_orphans.py [--dry-run] [--db-path <path>]
+
+Options:
+    --dry-run       Show what would be done without making changes
+    --db-path       Path to SQLite database (default: db.sqlite3)
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, event, select, update, func, and_, or_
+from sqlalchemy.orm import sessionmaker, aliased
+import models
+from sqlite_pragmas import tune_connection
+
+
+# Orphans are scanned and fixed in id order, BATCH_SIZE at a time, committing
+# after each batch so the write lock is never held for the whole table
+BATCH_SIZE = 1000
+
+
+def find_orphaned_guests(db, after_id=0, limit=BATCH_SIZE):
+    """Return up to `limit` (id, group_id, name, managed_by_type) orphan rows with id > after_id"""
+    manager_guest = aliased(models.GuestMember)
+
+    # One scan: each row is outer-joined to the table its managed_by_type
+    # names, and is an orphan when that side of the join finds nothing
+    return db.execute(
+        select(
+            models.GuestMember.id,
+            models.GuestMember.group_id,
+            models.GuestMember.name,
+            models.GuestMember.managed_by_type
+        )
+        .outerjoin(manager_guest, and_(
+            models.GuestMember.managed_by_type == 'guest',
+            manager_guest.id == models.GuestMember.managed_by_id
+        ))
+        .outerjoin(models.User, and_(
+            models.GuestMember.managed_by_type == 'user',
+            models.User.id == models.GuestMember.managed_by_id
+        ))
+        .where(
+            models.GuestMember.id > after_id,
+            models.GuestMember.managed_by_id.isnot(None),
+            or_(
+                and_(models.GuestMember.managed_by_type == 'guest', manager_guest.id.is_(None)),
+                and_(models.GuestMember.managed_by_type == 'user', models.User.id.is_(None))
+            )
+        )
+        .order_by(models.GuestMember.id)
+        .limit(limit)
+    ).all()
+
+
+def find_name_collisions(db, group_ids):
+    """Return the set of (group_id, name) pairs shared by more than one guest
+
+    Only the given groups are aggregated, so the GROUP BY covers the groups
+    that actually contain orphans rather than the whole table.
+    """
+    rows = db.execute(
+        select(models.GuestMember.group_id, models.GuestMember.name)
+        .where(models.GuestMember.group_id.in_(group_ids))
+        .group_by(models.GuestMember.group_id, models.GuestMember.name)
+        .having(func.count(models.GuestMember.id) > 1)
+    ).all()
+    return {(group_id, name) for group_id, name in rows}
+
+
+def get_group_names(db, group_ids):
+    """Return {group_id: set of guest names} for the given groups"""
+    names = {group_id: set() for group_id in group_ids}
+    rows = db.execute(
+        select(models.GuestMember.group_id, models.GuestMember.name)
+        .where(models.GuestMember.group_id.in_(group_ids))
+    ).all()
+    for group_id, name in rows:
+        names[group_id].add(name)
+    return names
+
+
+def recovered_name(name, taken):
+    """Return the first free "<name> (Recovered[ n])" and add it to `taken`"""
+    candidate = f"{name} (Recovered)"
+    suffix = 2
+    while candidate in taken:
+        candidate = f"{name} (Recovered {suffix})"
+        suffix += 1
+    taken.add(candidate)
+    return candidate
+
+
+def cleanup_orphaned_guests(db_path, dry_run=False):
+    """Clear managed_by fields on guests whose manager no longer exists"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    event.listen(engine, "connect", lambda dbapi_conn, _: tune_connection(dbapi_conn))
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+
+    print(f"{'[DRY RUN] ' if dry_run else ''}Scanning for orphaned guests...")
+    print(f"Database: {db_path}")
+    print()
+
+    try:
+        total_orphans = 0
+        total_renamed = 0
+        last_id = 0
+        # Names already used per group, kept across batches so two orphans
+        # never receive the same recovered name
+        group_names = {}
+
+        while True:
+            orphans = find_orphaned_guests(db, after_id=last_id)
+            if not orphans:
+                break
+
+            collisions = find_name_collisions(db, {row[1] for row in orphans})
+            new_groups = {group_id for group_id, _ in collisions} - group_names.keys()
+            if new_groups:
+                group_names.update(get_group_names(db, new_groups))
+
+            renames = []
+            for guest_id, group_id, name, managed_by_type in orphans:
+                print(f"  • Guest '{name}' (ID: {guest_id}, Group {group_id}) - missing {managed_by_type} manager")
+                if (group_id, name) in collisions:
+                    new_name = recovered_name(name, group_names[group_id])
+                    print(f"    ⚠️  Another guest in group {group_id} is also named '{name}' - will rename to '{new_name}'")
+                    renames.append({"id": guest_id, "name": new_name})
+
+            if not dry_run:
+                db.execute(
+                    update(models.GuestMember)
+                    .where(models.GuestMember.id.in_([row[0] for row in orphans]))
+                    .values(managed_by_id=None, managed_by_type=None)
+                )
+                if renames:
+                    db.bulk_update_mappings(models.GuestMember, renames)
+                db.commit()
+
+            total_orphans += len(orphans)
+            total_renamed += len(renames)
+            last_id = orphans[-1][0]
+
+        print()
+        if not total_orphans:
+            print("✓ No orphaned guests found")
+            return True
+
+        if dry_run:
+            print(f"[DRY RUN] Would clear manager link for {total_orphans} guest(s)")
+            print("[DRY RUN] No changes made")
+            return True
+
+        print(f"✓ Cleared manager link for {total_orphans} guest(s)")
+        if total_renamed:
+            print(f"✓ Renamed {total_renamed} guest(s) with duplicate names")
+        return True
+
+    except Exception:
+        db.rollback()
+        raise
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Clear manager links that point at deleted users or guests")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be done")
+    parser.add_argument("--db-path", default="db.sqlite3", help="Path to SQLite database file")
+    args = parser.parse_args()
+
+    try:
+        success = cleanup_orphaned_guests(db_path=args.db_path, dry_run=args.dry_run)
+        sys.exit(0 if success else 1)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
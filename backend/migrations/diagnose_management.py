@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, and_
 from sqlalchemy.orm import sessionmaker
 from database import Base
 import models
@@ -16,56 +16,64 @@ engine = create_engine("sqlite:///db.sqlite3")
 SessionLocal = sessionmaker(bind=engine)
 db = SessionLocal()
 
-print("=" * 80)
-print("GUEST MEMBERS (Claimed)")
-print("=" * 80)
-claimed_guests = db.query(models.GuestMember).filter(
+# Report lines are collected and written to stdout once at the end
+buf: list[str] = []
+
+buf.append("=" * 80)
+buf.append("GUEST MEMBERS (Claimed)")
+buf.append("=" * 80)
+# Each claimed guest alongside the group_member created by its claim (or None)
+claimed_guests = db.query(models.GuestMember, models.GroupMember).outerjoin(
+    models.GroupMember,
+    and_(
+        models.GroupMember.group_id == models.GuestMember.group_id,
+        models.GroupMember.user_id == models.GuestMember.claimed_by_id
+    )
+).filter(
     models.GuestMember.claimed_by_id != None
 ).all()
 
-for guest in claimed_guests:
-    print(f"\nGuest ID: {guest.id}")
-    print(f"  Name: {guest.name}")
-    print(f"  Claimed by User ID: {guest.claimed_by_id}")
-    print(f"  Managed by ID: {guest.managed_by_id}")
-    print(f"  Managed by Type: {guest.managed_by_type}")
-    print(f"  Group ID: {guest.group_id}")
-
-print("\n" + "=" * 80)
-print("GROUP MEMBERS (from claimed guests)")
-print("=" * 80)
+for guest, _ in claimed_guests:
+    buf.append(f"\nGuest ID: {guest.id}")
+    buf.append(f"  Name: {guest.name}")
+    buf.append(f"  Claimed by User ID: {guest.claimed_by_id}")
+    buf.append(f"  Managed by ID: {guest.managed_by_id}")
+    buf.append(f"  Managed by Type: {guest.managed_by_type}")
+    buf.append(f"  Group ID: {guest.group_id}")
 
-for guest in claimed_guests:
-    member = db.query(models.GroupMember).filter(
-        models.GroupMember.group_id == guest.group_id,
-        models.GroupMember.user_id == guest.claimed_by_id
-    ).first()
+buf.append("\n" + "=" * 80)
+buf.append("GROUP MEMBERS (from claimed guests)")
+buf.append("=" * 80)
 
+for guest, member in claimed_guests:
     if member:
-        print(f"\nUser ID: {member.user_id} (was guest '{guest.name}')")
-        print(f"  Group ID: {member.group_id}")
-        print(f"  Managed by ID: {member.managed_by_id}")
-        print(f"  Managed by Type: {member.managed_by_type}")
+        buf.append(f"\nUser ID: {member.user_id} (was guest '{guest.name}')")
+        buf.append(f"  Group ID: {member.group_id}")
+        buf.append(f"  Managed by ID: {member.managed_by_id}")
+        buf.append(f"  Managed by Type: {member.managed_by_type}")
 
         # Check if this should have a management relationship
         if guest.managed_by_id and not member.managed_by_id:
-            print(f"  ⚠️  ISSUE: Guest had managed_by_id={guest.managed_by_id}, but group_member doesn't!")
+            buf.append(f"  ⚠️  ISSUE: Guest had managed_by_id={guest.managed_by_id}, but group_member doesn't!")
     else:
-        print(f"\n⚠️  No group_member found for user {guest.claimed_by_id} (was guest '{guest.name}')")
+        buf.append(f"\n⚠️  No group_member found for user {guest.claimed_by_id} (was guest '{guest.name}')")
 
-print("\n" + "=" * 80)
-print("ALL GROUP MEMBERS WITH MANAGEMENT")
-print("=" * 80)
+buf.append("\n" + "=" * 80)
+buf.append("ALL GROUP MEMBERS WITH MANAGEMENT")
+buf.append("=" * 80)
 
-managed_members = db.query(models.GroupMember).filter(
+managed_members = db.query(models.GroupMember, models.User).outerjoin(
+    models.User, models.User.id == models.GroupMember.user_id
+).filter(
     models.GroupMember.managed_by_id != None
 ).all()
 
-for member in managed_members:
-    user = db.query(models.User).filter(models.User.id == member.user_id).first()
-    print(f"\nUser ID: {member.user_id} (Email: {user.email if user else 'Unknown'})")
-    print(f"  Group ID: {member.group_id}")
-    print(f"  Managed by ID: {member.managed_by_id}")
-    print(f"  Managed by Type: {member.managed_by_type}")
+for member, user in managed_members:
+    buf.append(f"\nUser ID: {member.user_id} (Email: {user.email if user else 'Unknown'})")
+    buf.append(f"  Group ID: {member.group_id}")
+    buf.append(f"  Managed by ID: {member.managed_by_id}")
+    buf.append(f"  Managed by Type: {member.managed_by_type}")
 
 db.close()
+
+sys.stdout.write("\n".join(buf) + "\n")
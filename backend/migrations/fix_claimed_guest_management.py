@@ -18,14 +18,46 @@ Options:
 import sqlite3
 import sys
 import argparse
+from contextlib import closing
 from pathlib import Path
 
+from sqlite_pragmas import tune_connection
+
 
 class MigrationError(Exception):
     """Custom exception for migration errors"""
     pass
 
 
+# For every claimed guest with a manager, the manager its group_member should
+# have: the manager guest's claiming user if that guest was claimed too,
+# otherwise the guest's own manager reference unchanged
+RESOLVED_MANAGERS_CTE = """
+    WITH resolved AS (
+        SELECT
+            gm.id AS guest_id,
+            gm.name AS guest_name,
+            gm.group_id,
+            gm.claimed_by_id,
+            gm.managed_by_type AS guest_managed_by_type,
+            COALESCE(mgr.claimed_by_id, gm.managed_by_id) AS new_mid,
+            CASE WHEN mgr.claimed_by_id IS NOT NULL
+                 THEN 'user' ELSE gm.managed_by_type END AS new_mtype
+        FROM guest_members gm
+        LEFT JOIN guest_members mgr
+          ON gm.managed_by_type = 'guest' AND mgr.id = gm.managed_by_id
+        WHERE gm.claimed_by_id IS NOT NULL
+          AND gm.managed_by_id IS NOT NULL
+    )
+"""
+
+# Matches group_members rows whose manager differs from the resolved one
+NEEDS_UPDATE = """
+    (group_members.managed_by_id IS NOT r.new_mid
+     OR group_members.managed_by_type IS NOT r.new_mtype)
+"""
+
+
 def run_migration(db_path, dry_run=False):
     """
     Fix management relationships for claimed guests
@@ -45,24 +77,26 @@ def run_migration(db_path, dry_run=False):
     if not Path(db_path).exists():
         raise MigrationError(f"Database file not found: {db_path}")
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
-    cursor = conn.cursor()
+    # Connect to database; closing() releases the connection and the
+    # `with conn:` block commits on success or rolls back on error
+    with closing(sqlite3.connect(db_path)) as conn:
+        tune_connection(conn)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        cursor = conn.cursor()
 
-    try:
-        # Find all claimed guests that have management relationships
-        cursor.execute("""
+        # Resolve every claimed guest's target manager in SQL, alongside the
+        # group_member the claim created (if any)
+        cursor.execute(RESOLVED_MANAGERS_CTE + f"""
             SELECT
-                gm.id AS guest_id,
-                gm.name AS guest_name,
-                gm.claimed_by_id,
-                gm.managed_by_id,
-                gm.managed_by_type,
-                gm.group_id
-            FROM guest_members gm
-            WHERE gm.claimed_by_id IS NOT NULL
-              AND gm.managed_by_id IS NOT NULL
+                r.*,
+                group_members.id AS member_id,
+                group_members.managed_by_id AS member_managed_by_id,
+                group_members.managed_by_type AS member_managed_by_type,
+                {NEEDS_UPDATE} AS needs_update
+            FROM resolved r
+            LEFT JOIN group_members
+              ON group_members.group_id = r.group_id
+             AND group_members.user_id = r.claimed_by_id
         """)
 
         claimed_guests_with_managers = cursor.fetchall()
@@ -78,66 +112,40 @@ def run_migration(db_path, dry_run=False):
         updates_to_apply = []
 
         for guest in claimed_guests_with_managers:
-            # Get the corresponding group_member record
-            cursor.execute("""
-                SELECT id, user_id, managed_by_id, managed_by_type
-                FROM group_members
-                WHERE group_id = ? AND user_id = ?
-            """, (guest['group_id'], guest['claimed_by_id']))
-
-            member = cursor.fetchone()
-
-            if not member:
+            if guest['member_id'] is None:
                 print(f"⚠ Warning: No group_member found for claimed guest '{guest['guest_name']}' (claimed by user {guest['claimed_by_id']})")
                 continue
 
-            # Determine the correct manager
-            manager_id = guest['managed_by_id']
-            manager_type = guest['managed_by_type']
-
-            # If managed by a guest, check if that guest was also claimed
-            if manager_type == 'guest':
-                cursor.execute("""
-                    SELECT claimed_by_id FROM guest_members WHERE id = ?
-                """, (manager_id,))
-                manager_guest = cursor.fetchone()
-
-                if manager_guest and manager_guest['claimed_by_id']:
-                    # Manager guest was claimed, update to point to the user
-                    manager_id = manager_guest['claimed_by_id']
-                    manager_type = 'user'
-                    status = "Manager guest also claimed → updating to user"
-                else:
-                    status = "Manager guest not claimed → keeping guest reference"
-            else:
-                status = "Manager is user"
-
-            # Check if update is needed
-            if member['managed_by_id'] != manager_id or member['managed_by_type'] != manager_type:
-                updates_to_apply.append({
-                    'member_id': member['id'],
-                    'guest_name': guest['guest_name'],
-                    'old_manager_id': member['managed_by_id'],
-                    'old_manager_type': member['managed_by_type'],
-                    'new_manager_id': manager_id,
-                    'new_manager_type': manager_type,
-                    'status': status
-                })
-                print(f"  • {guest['guest_name']} (claimed by user {guest['claimed_by_id']})")
-                print(f"    Current: managed_by_id={member['managed_by_id']}, managed_by_type={member['managed_by_type']}")
-                print(f"    New:     managed_by_id={manager_id}, managed_by_type={manager_type}")
-                print(f"    Status:  {status}")
-                print()
-            else:
+            if not guest['needs_update']:
                 print(f"  ✓ {guest['guest_name']} - already correctly set")
                 print()
+                continue
+
+            if guest['guest_managed_by_type'] != 'guest':
+                status = "Manager is user"
+            elif guest['new_mtype'] == 'user':
+                status = "Manager guest also claimed → updating to user"
+            else:
+                status = "Manager guest not claimed → keeping guest reference"
+
+            updates_to_apply.append({
+                'member_id': guest['member_id'],
+                'new_manager_id': guest['new_mid'],
+                'new_manager_type': guest['new_mtype'],
+            })
+            print(f"  • {guest['guest_name']} (claimed by user {guest['claimed_by_id']})")
+            print(f"    Current: managed_by_id={guest['member_managed_by_id']}, managed_by_type={guest['member_managed_by_type']}")
+            print(f"    New:     managed_by_id={guest['new_mid']}, managed_by_type={guest['new_mtype']}")
+            print(f"    Status:  {status}")
+            print()
 
-        if not updates_to_apply:
+        update_count = len(updates_to_apply)
+        if not update_count:
             print("✓ All management relationships are already correct!")
             print("✓ No changes needed!")
             return True
 
-        print(f"Updates to apply: {len(updates_to_apply)}")
+        print(f"Updates to apply: {update_count}")
         print()
 
         if dry_run:
@@ -145,57 +153,68 @@ def run_migration(db_path, dry_run=False):
             print("[DRY RUN] No changes were made to the database")
             return True
 
-        # Begin transaction
-        cursor.execute("BEGIN TRANSACTION")
-
         try:
-            # Apply updates
-            for update in updates_to_apply:
-                cursor.execute("""
-                    UPDATE group_members
-                    SET managed_by_id = ?, managed_by_type = ?
-                    WHERE id = ?
-                """, (update['new_manager_id'], update['new_manager_type'], update['member_id']))
-
-            # Verify changes
-            print("Verifying changes...")
-            for update in updates_to_apply:
-                cursor.execute("""
-                    SELECT managed_by_id, managed_by_type
-                    FROM group_members
-                    WHERE id = ?
-                """, (update['member_id'],))
-                result = cursor.fetchone()
-
-                if result['managed_by_id'] != update['new_manager_id'] or result['managed_by_type'] != update['new_manager_type']:
+            with conn:
+                cursor.execute("BEGIN TRANSACTION")
+
+                changes_before = conn.total_changes
+                if sqlite3.sqlite_version_info >= (3, 33, 0):
+                    # Apply every update in one statement. rowcount is -1 for
+                    # WITH-prefixed statements, so count via total_changes
+                    cursor.execute(RESOLVED_MANAGERS_CTE + f"""
+                        UPDATE group_members
+                        SET managed_by_id = r.new_mid, managed_by_type = r.new_mtype
+                        FROM resolved r
+                        WHERE group_members.group_id = r.group_id
+                          AND group_members.user_id = r.claimed_by_id
+                          AND {NEEDS_UPDATE}
+                    """)
+                else:
+                    # No UPDATE ... FROM before SQLite 3.33: one prepared
+                    # statement, bound once per row
+                    params = [
+                        (u['new_manager_id'], u['new_manager_type'], u['member_id'])
+                        for u in updates_to_apply
+                    ]
+                    cursor.executemany(
+                        "UPDATE group_members SET managed_by_id = ?, managed_by_type = ? WHERE id = ?",
+                        params
+                    )
+                updated = conn.total_changes - changes_before
+                if updated != update_count:
                     raise MigrationError(
-                        f"Verification failed for member {update['member_id']}: "
-                        f"expected ({update['new_manager_id']}, {update['new_manager_type']}), "
-                        f"got ({result['managed_by_id']}, {result['managed_by_type']})"
+                        f"Expected to update {update_count} group member(s), updated {updated}"
                     )
 
-            print("✓ All changes verified successfully")
-            print()
-
-            # Commit transaction
-            conn.commit()
-            print("✓ Migration completed successfully!")
-            print()
-            print("Summary:")
-            print(f"  - Database: {db_path}")
-            print(f"  - Claimed guests processed: {len(claimed_guests_with_managers)}")
-            print(f"  - Group members updated: {len(updates_to_apply)}")
-
-            return True
+                # Verify changes: read every updated row back in one query
+                print("Verifying changes...")
+                expected = {
+                    u['member_id']: (u['new_manager_id'], u['new_manager_type'])
+                    for u in updates_to_apply
+                }
+                placeholders = ", ".join("?" * len(expected))
+                cursor.execute(
+                    f"SELECT id, managed_by_id, managed_by_type FROM group_members WHERE id IN ({placeholders})",
+                    list(expected)
+                )
+                for row in cursor.fetchall():
+                    if (row['managed_by_id'], row['managed_by_type']) != expected[row['id']]:
+                        raise MigrationError(f"Verification failed for group member {row['id']}")
+
+                print("✓ All changes verified successfully")
+                print()
 
         except Exception as e:
-            # Rollback on error
-            conn.rollback()
             raise MigrationError(f"Migration failed and was rolled back: {str(e)}")
 
-    finally:
-        cursor.close()
-        conn.close()
+        print("✓ Migration completed successfully!")
+        print()
+        print("Summary:")
+        print(f"  - Database: {db_path}")
+        print(f"  - Claimed guests processed: {len(claimed_guests_with_managers)}")
+        print(f"  - Group members updated: {update_count}")
+
+        return True
 
 
 def main():
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Migration script to add split_type column to expenses table.
+
+Existing expenses are back-filled by inferring the split type from their
+splits and items:
+- ITEMIZED if the expense has expense_items
+- PERCENT if any split has a percentage
+- SHARES if any split has shares
+- EXACT if split amounts differ by more than the 1-cent remainder
+- EQUAL otherwise
+"""
+
+import sqlite3
+import sys
+import os
+from contextlib import closing
+
+from sqlite_pragmas import tune_connection
+
+# Get the database path from environment or use default
+DATA_DIR = os.getenv("DATA_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.path.join(DATA_DIR, "db.sqlite3")
+
+# Temporary covering index for the inference subqueries: every one filters on
+# expense_id and reads only these columns, so they resolve from the index
+# without touching expense_splits rows. Dropped again once inference is done.
+CREATE_COVER_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS idx_exp_splits_expense_cover
+    ON expense_splits(expense_id, percentage, shares, amount_owed)
+"""
+DROP_COVER_INDEX_SQL = "DROP INDEX IF EXISTS idx_exp_splits_expense_cover"
+
+# One set-based UPDATE; the CASE arms are checked in order
+INFER_SPLIT_TYPE_SQL = """
+    UPDATE expenses
+    SET split_type = CASE
+        WHEN EXISTS (SELECT 1 FROM expense_items ei WHERE ei.expense_id = expenses.id)
+            THEN 'ITEMIZED'
+        WHEN (SELECT MAX(percentage) FROM expense_splits WHERE expense_id = expenses.id) IS NOT NULL
+            THEN 'PERCENT'
+        WHEN (SELECT MAX(shares) FROM expense_splits WHERE expense_id = expenses.id) IS NOT NULL
+            THEN 'SHARES'
+        WHEN (SELECT MAX(amount_owed) - MIN(amount_owed) FROM expense_splits WHERE expense_id = expenses.id) > 1
+            THEN 'EXACT'
+        ELSE 'EQUAL'
+    END
+    WHERE split_type IS NULL
+"""
+
+
+def migrate():
+    """Add split_type column to expenses table and infer it for existing rows."""
+    try:
+        # Everything below commits (or rolls back) as one transaction;
+        # closing() releases the connection afterwards
+        with closing(sqlite3.connect(DB_PATH)) as conn, conn:
+            tune_connection(conn)
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+
+            # Check if column already exists
+            cursor.execute("PRAGMA table_info(expenses)")
+            columns = [column[1] for column in cursor.fetchall()]
+
+            if 'split_type' not in columns:
+                print("Adding split_type column to expenses table...")
+                cursor.execute("""
+                    ALTER TABLE expenses
+                    ADD COLUMN split_type TEXT
+                """)
+                print("✓ Added split_type column")
+            else:
+                print("split_type column already exists")
+
+            # Inference only fills NULLs, so a database with none left has
+            # nothing to infer - one probe instead of the full UPDATE
+            cursor.execute("SELECT 1 FROM expenses WHERE split_type IS NULL LIMIT 1")
+            if cursor.fetchone() is None:
+                print("✓ All expenses already have a split_type - nothing to infer")
+                return
+
+            print("Inferring split_type for existing expenses...")
+            cursor.execute(CREATE_COVER_INDEX_SQL)
+            cursor.execute(INFER_SPLIT_TYPE_SQL)
+            print(f"  Classified {cursor.rowcount} expense(s)")
+            cursor.execute(DROP_COVER_INDEX_SQL)
+
+        print("\n✅ Migration completed successfully!")
+
+    except sqlite3.Error as e:
+        print(f"❌ Database error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Apply pending schema migrations, tracked with PRAGMA user_version
+------------------------------------------------------------------
+Each entry in MIGRATIONS is applied once, in order, and the database's
+user_version is bumped to its number. On an up-to-date database startup
+reads a single header integer and exits - no PRAGMA table_info probes.
+
+Databases created by init_db.py already have every column, index, trigger
+and constraint, so a step only runs its statements when its probe finds the
+change missing; either way the version is recorded so the probe never runs
+again.
+
+Usage:
+    python migrations/run_migrations.py [--db-path <path>]
+"""
+
+import sqlite3
+import sys
+import os
+from contextlib import closing
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from migrate_split_type import (
+    CREATE_COVER_INDEX_SQL, DROP_COVER_INDEX_SQL, INFER_SPLIT_TYPE_SQL
+)
+from add_managed_constraints import (
+    CHECK_NAME, PARTIAL_INDEX_SQL, get_table_sql, rebuild_with_check
+)
+from add_member_query_indexes import INDEXES as MEMBER_QUERY_INDEXES
+from add_delete_triggers import TRIGGERS as DELETE_TRIGGERS
+from add_friend_query_indexes import (
+    FRIENDSHIP_INDEX_SQL, REBUILD_SPLITS_INDEX_SQL, SPLITS_INDEX_COLUMNS, get_index_columns
+)
+
+
+def has_objects(kind, *names):
+    """Probe: every named index/trigger exists in sqlite_master"""
+    def probe(cursor):
+        existing = {row[0] for row in cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type=?", (kind,)
+        )}
+        return set(names) <= existing
+    return probe
+
+
+def has_managed_check(cursor):
+    """Probe: guest_members carries the managed_by_type CHECK constraint"""
+    return CHECK_NAME in get_table_sql(cursor, "guest_members")
+
+
+def has_managed_constraints(cursor):
+    """Probe: the CHECK constraint and idx_gm_managed are both present"""
+    return has_managed_check(cursor) and has_objects("index", "idx_gm_managed")(cursor)
+
+
+def add_managed_check(cursor):
+    """Rebuild guest_members with the CHECK constraint if it is missing"""
+    if not has_managed_check(cursor):
+        rebuild_with_check(cursor, get_table_sql(cursor, "guest_members"))
+
+
+def remove_duplicate_memberships(cursor):
+    """
+    Fold each duplicated (group_id, user_id) membership into its oldest row
+
+    The kept row takes over the manager of the oldest duplicate that has one,
+    so no management link is lost when the extra rows are deleted. Pairs whose
+    rows name different managers are reported; the first one (by id) wins.
+    """
+    rows = cursor.execute("""
+        SELECT id, group_id, user_id, managed_by_id, managed_by_type FROM group_members
+        WHERE (group_id, user_id) IN (
+            SELECT group_id, user_id FROM group_members
+            GROUP BY group_id, user_id HAVING COUNT(*) > 1
+        )
+        ORDER BY group_id, user_id, id
+    """).fetchall()
+    if not rows:
+        return
+
+    memberships = {}
+    for row_id, group_id, user_id, managed_by_id, managed_by_type in rows:
+        memberships.setdefault((group_id, user_id), []).append((row_id, managed_by_id, managed_by_type))
+
+    updates = []
+    duplicate_ids = []
+    for (group_id, user_id), members in memberships.items():
+        kept_id, kept_manager_id, _ = members[0]
+        managers = list(dict.fromkeys(
+            (managed_by_id, managed_by_type)
+            for _, managed_by_id, managed_by_type in members
+            if managed_by_id is not None
+        ))
+        if len(managers) > 1:
+            print(f"    ⚠️  User {user_id} in group {group_id} had managers {managers}; keeping {managers[0]}")
+        if managers and kept_manager_id is None:
+            updates.append((*managers[0], kept_id))
+        duplicate_ids.extend(row_id for row_id, _, _ in members[1:])
+
+    cursor.executemany(
+        "UPDATE group_members SET managed_by_id = ?, managed_by_type = ? WHERE id = ?",
+        updates
+    )
+
+    # The user stays in the group, so deleting their extra rows must not fire
+    # the unlink trigger (present if add_delete_triggers.py was run by hand)
+    trigger = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type='trigger' AND name='trg_group_members_unlink_managed'"
+    ).fetchone()
+    if trigger:
+        cursor.execute("DROP TRIGGER trg_group_members_unlink_managed")
+
+    cursor.executemany("DELETE FROM group_members WHERE id = ?", [(row_id,) for row_id in duplicate_ids])
+    print(f"    merged {len(duplicate_ids)} duplicate membership row(s) into {len(memberships)} membership(s)")
+
+    if trigger:
+        cursor.execute(trigger[0])
+
+
+def has_covering_splits_index(cursor):
+    """Probe: idx_expense_splits_user_guest has the covering column list"""
+    return get_index_columns(cursor, "idx_expense_splits_user_guest") == SPLITS_INDEX_COLUMNS
+
+
+def has_friend_indexes(cursor):
+    """Probe: the covering splits index and both friendship indexes exist"""
+    return has_covering_splits_index(cursor) and has_objects(
+        "index", "idx_friendships_pair", "idx_friendships_pair_reverse"
+    )(cursor)
+
+
+def add_covering_splits_index(cursor):
+    """Create or replace idx_expense_splits_user_guest unless it already matches"""
+    if not has_covering_splits_index(cursor):
+        for sql in REBUILD_SPLITS_INDEX_SQL:
+            cursor.execute(sql)
+
+
+def member_index_sql(*names):
+    """CREATE INDEX statements from add_member_query_indexes.py, by name"""
+    return [sql for name, sql in MEMBER_QUERY_INDEXES if name in names]
+
+
+# A step is (version, table, probe, statements) - append only, never renumber.
+# probe is a column name of `table` for column additions, or a callable
+# taking the cursor that returns True when the change is already present.
+# statements are SQL strings or callables taking the cursor.
+MIGRATIONS = [
+    (1, "group_members", "managed_by_id", [
+        "ALTER TABLE group_members ADD COLUMN managed_by_id INTEGER DEFAULT NULL",
+    ]),
+    (2, "group_members", "managed_by_type", [
+        "ALTER TABLE group_members ADD COLUMN managed_by_type TEXT DEFAULT NULL",
+    ]),
+    (3, "guest_members", "is_unknown_placeholder", [
+        "ALTER TABLE guest_members ADD COLUMN is_unknown_placeholder BOOLEAN DEFAULT 0",
+    ]),
+    (4, "expense_items", "split_type", [
+        "ALTER TABLE expense_items ADD COLUMN split_type TEXT DEFAULT 'EQUAL'",
+    ]),
+    (5, "expense_items", "split_details", [
+        "ALTER TABLE expense_items ADD COLUMN split_details TEXT",
+    ]),
+    (6, "users", "password_changed_at", [
+        "ALTER TABLE users ADD COLUMN password_changed_at DATETIME DEFAULT NULL",
+    ]),
+    (7, "users", "email_verified", [
+        "ALTER TABLE users ADD COLUMN email_verified BOOLEAN DEFAULT 0",
+    ]),
+    (8, "users", "last_login_at", [
+        "ALTER TABLE users ADD COLUMN last_login_at DATETIME DEFAULT NULL",
+    ]),
+    (9, "users", "default_currency", [
+        "ALTER TABLE users ADD COLUMN default_currency VARCHAR DEFAULT 'USD'",
+    ]),
+    (10, "expenses", "split_type", [
+        "ALTER TABLE expenses ADD COLUMN split_type TEXT",
+        CREATE_COVER_INDEX_SQL,
+        INFER_SPLIT_TYPE_SQL,
+        DROP_COVER_INDEX_SQL,
+    ]),
+    # Manager types outside 'user'/'guest' point at nothing; they are cleared
+    # so the CHECK constraint can be added (see add_managed_constraints.py)
+    (11, "guest_members", has_managed_constraints, [
+        """
+        UPDATE guest_members SET managed_by_id = NULL, managed_by_type = NULL
+        WHERE managed_by_type IS NOT NULL AND managed_by_type NOT IN ('user', 'guest')
+        """,
+        add_managed_check,
+        PARTIAL_INDEX_SQL,
+    ]),
+    (12, "guest_members, expense_item_assignments",
+        has_objects("index", "idx_guest_members_unknown", "idx_item_assignments_user_guest"),
+        member_index_sql("idx_guest_members_unknown", "idx_item_assignments_user_guest")),
+    # add_group_member's INSERT ... ON CONFLICT (group_id, user_id) needs this
+    # unique index; duplicate memberships are merged into one row first
+    (13, "group_members", has_objects("index", "idx_group_members_group_user"), [
+        remove_duplicate_memberships,
+        *member_index_sql("idx_group_members_group_user"),
+    ]),
+    # remove_group_member and remove_guest issue a single DELETE and rely on
+    # these triggers to unlink managed members and drop a guest's expenses
+    (14, "group_members, guest_members",
+        has_objects("trigger", *(name for name, _, _ in DELETE_TRIGGERS)),
+        [sql for _, _, sql in DELETE_TRIGGERS]),
+    # The friend queries seek on these; see add_friend_query_indexes.py
+    (15, "expense_splits, friendships", has_friend_indexes, [
+        add_covering_splits_index,
+        *FRIENDSHIP_INDEX_SQL,
+    ]),
+]
+
+
+def get_user_version(cursor):
+    """Read the schema version stored in the database header"""
+    return cursor.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(db_path):
+    """
+    Apply every migration newer than the database's user_version
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        bool: True if the database is up to date
+    """
+    if not os.path.exists(db_path):
+        print(f"❌ Database file not found: {db_path}")
+        return False
+
+    try:
+        # closing() releases the connection; `with conn:` commits the whole
+        # batch on success or rolls it back on error
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            cursor = conn.cursor()
+            current = get_user_version(cursor)
+            pending = [m for m in MIGRATIONS if m[0] > current]
+
+            if not pending:
+                print(f"✓ Schema is up to date (version {current})")
+                return True
+
+            print(f"Schema version {current}, applying {len(pending)} migration(s)...")
+
+            cursor.execute("BEGIN")
+            for version, table, probe, statements in pending:
+                if callable(probe):
+                    applied = probe(cursor)
+                    change = f"{table} schema change"
+                else:
+                    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+                    applied = probe in columns
+                    change = f"{table}.{probe}"
+                if not applied:
+                    for statement in statements:
+                        if callable(statement):
+                            statement(cursor)
+                        else:
+                            cursor.execute(statement)
+                    print(f"  ✓ {version}: applied {change}")
+                else:
+                    print(f"  ✓ {version}: {change} already present")
+                cursor.execute(f"PRAGMA user_version = {version}")
+
+        print(f"✅ Schema is now at version {pending[-1][0]}")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Migration failed and was rolled back: {e}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument(
+        "--db-path",
+        default=os.environ.get("DATABASE_PATH", "db.sqlite3"),
+        help="Path to SQLite database file (default: $DATABASE_PATH or db.sqlite3)"
+    )
+    args = parser.parse_args()
+
+    sys.exit(0 if run_migrations(args.db_path) else 1)
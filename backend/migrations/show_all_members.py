@@ -22,30 +22,37 @@ engine = create_engine(f"sqlite:///{args.db_path}")
 SessionLocal = sessionmaker(bind=engine)
 db = SessionLocal()
 
-print("=" * 80)
-print("ALL USERS")
-print("=" * 80)
+# Report lines are collected and written to stdout once at the end
+buf: list[str] = []
+
+buf.append("=" * 80)
+buf.append("ALL USERS")
+buf.append("=" * 80)
 users = db.query(models.User).all()
 for user in users:
-    print(f"User ID: {user.id}, Email: {user.email}")
+    buf.append(f"User ID: {user.id}, Email: {user.email}")
 
-print("\n" + "=" * 80)
-print("ALL GUESTS (including unclaimed)")
-print("=" * 80)
+buf.append("\n" + "=" * 80)
+buf.append("ALL GUESTS (including unclaimed)")
+buf.append("=" * 80)
 guests = db.query(models.GuestMember).all()
 for guest in guests:
     claimed_status = f"Claimed by User {guest.claimed_by_id}" if guest.claimed_by_id else "Unclaimed"
     managed_status = f"Managed by {guest.managed_by_type} {guest.managed_by_id}" if guest.managed_by_id else "Not managed"
-    print(f"Guest ID: {guest.id}, Name: '{guest.name}', {claimed_status}, {managed_status}")
-
-print("\n" + "=" * 80)
-print("ALL GROUP MEMBERS")
-print("=" * 80)
-members = db.query(models.GroupMember).all()
-for member in members:
-    user = db.query(models.User).filter(models.User.id == member.user_id).first()
+    buf.append(f"Guest ID: {guest.id}, Name: '{guest.name}', {claimed_status}, {managed_status}")
+
+buf.append("\n" + "=" * 80)
+buf.append("ALL GROUP MEMBERS")
+buf.append("=" * 80)
+# Each member alongside its user (or None) in a single query
+members = db.query(models.GroupMember, models.User).outerjoin(
+    models.User, models.User.id == models.GroupMember.user_id
+).all()
+for member, user in members:
     email = user.email if user else "Unknown"
     managed_status = f"Managed by {member.managed_by_type} {member.managed_by_id}" if member.managed_by_id else "Not managed"
-    print(f"Group {member.group_id}, User {member.user_id} ({email}), {managed_status}")
+    buf.append(f"Group {member.group_id}, User {member.user_id} ({email}), {managed_status}")
 
 db.close()
+
+sys.stdout.write("\n".join(buf) + "\n")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, CheckConstraint, Index, DDL, event
 from database import Base
 from datetime import datetime
 
@@ -35,6 +35,11 @@ class GroupMember(Base):
     managed_by_id = Column(Integer, nullable=True)  # ID of manager (user or guest)
     managed_by_type = Column(String, nullable=True)  # 'user' or 'guest'
 
+    # Membership checks filter on both columns; a user is in a group once
+    __table_args__ = (
+        Index("idx_group_members_group_user", "group_id", "user_id", unique=True),
+    )
+
 class GuestMember(Base):
     __tablename__ = "guest_members"
 
@@ -47,6 +52,58 @@ class GuestMember(Base):
     managed_by_type = Column(String, nullable=True)  # 'user' or 'guest'
     is_unknown_placeholder = Column(Boolean, default=False)  # True for "Unknown" placeholder guests
 
+    __table_args__ = (
+        CheckConstraint(
+            "managed_by_type IN ('user', 'guest') OR managed_by_type IS NULL",
+            name="ck_guest_members_managed_by_type"
+        ),
+        Index("idx_gm_managed", "managed_by_id", sqlite_where=managed_by_id.isnot(None)),
+        # Each group has at most one Unknown placeholder; index only those rows
+        Index("idx_guest_members_unknown", "group_id", sqlite_where=is_unknown_placeholder == True),
+    )
+
+# managed_by_id points at either a user or a guest depending on managed_by_type,
+# so it cannot be a foreign key with ON DELETE SET NULL. These triggers do the
+# same job: deleting a member or guest unlinks everyone it managed inside the
+# DELETE itself, so the routers issue a single statement.
+UNLINK_ON_MEMBER_DELETE = DDL("""
+CREATE TRIGGER IF NOT EXISTS trg_group_members_unlink_managed
+AFTER DELETE ON group_members
+BEGIN
+    UPDATE guest_members SET managed_by_id = NULL, managed_by_type = NULL
+    WHERE group_id = OLD.group_id AND managed_by_id = OLD.user_id AND managed_by_type = 'user';
+    UPDATE group_members SET managed_by_id = NULL, managed_by_type = NULL
+    WHERE group_id = OLD.group_id AND managed_by_id = OLD.user_id AND managed_by_type = 'user';
+END
+""")
+
+UNLINK_ON_GUEST_DELETE = DDL("""
+CREATE TRIGGER IF NOT EXISTS trg_guest_members_unlink_managed
+AFTER DELETE ON guest_members
+BEGIN
+    UPDATE guest_members SET managed_by_id = NULL, managed_by_type = NULL
+    WHERE managed_by_id = OLD.id AND managed_by_type = 'guest';
+    UPDATE group_members SET managed_by_id = NULL, managed_by_type = NULL
+    WHERE managed_by_id = OLD.id AND managed_by_type = 'guest';
+END
+""")
+
+# Same reasoning for ExpenseSplit.user_id / Expense.payer_id, which hold a guest
+# id only when is_guest / payer_is_guest is set: deleting a guest cascades to
+# its splits and to the expenses it paid for.
+CASCADE_ON_GUEST_DELETE = DDL("""
+CREATE TRIGGER IF NOT EXISTS trg_guest_members_cascade_expenses
+AFTER DELETE ON guest_members
+BEGIN
+    DELETE FROM expense_splits WHERE user_id = OLD.id AND is_guest = 1;
+    DELETE FROM expenses WHERE payer_id = OLD.id AND payer_is_guest = 1;
+END
+""")
+
+event.listen(GroupMember.__table__, "after_create", UNLINK_ON_MEMBER_DELETE)
+event.listen(GuestMember.__table__, "after_create", UNLINK_ON_GUEST_DELETE)
+event.listen(GuestMember.__table__, "after_create", CASCADE_ON_GUEST_DELETE)
+
 class Friendship(Base):
     __tablename__ = "friendships"
 
@@ -54,6 +111,12 @@ class Friendship(Base):
     user_id1 = Column(Integer)
     user_id2 = Column(Integer)
 
+    # Friendship checks match either orientation of the pair
+    __table_args__ = (
+        Index("idx_friendships_pair", "user_id1", "user_id2"),
+        Index("idx_friendships_pair_reverse", "user_id2", "user_id1"),
+    )
+
 class Expense(Base):
     __tablename__ = "expenses"
 
@@ -85,6 +148,11 @@ class ExpenseSplit(Base):
     percentage = Column(Integer, nullable=True) # For percentage splits
     shares = Column(Integer, nullable=True) # For share splits
 
+    # Covering index for "expenses this user/guest is in" lookups
+    __table_args__ = (
+        Index("idx_expense_splits_user_guest", "user_id", "is_guest", "expense_id"),
+    )
+
 class ExpenseItem(Base):
     __tablename__ = "expense_items"
 
@@ -104,6 +172,11 @@ class ExpenseItemAssignment(Base):
     user_id = Column(Integer, nullable=False)
     is_guest = Column(Boolean, default=False)
 
+    # Lookups of a user's / guest's assignments (e.g. the Unknown guest's)
+    __table_args__ = (
+        Index("idx_item_assignments_user_guest", "user_id", "is_guest"),
+    )
+
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
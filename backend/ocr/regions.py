@@ -1,11 +1,67 @@
+import heapq
 import re
 import time
-from typing import List, Dict, Tuple, Optional, Any
-from dataclasses import dataclass
+from collections import defaultdict
+from operator import attrgetter, itemgetter
+from typing import List, Dict, DefaultDict, Tuple, Optional, Any
+from dataclasses import dataclass, field
 from threading import Lock
 
 
-@dataclass
+# Patterns are compiled once at import; the helpers below run them against
+# every region of every OCR response. Each category is a single alternation
+# so a line is scanned once rather than once per pattern. re.ASCII keeps
+# \d, \s and \b to their ASCII classes: receipt digits and keywords are
+# ASCII, and the narrower classes are cheaper to test.
+_PRICE_RE = re.compile(
+    r'\$\s?\d+\.\d{2}'            # $12.99
+    r'|\d+\.\d{2}\s?(?:USD|usd)'  # 12.99 USD
+    r'|(?<!\d)\d+\.\d{2}(?!\d)',  # 12.99
+    re.ASCII
+)
+
+# Footer keywords used by _detect_footer_boundary
+_FOOTER_BOUNDARY_RE = re.compile(
+    r'\b(?:total|subtotal|grand\s+total|thank\s+you|have\s+a\s+.*\s+day'
+    r'|visit\s+us|tender|change|balance)\b'
+    r'|\bcard\s*#',
+    re.I | re.ASCII
+)
+
+_TAX_TIP_RE = re.compile(r'\b(?:tax|tip|gratuity|service\s+charge|delivery\s+fee)\b', re.I | re.ASCII)
+
+_QUANTITY_RE = re.compile(
+    r'\d+\s?x\b'            # "2x Burger"
+    r'|^\d+\s+[A-Za-z]'     # "2 Diet Coke"
+    r'|@\s?\$?\d+\.\d{2}',  # "@ $5.99"
+    re.I | re.ASCII
+)
+
+# Footer keywords used by filter_item_regions
+_FILTER_FOOTER_KEYWORD_RE = re.compile(
+    r'\b(?:total|subtotal|grand\s+total|thank\s+you|have\s+a\s+.*\s+day|tender|balance)\b'
+    r'|\bcard\s*#',
+    re.I | re.ASCII
+)
+
+_HEADER_RE = re.compile(
+    r'\d{3}[-.:]\d{3}[-.:]\d{4}'   # Phone numbers
+    r'|www\.|\.com|\.net'          # URLs
+    r'|^\d+\s+[A-Z][a-z]+\s+St',   # Addresses (e.g., "123 Main St")
+    re.I | re.ASCII
+)
+
+_FOOTER_RE = re.compile(r'thank\s+you|please\s+come\s+again|visit\s+us', re.I | re.ASCII)
+
+# Deletes the separators allowed in a numbers-only region in one pass
+_NUMBER_PUNCTUATION_TABLE = str.maketrans('', '', ' .,$')
+
+# Vertex coordinate accessors for normalize_bounding_box
+_get_x = attrgetter('x')
+_get_y = attrgetter('y')
+
+
+@dataclass(slots=True)
 class BoundingBox:
     """Normalized bounding box coordinates (0-1 range)."""
     x_min: float
@@ -34,28 +90,32 @@ class BoundingBox:
         return self.width * self.height
 
 
-@dataclass
+@dataclass(slots=True)
 class TextRegion:
     """Represents a detected text region with metadata."""
     text: str
     bounding_box: BoundingBox
     confidence: float = 1.0
+    # Memoized has_price_pattern() result; text is not changed after creation
+    _has_price: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+    # text.strip(), computed once for the length checks in the filters
+    _stripped: str = field(default='', init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._stripped = self.text.strip()
 
     def has_price_pattern(self) -> bool:
         """Check if region contains price-like text."""
-        price_patterns = [
-            r'\$\s?\d+\.\d{2}',           # $12.99
-            r'\d+\.\d{2}\s?(?:USD|usd)',  # 12.99 USD
-            r'(?<!\d)\d+\.\d{2}(?!\d)',   # 12.99
-        ]
-        for pattern in price_patterns:
-            if re.search(pattern, self.text):
-                return True
-        return False
+        if self._has_price is None:
+            self._has_price = _PRICE_RE.search(self.text) is not None
+        return self._has_price
 
 
 # In-memory cache with TTL
 _cache: Dict[str, Tuple[Any, float]] = {}
+# Min-heap of (expiry_time, key); entries for overwritten keys go stale and
+# are discarded when popped
+_expiry_heap: List[Tuple[float, str]] = []
 _cache_lock = Lock()
 
 
@@ -79,27 +139,36 @@ def detect_regions(vision_response) -> List[TextRegion]:
     if not vision_response:
         raise ValueError("vision_response cannot be None")
 
-    # Try smart detection first (best quality)
-    try:
-        regions = detect_smart_regions(vision_response)
-        if regions:
-            return regions
-    except Exception as e:
-        print(f"Warning: Smart region detection failed: {e}")
-
-    regions = []
-
-    # Fallback: Try full_text_annotation (provides block/paragraph structure)
+    # Walk the block/paragraph/word tree once; smart detection and the
+    # plain full_text_annotation fallback both work from these paragraphs
+    paragraphs = None
     if hasattr(vision_response, 'full_text_annotation') and vision_response.full_text_annotation:
         try:
-            regions = _extract_regions_from_full_annotation(vision_response.full_text_annotation)
+            paragraphs = _extract_regions_from_full_annotation(vision_response.full_text_annotation)
+            # Sorted by vertical position once for both passes below
+            paragraphs.sort(key=_center_y)
         except Exception as e:
             print(f"Warning: Failed to extract regions from full_text_annotation: {e}")
 
+    # Try smart detection first (best quality). Without paragraphs (no
+    # annotation, no pages, or nothing but blank text) it can only fail or
+    # find nothing, so go straight to the fallbacks instead of raising
+    if paragraphs:
+        try:
+            regions = detect_smart_regions(vision_response, paragraphs=paragraphs, presorted=True)
+            if regions:
+                return regions
+        except Exception as e:
+            print(f"Warning: Smart region detection failed: {e}")
+
+    # Fallback: paragraphs from full_text_annotation (block/paragraph structure)
+    regions = paragraphs or []
+
     # Fallback to text_annotations (simpler structure)
     if not regions and hasattr(vision_response, 'text_annotations') and vision_response.text_annotations:
         try:
             regions = _extract_regions_from_text_annotations(vision_response.text_annotations)
+            regions.sort(key=_center_y)
         except Exception as e:
             print(f"Warning: Failed to extract regions from text_annotations: {e}")
 
@@ -107,12 +176,16 @@ def detect_regions(vision_response) -> List[TextRegion]:
         raise ValueError("No text regions found in vision_response")
 
     # Apply filtering heuristics
-    filtered_regions = filter_item_regions(regions)
+    filtered_regions = filter_item_regions(regions, presorted=True)
 
     return filtered_regions
 
 
-def detect_smart_regions(vision_response) -> List[TextRegion]:
+def detect_smart_regions(
+    vision_response,
+    paragraphs: Optional[List[TextRegion]] = None,
+    presorted: bool = False,
+) -> List[TextRegion]:
     """
     Smart region detection using Vision API's structural data and price patterns.
 
@@ -126,6 +199,9 @@ def detect_smart_regions(vision_response) -> List[TextRegion]:
     Args:
         vision_response: Google Cloud Vision AnnotateImageResponse with
                         full_text_annotation.pages structure
+        paragraphs: Regions already extracted from full_text_annotation;
+                    extracted here when not given
+        presorted: True if paragraphs are already sorted by center_y
 
     Returns:
         List of TextRegion objects representing likely items
@@ -145,28 +221,12 @@ def detect_smart_regions(vision_response) -> List[TextRegion]:
     image_height = page.height if hasattr(page, 'height') else 1
     image_size = (image_width, image_height)
 
-    # Extract all paragraphs with metadata
-    all_paragraphs = []
-    for block in page.blocks:
-        for paragraph in block.paragraphs:
-            # Reconstruct text from words
-            words = []
-            for word in paragraph.words:
-                word_text = ''.join([symbol.text for symbol in word.symbols])
-                words.append(word_text)
+    if paragraphs is None:
+        paragraphs = _extract_regions_from_full_annotation(full_text)
+        presorted = False
 
-            text = ' '.join(words).strip()
-            if not text:
-                continue
-
-            bbox = normalize_bounding_box(paragraph.bounding_box.vertices, image_size)
-            confidence = paragraph.confidence if hasattr(paragraph, 'confidence') else 1.0
-
-            region = TextRegion(text=text, bounding_box=bbox, confidence=confidence)
-            all_paragraphs.append(region)
-
-    # Sort by vertical position
-    all_paragraphs.sort(key=lambda r: r.bounding_box.center_y)
+    # Sort by vertical position (a copy; the caller may reuse paragraphs)
+    all_paragraphs = paragraphs if presorted else sorted(paragraphs, key=_center_y)
 
     # Identify regions: header, items, footer
     header_end_y = _detect_header_boundary(all_paragraphs)
@@ -176,23 +236,10 @@ def detect_smart_regions(vision_response) -> List[TextRegion]:
     item_regions = []
     tax_tip_regions = []
 
-    for region in all_paragraphs:
-        center_y = region.bounding_box.center_y
-
-        # Skip header region
-        if center_y < header_end_y:
-            continue
-
-        # Skip footer region
-        if center_y > footer_start_y:
-            continue
-
-        # Skip if too small or too large
-        if region.bounding_box.area < 0.003 or region.bounding_box.area > 0.5:
-            continue
-
+    # Header/footer and size limits first; only survivors get text checks
+    for region in _filter_by_geometry(all_paragraphs, header_end_y, footer_start_y):
         # Skip single characters
-        if len(region.text.strip()) <= 1:
+        if len(region._stripped) <= 1:
             continue
 
         # Check if tax/tip line
@@ -211,6 +258,58 @@ def detect_smart_regions(vision_response) -> List[TextRegion]:
     return grouped_regions + tax_tip_regions
 
 
+def _center_y(region: TextRegion) -> float:
+    """Sort key: vertical center of a region's bounding box."""
+    return region.bounding_box.center_y
+
+
+def _filter_by_geometry(
+    regions: List[TextRegion],
+    header_end_y: float,
+    footer_start_y: float,
+    min_height: float = 0.0,
+) -> List[TextRegion]:
+    """
+    Keep regions inside the item band whose size is plausible for a line.
+
+    Each box's center, area and height are computed once, straight from its
+    coordinates, so the numeric limits are applied before any regex runs.
+
+    Args:
+        regions: Regions to filter, in any order
+        header_end_y: Regions centered above this are header
+        footer_start_y: Regions centered below this are footer
+        min_height: Minimum box height (thinner boxes are separators)
+
+    Returns:
+        Regions that pass every geometric check, in input order
+    """
+    kept = []
+    for region in regions:
+        bbox = region.bounding_box
+        height = bbox.y_max - bbox.y_min
+        center_y = (bbox.y_min + bbox.y_max) / 2
+        area = (bbox.x_max - bbox.x_min) * height
+
+        if (header_end_y <= center_y <= footer_start_y
+                and 0.003 <= area <= 0.5
+                and height >= min_height):
+            kept.append(region)
+
+    return kept
+
+
+def _first_priced_index(regions: List[TextRegion]) -> int:
+    """
+    Return the index of the first region with a price pattern, or -1.
+
+    has_price_pattern() is memoized per region, so calling this for the
+    smart pass and again for the fallback filter re-reads cached results.
+    A bisect is not possible: price lines are not contiguous in y order.
+    """
+    return next((i for i, region in enumerate(regions) if region.has_price_pattern()), -1)
+
+
 def _detect_header_boundary(paragraphs: List[TextRegion]) -> float:
     """
     Detect where the header ends (store name, address, phone, etc.).
@@ -229,15 +328,12 @@ def _detect_header_boundary(paragraphs: List[TextRegion]) -> float:
     # Default: top 15% is header
     header_boundary = 0.15
 
-    # Look for the first paragraph with a price pattern
-    for i, region in enumerate(paragraphs):
-        if region.has_price_pattern():
-            # Header ends just before first price
-            if i > 0:
-                header_boundary = paragraphs[i - 1].bounding_box.y_max
-            else:
-                header_boundary = region.bounding_box.y_min
-            break
+    # Header ends just before the first paragraph with a price pattern
+    i = _first_priced_index(paragraphs)
+    if i > 0:
+        header_boundary = paragraphs[i - 1].bounding_box.y_max
+    elif i == 0:
+        header_boundary = paragraphs[0].bounding_box.y_min
 
     # Cap at 25% to avoid over-filtering
     return min(header_boundary, 0.25)
@@ -258,29 +354,15 @@ def _detect_footer_boundary(paragraphs: List[TextRegion]) -> float:
     Returns:
         Y coordinate (normalized 0-1) where footer begins
     """
-    footer_keywords = [
-        r'\btotal\b',
-        r'\bsubtotal\b',
-        r'\bgrand\s+total\b',
-        r'\bthank\s+you\b',
-        r'\bhave\s+a\s+.*\s+day\b',
-        r'\bvisit\s+us\b',
-        r'\bcard\s*#',
-        r'\btender\b',
-        r'\bchange\b',
-        r'\bbalance\b',
-    ]
-
     # Default: bottom 15% is footer
     footer_boundary = 0.85
 
     # Look for footer keyword from bottom up
     for region in reversed(paragraphs):
-        for pattern in footer_keywords:
-            if re.search(pattern, region.text, re.I):
-                # Footer starts at this line
-                footer_boundary = region.bounding_box.y_min
-                return max(footer_boundary, 0.75)  # Cap at 75% to avoid over-filtering
+        if _FOOTER_BOUNDARY_RE.search(region.text):
+            # Footer starts at this line
+            footer_boundary = region.bounding_box.y_min
+            return max(footer_boundary, 0.75)  # Cap at 75% to avoid over-filtering
 
     return footer_boundary
 
@@ -295,19 +377,7 @@ def _is_tax_tip_line(text: str) -> bool:
     Returns:
         True if line contains tax/tip keywords
     """
-    tax_tip_patterns = [
-        r'\btax\b',
-        r'\btip\b',
-        r'\bgratuity\b',
-        r'\bservice\s+charge\b',
-        r'\bdelivery\s+fee\b',
-    ]
-
-    for pattern in tax_tip_patterns:
-        if re.search(pattern, text, re.I):
-            return True
-
-    return False
+    return _TAX_TIP_RE.search(text) is not None
 
 
 def _is_likely_item_line(text: str) -> bool:
@@ -327,23 +397,17 @@ def _is_likely_item_line(text: str) -> bool:
         True if likely an item description
     """
     # Check for quantity patterns
-    quantity_patterns = [
-        r'\d+\s?x\b',            # "2x Burger"
-        r'^\d+\s+[A-Za-z]',      # "2 Diet Coke"
-        r'@\s?\$?\d+\.\d{2}',    # "@ $5.99"
-    ]
-
-    for pattern in quantity_patterns:
-        if re.search(pattern, text, re.I):
-            return True
+    if _QUANTITY_RE.search(text):
+        return True
 
     # Check length
-    if len(text.strip()) < 3 or len(text.strip()) > 50:
+    stripped_length = len(text.strip())
+    if stripped_length < 3 or stripped_length > 50:
         return False
 
     # Check if mostly letters (likely a description)
-    letter_count = sum(1 for c in text if c.isalpha())
-    total_count = len(text.replace(' ', ''))
+    letter_count = sum(map(str.isalpha, text))
+    total_count = len(text) - text.count(' ')
 
     if total_count > 0 and letter_count / total_count > 0.4:
         # At least 40% letters = likely description
@@ -371,48 +435,45 @@ def _group_multiline_items(regions: List[TextRegion], image_size: Tuple[int, int
     if len(regions) < 2:
         return regions
 
-    grouped = []
-    skip_next = False
+    # Decide every adjacent pair up front: vertically close (within 5% of
+    # image height) and exactly one of the two has a price
+    has_price = [region.has_price_pattern() for region in regions]
+    mergeable = [
+        nxt.bounding_box.y_min - cur.bounding_box.y_max < 0.05 and cur_price != next_price
+        for cur, nxt, cur_price, next_price in zip(regions, regions[1:], has_price, has_price[1:])
+    ]
 
-    for i in range(len(regions)):
-        if skip_next:
-            skip_next = False
-            continue
+    grouped = []
+    i = 0
+    count = len(regions)
 
+    while i < count:
         current = regions[i]
 
-        # Check if we should merge with next region
-        if i < len(regions) - 1:
+        if i < count - 1 and mergeable[i]:
             next_region = regions[i + 1]
 
-            # Vertical proximity check (within 5% of image height)
-            vertical_distance = next_region.bounding_box.y_min - current.bounding_box.y_max
-            if vertical_distance < 0.05:
-                # Check if one has price and other doesn't
-                current_has_price = current.has_price_pattern()
-                next_has_price = next_region.has_price_pattern()
+            # Merge: description + price
+            merged_text = f"{current.text} {next_region.text}"
 
-                if current_has_price != next_has_price:
-                    # Merge: description + price
-                    merged_text = f"{current.text} {next_region.text}"
+            # Calculate combined bounding box
+            merged_bbox = BoundingBox(
+                x_min=min(current.bounding_box.x_min, next_region.bounding_box.x_min),
+                y_min=current.bounding_box.y_min,
+                x_max=max(current.bounding_box.x_max, next_region.bounding_box.x_max),
+                y_max=next_region.bounding_box.y_max,
+            )
 
-                    # Calculate combined bounding box
-                    merged_bbox = BoundingBox(
-                        x_min=min(current.bounding_box.x_min, next_region.bounding_box.x_min),
-                        y_min=current.bounding_box.y_min,
-                        x_max=max(current.bounding_box.x_max, next_region.bounding_box.x_max),
-                        y_max=next_region.bounding_box.y_max,
-                    )
+            merged_confidence = (current.confidence + next_region.confidence) / 2
+            grouped.append(TextRegion(text=merged_text, bounding_box=merged_bbox, confidence=merged_confidence))
 
-                    merged_confidence = (current.confidence + next_region.confidence) / 2
-                    merged_region = TextRegion(text=merged_text, bounding_box=merged_bbox, confidence=merged_confidence)
-
-                    grouped.append(merged_region)
-                    skip_next = True
-                    continue
+            # The next region is consumed by the merge
+            i += 2
+            continue
 
         # No merge, add as-is
         grouped.append(current)
+        i += 1
 
     return grouped
 
@@ -444,12 +505,10 @@ def _extract_regions_from_full_annotation(full_text_annotation) -> List[TextRegi
     for block in page.blocks:
         for paragraph in block.paragraphs:
             # Concatenate words in paragraph
-            text_parts = []
-            for word in paragraph.words:
-                word_text = ''.join([symbol.text for symbol in word.symbols])
-                text_parts.append(word_text)
-
-            text = ' '.join(text_parts).strip()
+            text = ' '.join([
+                ''.join([symbol.text for symbol in word.symbols])
+                for word in paragraph.words
+            ]).strip()
 
             if text and hasattr(paragraph, 'bounding_box'):
                 bbox = normalize_bounding_box(paragraph.bounding_box.vertices, image_size)
@@ -483,8 +542,9 @@ def _extract_regions_from_text_annotations(text_annotations) -> List[TextRegion]
     image_height = max(v.y for v in first_bbox if hasattr(v, 'y'))
     image_size = (image_width, image_height)
 
-    # Group annotations by vertical position (approximate lines)
-    lines: Dict[int, List[Tuple[str, Any]]] = {}
+    # Group annotations by vertical position (approximate lines); each entry
+    # carries its left edge so the per-line sort needs no vertex access
+    lines: DefaultDict[int, List[Tuple[float, str, Any]]] = defaultdict(list)
 
     for annotation in text_annotations[1:]:  # Skip first (full text)
         if not hasattr(annotation, 'bounding_poly') or not annotation.bounding_poly.vertices:
@@ -493,33 +553,43 @@ def _extract_regions_from_text_annotations(text_annotations) -> List[TextRegion]
         text = annotation.description
         vertices = annotation.bounding_poly.vertices
 
-        # Calculate center Y position
-        y_coords = [v.y for v in vertices if hasattr(v, 'y')]
-        if not y_coords:
+        # Center Y position and left edge in one pass over the vertices
+        y_sum = 0
+        y_count = 0
+        x_min = None
+        for v in vertices:
+            y = getattr(v, 'y', None)
+            if y is not None:
+                y_sum += y
+                y_count += 1
+            x = getattr(v, 'x', None)
+            if x is not None and (x_min is None or x < x_min):
+                x_min = x
+
+        if not y_count:
             continue
+        if x_min is None:
+            raise ValueError("No valid x coordinates found in text annotation")
 
-        center_y = sum(y_coords) / len(y_coords)
+        center_y = y_sum / y_count
 
         # Group into lines (within 10 pixels vertical tolerance)
         line_key = int(center_y / 10) * 10
 
-        if line_key not in lines:
-            lines[line_key] = []
-
-        lines[line_key].append((text, vertices))
+        lines[line_key].append((x_min, text, vertices))
 
     # Convert lines to regions
     for line_key in sorted(lines.keys()):
         line_items = lines[line_key]
 
         # Sort items by x position
-        line_items.sort(key=lambda item: min(v.x for v in item[1] if hasattr(v, 'x')))
+        line_items.sort(key=itemgetter(0))
 
         # Combine text
-        text = ' '.join([item[0] for item in line_items])
+        text = ' '.join([item[1] for item in line_items])
 
         # Calculate combined bounding box
-        all_vertices = [v for item in line_items for v in item[1]]
+        all_vertices = [v for item in line_items for v in item[2]]
         bbox = normalize_bounding_box(all_vertices, image_size)
 
         regions.append(TextRegion(text=text, bounding_box=bbox))
@@ -527,6 +597,35 @@ def _extract_regions_from_text_annotations(text_annotations) -> List[TextRegion]
     return regions
 
 
+def _vertex_bounds(vertices) -> Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]:
+    """
+    Return (x_min, x_max, y_min, y_max) over vertices, skipping missing coordinates.
+
+    Slow path for vertex objects that lack an x or y attribute (or hold None);
+    a bound is None when no vertex provides that coordinate.
+    """
+    x_lo = x_hi = y_lo = y_hi = None
+    for v in vertices:
+        x = getattr(v, 'x', None)
+        if x is not None:
+            if x_lo is None:
+                x_lo = x_hi = x
+            elif x < x_lo:
+                x_lo = x
+            elif x > x_hi:
+                x_hi = x
+        y = getattr(v, 'y', None)
+        if y is not None:
+            if y_lo is None:
+                y_lo = y_hi = y
+            elif y < y_lo:
+                y_lo = y
+            elif y > y_hi:
+                y_hi = y
+
+    return x_lo, x_hi, y_lo, y_hi
+
+
 def normalize_bounding_box(vertices, image_size: Tuple[int, int]) -> BoundingBox:
     """
     Convert pixel coordinates to normalized 0-1 values.
@@ -549,29 +648,35 @@ def normalize_bounding_box(vertices, image_size: Tuple[int, int]) -> BoundingBox
 
     image_width, image_height = image_size
 
-    # Extract x and y coordinates
-    x_coords = [v.x for v in vertices if hasattr(v, 'x')]
-    y_coords = [v.y for v in vertices if hasattr(v, 'y')]
-
-    if not x_coords or not y_coords:
+    try:
+        # Vision vertices always carry x and y (protobuf fields default to 0),
+        # so the C-level attrgetter/min/max path covers the normal case
+        xs = list(map(_get_x, vertices))
+        ys = list(map(_get_y, vertices))
+        x_lo, x_hi = min(xs), max(xs)
+        y_lo, y_hi = min(ys), max(ys)
+    except (AttributeError, TypeError):
+        x_lo, x_hi, y_lo, y_hi = _vertex_bounds(vertices)
+
+    if x_lo is None or y_lo is None:
         raise ValueError("No valid x/y coordinates found in vertices")
 
     # Calculate bounds
-    x_min = min(x_coords) / image_width
-    x_max = max(x_coords) / image_width
-    y_min = min(y_coords) / image_height
-    y_max = max(y_coords) / image_height
+    x_min = x_lo / image_width
+    x_max = x_hi / image_width
+    y_min = y_lo / image_height
+    y_max = y_hi / image_height
 
     # Clamp to [0, 1] range
-    x_min = max(0.0, min(1.0, x_min))
-    x_max = max(0.0, min(1.0, x_max))
-    y_min = max(0.0, min(1.0, y_min))
-    y_max = max(0.0, min(1.0, y_max))
+    x_min = 0.0 if x_min < 0.0 else 1.0 if x_min > 1.0 else x_min
+    x_max = 0.0 if x_max < 0.0 else 1.0 if x_max > 1.0 else x_max
+    y_min = 0.0 if y_min < 0.0 else 1.0 if y_min > 1.0 else y_min
+    y_max = 0.0 if y_max < 0.0 else 1.0 if y_max > 1.0 else y_max
 
     return BoundingBox(x_min=x_min, y_min=y_min, x_max=x_max, y_max=y_max)
 
 
-def filter_item_regions(regions: List[TextRegion]) -> List[TextRegion]:
+def filter_item_regions(regions: List[TextRegion], presorted: bool = False) -> List[TextRegion]:
     """
     Apply smart heuristics to filter out headers, footers, and noise.
 
@@ -589,6 +694,7 @@ def filter_item_regions(regions: List[TextRegion]) -> List[TextRegion]:
 
     Args:
         regions: List of TextRegion objects to filter
+        presorted: True if regions are already sorted by center_y
 
     Returns:
         Filtered list of TextRegion objects
@@ -597,100 +703,48 @@ def filter_item_regions(regions: List[TextRegion]) -> List[TextRegion]:
         return []
 
     # Sort by vertical position first
-    sorted_regions = sorted(regions, key=lambda r: r.bounding_box.center_y)
+    sorted_regions = regions if presorted else sorted(regions, key=_center_y)
 
     # Detect header/footer boundaries using price alignment
     header_end_y = 0.1  # Default
     footer_start_y = 0.9  # Default
 
     # Find first region with price (header ends here)
-    for region in sorted_regions:
-        if region.has_price_pattern():
-            header_end_y = max(0.05, region.bounding_box.y_min - 0.02)
-            break
+    first_price = _first_priced_index(sorted_regions)
+    if first_price >= 0:
+        header_end_y = max(0.05, sorted_regions[first_price].bounding_box.y_min - 0.02)
 
     # Find footer keywords
-    footer_keywords = [
-        r'\btotal\b', r'\bsubtotal\b', r'\bgrand\s+total\b',
-        r'\bthank\s+you\b', r'\bhave\s+a\s+.*\s+day\b',
-        r'\bcard\s*#', r'\btender\b', r'\bbalance\b',
-    ]
-
     for region in reversed(sorted_regions):
-        for keyword in footer_keywords:
-            if re.search(keyword, region.text, re.I):
-                footer_start_y = min(0.95, region.bounding_box.y_min)
-                break
+        if _FILTER_FOOTER_KEYWORD_RE.search(region.text):
+            footer_start_y = min(0.95, region.bounding_box.y_min)
         if footer_start_y < 0.9:
             break
 
-    # Header/footer filtering patterns
-    header_patterns = [
-        r'\d{3}[-.:]\d{3}[-.:]\d{4}',  # Phone numbers
-        r'www\.|\.com|\.net',           # URLs
-        r'^\d+\s+[A-Z][a-z]+\s+St',     # Addresses (e.g., "123 Main St")
-    ]
-
-    footer_patterns = [
-        r'thank\s+you',
-        r'please\s+come\s+again',
-        r'visit\s+us',
-    ]
-
     filtered = []
 
-    for region in sorted_regions:
-        center_y = region.bounding_box.center_y
-
-        # Skip header region
-        if center_y < header_end_y:
-            continue
-
-        # Skip footer region
-        if center_y > footer_start_y:
-            continue
-
-        # Skip very small regions (noise, dots, etc.)
-        if region.bounding_box.area < 0.003:
-            continue
-
-        # Skip very large regions (full document text)
-        if region.bounding_box.area > 0.5:
-            continue
-
+    # Header/footer, size and thinness limits first (thin regions are
+    # horizontal lines and separators); only survivors get text checks
+    for region in _filter_by_geometry(sorted_regions, header_end_y, footer_start_y, min_height=0.008):
         # Skip single characters
-        if len(region.text.strip()) <= 1:
-            continue
-
-        # Skip regions that are too thin (horizontal lines, separators)
-        if region.bounding_box.height < 0.008:
+        if len(region._stripped) <= 1:
             continue
 
         # Check for header patterns
-        is_header = False
-        for pattern in header_patterns:
-            if re.search(pattern, region.text, re.I):
-                is_header = True
-                break
-        if is_header:
+        if _HEADER_RE.search(region.text):
             continue
 
         # Check for footer patterns
-        is_footer = False
-        for pattern in footer_patterns:
-            if re.search(pattern, region.text, re.I):
-                is_footer = True
-                break
-        if is_footer:
+        if _FOOTER_RE.search(region.text):
             continue
 
         # Skip regions with only numbers (unless they contain price pattern)
-        text_stripped = region.text.replace(' ', '').replace('.', '').replace(',', '').replace('$', '')
+        text_stripped = region.text.translate(_NUMBER_PUNCTUATION_TABLE)
         if text_stripped.isdigit() and not region.has_price_pattern():
             continue
 
         # Skip if text is too short (unless has price)
-        if len(region.text.strip()) < 3 and not region.has_price_pattern():
+        if len(region._stripped) < 3 and not region.has_price_pattern():
             continue
 
         filtered.append(region)
@@ -722,6 +776,7 @@ def cache_ocr_response(key: str, response: Any, ttl: int = 900) -> None:
 
     with _cache_lock:
         _cache[key] = (response, expiry_time)
+        heapq.heappush(_expiry_heap, (expiry_time, key))
 
         # Clean up expired entries (garbage collection)
         _cleanup_expired_cache()
@@ -761,16 +816,31 @@ def _cleanup_expired_cache() -> None:
     """
     Remove expired entries from cache.
 
+    Pops only the heap entries that have expired, so the cost is proportional
+    to the number of expirations rather than the size of the cache. When
+    more than half the cache expires together the dict is rebuilt instead.
+
     Should be called while holding _cache_lock.
     """
     current_time = time.time()
-    expired_keys = [
-        key for key, (_, expiry_time) in _cache.items()
-        if current_time > expiry_time
-    ]
-
-    for key in expired_keys:
-        del _cache[key]
+    expired_keys = []
+    while _expiry_heap and _expiry_heap[0][0] < current_time:
+        expiry_time, key = heapq.heappop(_expiry_heap)
+        entry = _cache.get(key)
+        # Skip stale heap entries left behind by overwrites or lookups
+        if entry is not None and entry[1] == expiry_time:
+            expired_keys.append(key)
+
+    if len(expired_keys) * 2 > len(_cache):
+        # Most of the cache expired at once: rebuilding the live entries is
+        # cheaper than deleting one by one. Updated in place because _cache
+        # is shared module state.
+        live = {key: entry for key, entry in _cache.items() if current_time <= entry[1]}
+        _cache.clear()
+        _cache.update(live)
+    else:
+        for key in expired_keys:
+            del _cache[key]
 
 
 def clear_cache() -> None:
@@ -781,6 +851,7 @@ def clear_cache() -> None:
     """
     with _cache_lock:
         _cache.clear()
+        _expiry_heap.clear()
 
 
 def get_cache_stats() -> Dict[str, int]:
@@ -1,10 +1,11 @@
 """Friends router: manage friend relationships."""
 
-from typing import Annotated
+from typing import Annotated, Optional
 from collections import defaultdict
-from fastapi import APIRouter, Depends, HTTPException
+from itertools import chain
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, case, func
 import asyncio
 
 import models
@@ -14,32 +15,61 @@ from dependencies import get_current_user
 from utils.validation import get_user_by_email
 from utils.display import get_guest_display_name
 from utils.email import send_friend_request_email
+from utils.response_cache import friends_cache, friend_expenses_cache
 
 
 router = APIRouter(prefix="/friends", tags=["friends"])
 
+# Expense columns serialized by GET /friends/{friend_id}/expenses
+FRIEND_EXPENSE_COLUMNS = (
+    models.Expense.id,
+    models.Expense.description,
+    models.Expense.amount,
+    models.Expense.currency,
+    models.Expense.date,
+    models.Expense.payer_id,
+    models.Expense.payer_is_guest,
+    models.Expense.group_id,
+    models.Expense.created_by_id,
+    models.Expense.split_type,
+    models.Expense.icon,
+    models.Expense.receipt_image_path,
+    models.Expense.notes,
+)
+
 
 def verify_friendship(db: Session, current_user_id: int, friend_id: int) -> models.User:
     """Verify that a friendship exists between current user and friend_id.
     Returns the friend user object if friendship exists, raises 404 otherwise.
     """
-    friendship = db.query(models.Friendship).filter(
+    # Single round-trip: the user row only comes back if a friendship joins it
+    friend = db.query(models.User).join(
+        models.Friendship,
         or_(
-            and_(models.Friendship.user_id1 == current_user_id, models.Friendship.user_id2 == friend_id),
-            and_(models.Friendship.user_id1 == friend_id, models.Friendship.user_id2 == current_user_id)
+            and_(models.Friendship.user_id1 == current_user_id, models.Friendship.user_id2 == models.User.id),
+            and_(models.Friendship.user_id1 == models.User.id, models.Friendship.user_id2 == current_user_id)
         )
-    ).first()
+    ).filter(models.User.id == friend_id).first()
 
-    if not friendship:
-        raise HTTPException(status_code=404, detail="Friend not found")
-
-    friend = db.query(models.User).filter(models.User.id == friend_id).first()
     if not friend:
         raise HTTPException(status_code=404, detail="Friend not found")
 
     return friend
 
 
+def verified_friend(
+    friend_id: int,
+    current_user: Annotated[models.User, Depends(get_current_user)],
+    db: Session = Depends(get_db)
+) -> models.User:
+    """Dependency form of verify_friendship for /friends/{friend_id} routes.
+
+    FastAPI caches dependency results per request, so the friendship is
+    checked once no matter how many dependencies of a route need it.
+    """
+    return verify_friendship(db, current_user.id, friend_id)
+
+
 def get_friend_expense_context(
     db: Session, 
     current_user_id: int, 
@@ -108,6 +138,75 @@ def get_friend_expense_context(
     return current_user_ids, friend_ids_set, shared_group_ids
 
 
+def split_in_side(ids: set):
+    """SQL condition: the ExpenseSplit row belongs to one of the (user_id, is_guest) ids."""
+    return or_(*(
+        and_(models.ExpenseSplit.user_id == uid, models.ExpenseSplit.is_guest == is_guest)
+        for uid, is_guest in ids
+    ))
+
+
+def paid_by_side(ids: set):
+    """SQL condition: the Expense was paid by one of the (user_id, is_guest) ids."""
+    return or_(*(
+        and_(models.Expense.payer_id == uid, models.Expense.payer_is_guest == is_guest)
+        for uid, is_guest in ids
+    ))
+
+
+def get_shared_expenses_query(db: Session, current_user_ids: set, friend_ids: set):
+    """
+    Build the query for expenses shared between two sides.
+
+    An expense is shared when one side paid it and the other side has a
+    split in it. Both ID sets contain (user_id, is_guest) tuples as returned
+    by get_friend_expense_context(). Callers add their own ordering.
+    """
+    current_in_split = split_in_side(current_user_ids)
+    friend_in_split = split_in_side(friend_ids)
+
+    # One pass over expense_splits flags which sides appear in each expense,
+    # instead of a separate IN (subquery) scan per side
+    split_sides = db.query(
+        models.ExpenseSplit.expense_id,
+        func.max(case((current_in_split, 1), else_=0)).label("has_current"),
+        func.max(case((friend_in_split, 1), else_=0)).label("has_friend")
+    ).filter(
+        or_(current_in_split, friend_in_split)
+    ).group_by(models.ExpenseSplit.expense_id).cte("split_sides")
+
+    return db.query(models.Expense).join(
+        split_sides, split_sides.c.expense_id == models.Expense.id
+    ).filter(
+        or_(
+            # Current side paid AND friend side is in splits
+            and_(paid_by_side(current_user_ids), split_sides.c.has_friend == 1),
+            # Friend side paid AND current side is in splits
+            and_(paid_by_side(friend_ids), split_sides.c.has_current == 1)
+        )
+    )
+
+
+def get_splits_by_expense(db: Session, expense_ids: list) -> dict:
+    """Batch fetch the splits of the given expenses, keyed by expense_id."""
+    splits_by_expense = defaultdict(list)
+    if expense_ids:
+        all_splits = db.query(models.ExpenseSplit).filter(
+            models.ExpenseSplit.expense_id.in_(expense_ids)
+        ).all()
+        for split in all_splits:
+            splits_by_expense[split.expense_id].append(split)
+    return splits_by_expense
+
+
+def parse_expense_cursor(cursor: str) -> tuple[str, int]:
+    """Split a "<date>|<id>" expense cursor, raising 400 if malformed."""
+    expense_date, sep, expense_id = cursor.rpartition("|")
+    if not sep or not expense_date or not expense_id.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return expense_date, int(expense_id)
+
+
 @router.post("/request", response_model=schemas.FriendRequestResponse)
 async def send_friend_request(
     request: schemas.FriendRequestCreate,
@@ -444,171 +543,175 @@ def read_friends(
     current_user: Annotated[models.User, Depends(get_current_user)],
     db: Session = Depends(get_db)
 ):
+    cache_key = ("friends", current_user.id)
+    cached = friends_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = friends_cache.generation
+
     # Find all friendships involving current_user
     friendships = db.query(models.Friendship).filter(
         (models.Friendship.user_id1 == current_user.id) | (models.Friendship.user_id2 == current_user.id)
     ).all()
 
+    friend_ids = [f.user_id2 if f.user_id1 == current_user.id else f.user_id1 for f in friendships]
     friends = []
-    for f in friendships:
-        friend_id = f.user_id2 if f.user_id1 == current_user.id else f.user_id1
-        friend = db.query(models.User).filter(models.User.id == friend_id).first()
-        if friend:
-            friends.append(friend)
+    if friend_ids:
+        # Batch fetch friend users, keeping friendship order
+        users = db.query(models.User).filter(models.User.id.in_(friend_ids)).all()
+        users_map = {u.id: u for u in users}
+        friends = [
+            schemas.Friend.model_validate(users_map[fid])
+            for fid in friend_ids if fid in users_map
+        ]
 
+    friends_cache.set(cache_key, friends, generation)
     return friends
 
 
 @router.get("/{friend_id}", response_model=schemas.Friend)
 def get_friend(
-    friend_id: int,
-    current_user: Annotated[models.User, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    friend: Annotated[models.User, Depends(verified_friend)]
 ):
     """Get details of a specific friend."""
-    friend = verify_friendship(db, current_user.id, friend_id)
     return friend
 
 
 @router.get("/{friend_id}/expenses", response_model=list[schemas.FriendExpenseWithSplits])
 def get_friend_expenses(
     friend_id: int,
+    response: Response,
+    friend: Annotated[models.User, Depends(verified_friend)],
     current_user: Annotated[models.User, Depends(get_current_user)],
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None
 ):
     """Get all expenses shared between current user and a friend.
     Includes both group expenses and direct (non-group) expenses.
     Also includes expenses where managed members/guests are involved.
+
+    Pass `limit` to page through the history newest first: when more
+    expenses remain, the X-Next-Cursor response header holds the `cursor`
+    value for the next page. Without `limit` every expense is returned.
     """
-    friend = verify_friendship(db, current_user.id, friend_id)
+    before = parse_expense_cursor(cursor) if cursor else None
+
+    cache_key = ("expenses", current_user.id, friend_id, limit, cursor)
+    cached = friend_expenses_cache.get(cache_key)
+    if cached is not None:
+        result, next_cursor = cached
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return result
+    generation = friend_expenses_cache.generation
     
     # Use helper to get ID sets with managed members consolidated
     current_user_ids, friend_ids_set, _ = get_friend_expense_context(
         db, current_user.id, friend_id
     )
 
-    # Build subqueries for expenses involving each side
-    current_side_conditions = []
-    for uid, is_guest in current_user_ids:
-        current_side_conditions.append(
-            and_(models.ExpenseSplit.user_id == uid, models.ExpenseSplit.is_guest == is_guest)
-        )
-    
-    current_side_split_expenses = db.query(models.ExpenseSplit.expense_id).filter(
-        or_(*current_side_conditions)
-    ).subquery()
+    # Plain row tuples of just the columns the response needs, with the
+    # group name joined in: no ORM identity-map bookkeeping per expense, and
+    # nothing that could lazy-load - everything below reads from the
+    # batch-fetched maps
+    query = get_shared_expenses_query(db, current_user_ids, friend_ids_set).outerjoin(
+        models.Group, models.Group.id == models.Expense.group_id
+    ).with_entities(
+        *FRIEND_EXPENSE_COLUMNS, models.Group.name.label("group_name")
+    ).order_by(
+        models.Expense.date.desc(), models.Expense.id.desc()
+    )
 
-    friend_side_conditions = []
-    for uid, is_guest in friend_ids_set:
-        friend_side_conditions.append(
-            and_(models.ExpenseSplit.user_id == uid, models.ExpenseSplit.is_guest == is_guest)
-        )
-    
-    friend_side_split_expenses = db.query(models.ExpenseSplit.expense_id).filter(
-        or_(*friend_side_conditions)
-    ).subquery()
+    # Keyset pagination on (date, id), matching the sort order
+    if before:
+        before_date, before_id = before
+        query = query.filter(or_(
+            models.Expense.date < before_date,
+            and_(models.Expense.date == before_date, models.Expense.id < before_id)
+        ))
 
-    # Build payer conditions for each side
-    current_side_payer_conditions = []
-    for uid, is_guest in current_user_ids:
-        current_side_payer_conditions.append(
-            and_(models.Expense.payer_id == uid, models.Expense.payer_is_guest == is_guest)
-        )
-    
-    friend_side_payer_conditions = []
-    for uid, is_guest in friend_ids_set:
-        friend_side_payer_conditions.append(
-            and_(models.Expense.payer_id == uid, models.Expense.payer_is_guest == is_guest)
-        )
-
-    # Find expenses where one side paid AND the other side is in splits
-    expenses = db.query(models.Expense).filter(
-        or_(
-            # Current side paid AND friend side is in splits
-            and_(
-                or_(*current_side_payer_conditions),
-                models.Expense.id.in_(friend_side_split_expenses)
-            ),
-            # Friend side paid AND current side is in splits
-            and_(
-                or_(*friend_side_payer_conditions),
-                models.Expense.id.in_(current_side_split_expenses)
-            )
-        )
-    ).order_by(models.Expense.date.desc(), models.Expense.id.desc()).all()
+    next_cursor = None
+    if limit:
+        # One extra row tells us whether another page exists
+        expenses = query.limit(limit + 1).all()
+        if len(expenses) > limit:
+            expenses = expenses[:limit]
+            last = expenses[-1]
+            next_cursor = f"{last.date}|{last.id}"
+            response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        expenses = query.all()
 
     if not expenses:
+        friend_expenses_cache.set(cache_key, ([], None), generation)
         return []
 
-    expense_ids = [e.id for e in expenses]
-
     # Batch fetch all splits
-    all_splits = db.query(models.ExpenseSplit).filter(
-        models.ExpenseSplit.expense_id.in_(expense_ids)
-    ).all()
+    splits_by_expense = get_splits_by_expense(db, [e.id for e in expenses])
 
-    splits_by_expense = defaultdict(list)
     user_ids = set()
     guest_ids = set()
 
-    for split in all_splits:
-        splits_by_expense[split.expense_id].append(split)
+    for split in chain.from_iterable(splits_by_expense.values()):
         if split.is_guest:
             guest_ids.add(split.user_id)
         else:
             user_ids.add(split.user_id)
 
-    # Batch fetch groups
-    group_ids = {e.group_id for e in expenses if e.group_id}
-    groups_map = {}
-    if group_ids:
-        groups = db.query(models.Group).filter(models.Group.id.in_(group_ids)).all()
-        groups_map = {g.id: g for g in groups}
-
     # Batch fetch items for ITEMIZED expenses
     itemized_expense_ids = [e.id for e in expenses if e.split_type == "ITEMIZED"]
     items_by_expense = defaultdict(list)
 
     if itemized_expense_ids:
-        items = db.query(models.ExpenseItem).filter(
+        # Items and their assignments in one round-trip; items without
+        # assignments come back once with a NULL assignment
+        item_rows = db.query(models.ExpenseItem, models.ExpenseItemAssignment).outerjoin(
+            models.ExpenseItemAssignment,
+            models.ExpenseItemAssignment.expense_item_id == models.ExpenseItem.id
+        ).filter(
             models.ExpenseItem.expense_id.in_(itemized_expense_ids)
-        ).all()
+        ).order_by(models.ExpenseItem.id, models.ExpenseItemAssignment.id).all()
 
-        if items:
-            item_ids = [i.id for i in items]
-            assignments = db.query(models.ExpenseItemAssignment).filter(
-                models.ExpenseItemAssignment.expense_item_id.in_(item_ids)
-            ).all()
-
-            assignments_by_item = defaultdict(list)
-            for a in assignments:
-                assignments_by_item[a.expense_item_id].append(a)
-                if a.is_guest:
-                    guest_ids.add(a.user_id)
-                else:
-                    user_ids.add(a.user_id)
-
-            for item in items:
+        assignments_by_item = {}
+        for item, a in item_rows:
+            if item.id not in assignments_by_item:
                 # Attach assignments to item for easier access later
-                item._assignments = assignments_by_item[item.id]
+                item._assignments = assignments_by_item[item.id] = []
                 items_by_expense[item.expense_id].append(item)
+            if a is None:
+                continue
+            assignments_by_item[item.id].append(a)
+            if a.is_guest:
+                guest_ids.add(a.user_id)
+            else:
+                user_ids.add(a.user_id)
 
     # Batch fetch guests
-    guests_map = {}
+    guests = []
     if guest_ids:
         guests = db.query(models.GuestMember).filter(models.GuestMember.id.in_(guest_ids)).all()
-        guests_map = {g.id: g for g in guests}
 
         # Collect claimed users
         claimed_user_ids = {g.claimed_by_id for g in guests if g.claimed_by_id}
         user_ids.update(claimed_user_ids)
 
     # Batch fetch users
-    users_map = {}
+    user_names = {}
     if user_ids:
         users = db.query(models.User).filter(models.User.id.in_(user_ids)).all()
-        users_map = {u.id: u for u in users}
-
+        user_names = {u.id: u.full_name or u.email for u in users}
+
+    # Resolve every referenced participant's display name once; a claimed
+    # guest shows as the user who claimed it
+    guest_names = {
+        g.id: user_names[g.claimed_by_id] if g.claimed_by_id in user_names else g.name
+        for g in guests
+    }
+
+    # Every field below comes straight from typed DB columns or values built
+    # here, so the response objects are assembled with model_construct() and
+    # skip per-object validation
     result = []
     for expense in expenses:
         # Get splits with user names
@@ -617,20 +720,11 @@ def get_friend_expenses(
         splits_with_names = []
         for split in splits:
             if split.is_guest:
-                guest = guests_map.get(split.user_id)
-                if guest:
-                    if guest.claimed_by_id and guest.claimed_by_id in users_map:
-                        u = users_map[guest.claimed_by_id]
-                        user_name = u.full_name or u.email
-                    else:
-                        user_name = guest.name
-                else:
-                    user_name = "Unknown Guest"
+                user_name = guest_names.get(split.user_id, "Unknown Guest")
             else:
-                user = users_map.get(split.user_id)
-                user_name = (user.full_name or user.email) if user else "Unknown User"
+                user_name = user_names.get(split.user_id, "Unknown User")
 
-            splits_with_names.append(schemas.ExpenseSplitDetail(
+            splits_with_names.append(schemas.ExpenseSplitDetail.model_construct(
                 id=split.id,
                 expense_id=split.expense_id,
                 user_id=split.user_id,
@@ -641,12 +735,6 @@ def get_friend_expenses(
                 user_name=user_name
             ))
 
-        # Get group name if expense is in a group
-        group_name = None
-        if expense.group_id:
-            group = groups_map.get(expense.group_id)
-            group_name = group.name if group else None
-
         # Load items for ITEMIZED expenses
         items_data = []
         split_type = expense.split_type or "EQUAL"
@@ -659,26 +747,17 @@ def get_friend_expenses(
                 assignment_details = []
                 for a in assignments:
                     if a.is_guest:
-                        guest = guests_map.get(a.user_id)
-                        if guest:
-                            if guest.claimed_by_id and guest.claimed_by_id in users_map:
-                                u = users_map[guest.claimed_by_id]
-                                name = u.full_name or u.email
-                            else:
-                                name = guest.name
-                        else:
-                            name = "Unknown Guest"
+                        name = guest_names.get(a.user_id, "Unknown Guest")
                     else:
-                        user = users_map.get(a.user_id)
-                        name = (user.full_name or user.email) if user else "Unknown"
+                        name = user_names.get(a.user_id, "Unknown")
 
-                    assignment_details.append(schemas.ExpenseItemAssignmentDetail(
+                    assignment_details.append(schemas.ExpenseItemAssignmentDetail.model_construct(
                         user_id=a.user_id,
                         is_guest=a.is_guest,
                         user_name=name
                     ))
 
-                items_data.append(schemas.ExpenseItemDetail(
+                items_data.append(schemas.ExpenseItemDetail.model_construct(
                     id=item.id,
                     expense_id=item.expense_id,
                     description=item.description,
@@ -710,7 +789,7 @@ def get_friend_expenses(
         else:
             balance_impact = 0
 
-        result.append(schemas.FriendExpenseWithSplits(
+        result.append(schemas.FriendExpenseWithSplits.model_construct(
             id=expense.id,
             description=expense.description,
             amount=expense.amount,
@@ -726,10 +805,11 @@ def get_friend_expenses(
             icon=expense.icon,
             receipt_image_path=expense.receipt_image_path,
             notes=expense.notes,
-            group_name=group_name,
+            group_name=expense.group_name,
             balance_impact=balance_impact
         ))
 
+    friend_expenses_cache.set(cache_key, (result, next_cursor), generation)
     return result
 
 
@@ -745,6 +825,14 @@ def get_friend_balance(
     
     Includes balances from managed members/guests in shared groups.
     """
+    cache_key = ("balance", current_user.id, friend_id)
+    cached = friends_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = friends_cache.generation
+
+    # Checked inline rather than via verified_friend so a cached balance is
+    # served without any query
     friend = verify_friendship(db, current_user.id, friend_id)
     
     # Use helper to get ID sets with managed members consolidated
@@ -752,108 +840,38 @@ def get_friend_balance(
         db, current_user.id, friend_id
     )
 
-    # Build subqueries for expenses involving each side
-    # Current user side: expenses where any of current_user_ids is in splits
-    current_side_conditions = []
-    for uid, is_guest in current_user_ids:
-        current_side_conditions.append(
-            and_(models.ExpenseSplit.user_id == uid, models.ExpenseSplit.is_guest == is_guest)
-        )
-    
-    current_side_split_expenses = db.query(models.ExpenseSplit.expense_id).filter(
-        or_(*current_side_conditions)
-    ).subquery()
-
-    # Friend side: expenses where any of friend_ids is in splits
-    friend_side_conditions = []
-    for uid, is_guest in friend_ids:
-        friend_side_conditions.append(
-            and_(models.ExpenseSplit.user_id == uid, models.ExpenseSplit.is_guest == is_guest)
-        )
-    
-    friend_side_split_expenses = db.query(models.ExpenseSplit.expense_id).filter(
-        or_(*friend_side_conditions)
-    ).subquery()
-
-    # Build payer conditions for each side
-    current_side_payer_conditions = []
-    for uid, is_guest in current_user_ids:
-        current_side_payer_conditions.append(
-            and_(models.Expense.payer_id == uid, models.Expense.payer_is_guest == is_guest)
-        )
-    
-    friend_side_payer_conditions = []
-    for uid, is_guest in friend_ids:
-        friend_side_payer_conditions.append(
-            and_(models.Expense.payer_id == uid, models.Expense.payer_is_guest == is_guest)
-        )
-
-    # Find expenses where one side paid AND the other side is in splits
-    expenses = db.query(models.Expense).filter(
-        or_(
-            # Current side paid AND friend side is in splits
-            and_(
-                or_(*current_side_payer_conditions),
-                models.Expense.id.in_(friend_side_split_expenses)
-            ),
-            # Friend side paid AND current side is in splits
-            and_(
-                or_(*friend_side_payer_conditions),
-                models.Expense.id.in_(current_side_split_expenses)
-            )
-        )
-    ).all()
-
-    if not expenses:
-        return []
-
-    # Batch fetch splits
-    expense_ids = [e.id for e in expenses]
-    splits_by_expense = defaultdict(list)
-    if expense_ids:
-        all_splits = db.query(models.ExpenseSplit).filter(
-            models.ExpenseSplit.expense_id.in_(expense_ids)
-        ).all()
-        for s in all_splits:
-            splits_by_expense[s.expense_id].append(s)
-
-    # Calculate balance per currency
+    # Aggregate per currency in SQL: each split of a shared expense counts
+    # toward the payer side when it belongs to the other side.
     # Positive = friend side owes current user side, Negative = current user side owes friend side
-    balances: dict[str, float] = defaultdict(float)
-
-    for expense in expenses:
-        currency = expense.currency
-        splits = splits_by_expense[expense.id]
-
-        # Sum what friend side owes in this expense
-        friend_side_owed = sum(
-            s.amount_owed for s in splits 
-            if (s.user_id, s.is_guest) in friend_ids
-        )
-        
-        # Sum what current user side owes in this expense
-        current_side_owed = sum(
-            s.amount_owed for s in splits 
-            if (s.user_id, s.is_guest) in current_user_ids
+    signed_owed = case(
+        (paid_by_side(current_user_ids),
+         case((split_in_side(friend_ids), models.ExpenseSplit.amount_owed), else_=0)),
+        (paid_by_side(friend_ids),
+         case((split_in_side(current_user_ids), -models.ExpenseSplit.amount_owed), else_=0)),
+        else_=0
+    )
+    # Currency codes are grouped case-insensitively so "usd" and "USD"
+    # expenses land in one balance; sums stay in integer cents
+    currency = func.upper(models.Expense.currency)
+    # Only splits belonging to either side are joined, so other members'
+    # and unrelated guests' splits are dropped before the CASE runs
+    rows = get_shared_expenses_query(db, current_user_ids, friend_ids).join(
+        models.ExpenseSplit,
+        and_(
+            models.ExpenseSplit.expense_id == models.Expense.id,
+            or_(split_in_side(current_user_ids), split_in_side(friend_ids))
         )
+    ).with_entities(
+        currency, func.sum(signed_owed)
+    ).group_by(currency).order_by(currency).all()
 
-        payer_key = (expense.payer_id, expense.payer_is_guest)
-        
-        if payer_key in current_user_ids:
-            # Current user side paid - friend side owes their split amount
-            balances[currency] += friend_side_owed / 100.0
-        elif payer_key in friend_ids:
-            # Friend side paid - current user side owes their split amount
-            balances[currency] -= current_side_owed / 100.0
-
-    # Convert to list of FriendBalance objects, excluding zero balances
+    # Convert to list of FriendBalance objects, excluding zero balances;
+    # cents are divided once per currency and rows are already sorted
     result = [
-        schemas.FriendBalance(amount=amount, currency=currency)
-        for currency, amount in balances.items()
-        if abs(amount) > 0.01  # Filter out near-zero balances
+        schemas.FriendBalance(amount=net_cents / 100.0, currency=code)
+        for code, net_cents in rows
+        if abs(net_cents) > 1  # Filter out near-zero balances
     ]
 
-    # Sort by currency for consistent ordering
-    result.sort(key=lambda x: x.currency)
-
+    friends_cache.set(cache_key, result, generation)
     return result
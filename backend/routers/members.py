@@ -1,18 +1,26 @@
 """Members router: manage group members and guests."""
 
+import json
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, lambda_stmt, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, load_only
 
 import models
 import schemas
 from database import get_db
 from dependencies import get_current_user
-from utils.validation import get_group_or_404, verify_group_membership, get_user_by_email
+from utils.splits import calculate_itemized_splits
+from utils.validation import get_group_or_404, get_group_for_member, get_user_by_email
 
 
 router = APIRouter(prefix="/groups/{group_id}", tags=["members"])
 
+# The member / guest lookups every endpoint repeats are lambda_stmt()s: the
+# statement is built and compiled once per call site, and later calls only
+# bind the new ids (group_id, guest_id, user_id) from the lambda's closure.
+
 
 @router.post("/members", response_model=schemas.GroupMember)
 def add_group_member(
@@ -21,30 +29,27 @@ def add_group_member(
     current_user: Annotated[models.User, Depends(get_current_user)], 
     db: Session = Depends(get_db)
 ):
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
     # Find user by email
     user = get_user_by_email(db, member_add.email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Check if already a member
-    existing = db.query(models.GroupMember).filter(
-        models.GroupMember.group_id == group_id,
-        models.GroupMember.user_id == user.id
-    ).first()
-    if existing:
+    # Add member; idx_group_members_group_user turns a duplicate into a no-op,
+    # so no RETURNING row means the user was already a member
+    new_member_id = db.execute(
+        sqlite_insert(models.GroupMember)
+        .values(group_id=group_id, user_id=user.id)
+        .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+        .returning(models.GroupMember.id)
+    ).scalar_one_or_none()
+    if new_member_id is None:
         raise HTTPException(status_code=400, detail="User is already a member of this group")
-
-    # Add member
-    new_member = models.GroupMember(group_id=group_id, user_id=user.id)
-    db.add(new_member)
     db.commit()
-    db.refresh(new_member)
 
     return schemas.GroupMember(
-        id=new_member.id,
+        id=new_member_id,
         user_id=user.id,
         full_name=user.full_name or user.email,
         email=user.email
@@ -58,8 +63,7 @@ def remove_group_member(
     current_user: Annotated[models.User, Depends(get_current_user)], 
     db: Session = Depends(get_db)
 ):
-    group = get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    group = get_group_for_member(db, group_id, current_user.id)
 
     # Owner can remove anyone except themselves
     # Non-owners can only remove themselves
@@ -69,28 +73,19 @@ def remove_group_member(
     if user_id == group.created_by_id:
         raise HTTPException(status_code=400, detail="Group owner cannot be removed. Delete the group instead.")
 
-    member = db.query(models.GroupMember).filter(
+    # Only the primary key is needed to delete the row
+    member = db.scalars(lambda_stmt(lambda: select(models.GroupMember).options(
+        load_only(models.GroupMember.id)
+    ).where(
         models.GroupMember.group_id == group_id,
         models.GroupMember.user_id == user_id
-    ).first()
+    ))).first()
 
     if not member:
         raise HTTPException(status_code=404, detail="Member not found in this group")
 
-    # Auto-unlink any guests managed by this user
-    db.query(models.GuestMember).filter(
-        models.GuestMember.group_id == group_id,
-        models.GuestMember.managed_by_id == user_id,
-        models.GuestMember.managed_by_type == 'user'
-    ).update({"managed_by_id": None, "managed_by_type": None})
-
-    # Auto-unlink any members managed by this user
-    db.query(models.GroupMember).filter(
-        models.GroupMember.group_id == group_id,
-        models.GroupMember.managed_by_id == user_id,
-        models.GroupMember.managed_by_type == 'user'
-    ).update({"managed_by_id": None, "managed_by_type": None})
-
+    # trg_group_members_unlink_managed unlinks any guests and members
+    # managed by this user as part of the DELETE
     db.delete(member)
     db.commit()
 
@@ -104,18 +99,26 @@ def add_guest(
     current_user: Annotated[models.User, Depends(get_current_user)],
     db: Session = Depends(get_db)
 ):
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
+
+    # Every column is known up front except the id, which RETURNING supplies,
+    # so the response is built without re-reading the row after commit
+    created_by_id = current_user.id
+    guest_id = db.execute(
+        insert(models.GuestMember).values(
+            group_id=group_id,
+            name=guest.name,
+            created_by_id=created_by_id
+        ).returning(models.GuestMember.id)
+    ).scalar_one()
+    db.commit()
 
-    db_guest = models.GuestMember(
+    return schemas.GuestMember(
+        id=guest_id,
         group_id=group_id,
         name=guest.name,
-        created_by_id=current_user.id
+        created_by_id=created_by_id
     )
-    db.add(db_guest)
-    db.commit()
-    db.refresh(db_guest)
-    return db_guest
 
 
 @router.get("/unknown-guest", response_model=schemas.GuestMember)
@@ -129,29 +132,37 @@ def get_or_create_unknown_guest(
     This allows items to be assigned to an 'Unknown' participant that can
     be claimed later by any group member.
     """
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
     # Check if unknown guest already exists for this group
-    unknown_guest = db.query(models.GuestMember).filter(
+    unknown_guest = db.scalars(lambda_stmt(lambda: select(models.GuestMember).where(
         models.GuestMember.group_id == group_id,
         models.GuestMember.is_unknown_placeholder == True
-    ).first()
+    ))).first()
 
     if unknown_guest:
         return unknown_guest
 
-    # Create new unknown guest
-    unknown_guest = models.GuestMember(
+    # Create new unknown guest, building the response from the known values
+    # and the RETURNING id instead of refreshing the row
+    created_by_id = current_user.id
+    unknown_guest_id = db.execute(
+        insert(models.GuestMember).values(
+            group_id=group_id,
+            name="Unassigned",
+            created_by_id=created_by_id,
+            is_unknown_placeholder=True
+        ).returning(models.GuestMember.id)
+    ).scalar_one()
+    db.commit()
+
+    return schemas.GuestMember(
+        id=unknown_guest_id,
         group_id=group_id,
         name="Unassigned",
-        created_by_id=current_user.id,
+        created_by_id=created_by_id,
         is_unknown_placeholder=True
     )
-    db.add(unknown_guest)
-    db.commit()
-    db.refresh(unknown_guest)
-    return unknown_guest
 
 
 @router.delete("/guests/{guest_id}")
@@ -161,30 +172,21 @@ def remove_guest(
     current_user: Annotated[models.User, Depends(get_current_user)], 
     db: Session = Depends(get_db)
 ):
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
-    guest = db.query(models.GuestMember).filter(
+    # Only the primary key is needed to delete the row
+    guest = db.scalars(lambda_stmt(lambda: select(models.GuestMember).options(
+        load_only(models.GuestMember.id)
+    ).where(
         models.GuestMember.id == guest_id,
         models.GuestMember.group_id == group_id
-    ).first()
+    ))).first()
 
     if not guest:
         raise HTTPException(status_code=404, detail="Guest not found in this group")
 
-    # Delete all expense splits involving this guest
-    db.query(models.ExpenseSplit).filter(
-        models.ExpenseSplit.user_id == guest_id,
-        models.ExpenseSplit.is_guest == True
-    ).delete()
-
-    # Delete all expenses where this guest was the payer
-    db.query(models.Expense).filter(
-        models.Expense.payer_id == guest_id,
-        models.Expense.payer_is_guest == True
-    ).delete()
-
-    # Now delete the guest
+    # trg_guest_members_cascade_expenses deletes the guest's splits and the
+    # expenses it paid for as part of the DELETE
     db.delete(guest)
     db.commit()
 
@@ -200,10 +202,18 @@ def claim_guest(
 ):
     get_group_or_404(db, group_id)
 
-    guest = db.query(models.GuestMember).filter(
+    # Load only the columns the claim reads or changes
+    guest = db.scalars(lambda_stmt(lambda: select(models.GuestMember).options(
+        load_only(
+            models.GuestMember.is_unknown_placeholder,
+            models.GuestMember.claimed_by_id,
+            models.GuestMember.managed_by_id,
+            models.GuestMember.managed_by_type
+        )
+    ).where(
         models.GuestMember.id == guest_id,
         models.GuestMember.group_id == group_id
-    ).first()
+    ))).first()
 
     if not guest:
         raise HTTPException(status_code=404, detail="Guest not found")
@@ -214,67 +224,74 @@ def claim_guest(
     if guest.claimed_by_id:
         raise HTTPException(status_code=400, detail="Guest already claimed")
 
+    # Transfer everything that referenced the guest with Core UPDATEs. None of
+    # the matched rows are loaded in this session, so the ORM's
+    # synchronize_session pass over the identity map is skipped.
+    no_sync = {"synchronize_session": False}
+
     # Transfer expenses where guest was payer
-    expenses_updated = db.query(models.Expense).filter(
-        models.Expense.payer_id == guest_id,
-        models.Expense.payer_is_guest == True
-    ).update({
-        "payer_id": current_user.id,
-        "payer_is_guest": False
-    })
+    expenses_updated = db.execute(
+        update(models.Expense).where(
+            models.Expense.payer_id == guest_id,
+            models.Expense.payer_is_guest == True
+        ).values(payer_id=current_user.id, payer_is_guest=False),
+        execution_options=no_sync
+    ).rowcount
 
     # Transfer splits where guest was involved
-    splits_updated = db.query(models.ExpenseSplit).filter(
-        models.ExpenseSplit.user_id == guest_id,
-        models.ExpenseSplit.is_guest == True
-    ).update({
-        "user_id": current_user.id,
-        "is_guest": False
-    })
+    splits_updated = db.execute(
+        update(models.ExpenseSplit).where(
+            models.ExpenseSplit.user_id == guest_id,
+            models.ExpenseSplit.is_guest == True
+        ).values(user_id=current_user.id, is_guest=False),
+        execution_options=no_sync
+    ).rowcount
 
     # Transfer item assignments where guest was assigned
-    db.query(models.ExpenseItemAssignment).filter(
-        models.ExpenseItemAssignment.user_id == guest_id,
-        models.ExpenseItemAssignment.is_guest == True
-    ).update({
-        "user_id": current_user.id,
-        "is_guest": False
-    })
+    db.execute(
+        update(models.ExpenseItemAssignment).where(
+            models.ExpenseItemAssignment.user_id == guest_id,
+            models.ExpenseItemAssignment.is_guest == True
+        ).values(user_id=current_user.id, is_guest=False),
+        execution_options=no_sync
+    )
 
     # Update any guests that were managed by this guest to be managed by the new user
-    managed_guests_updated = db.query(models.GuestMember).filter(
-        models.GuestMember.managed_by_id == guest_id,
-        models.GuestMember.managed_by_type == 'guest'
-    ).update({
-        "managed_by_id": current_user.id,
-        "managed_by_type": 'user'
-    })
+    managed_guests_updated = db.execute(
+        update(models.GuestMember).where(
+            models.GuestMember.managed_by_id == guest_id,
+            models.GuestMember.managed_by_type == 'guest'
+        ).values(managed_by_id=current_user.id, managed_by_type='user'),
+        execution_options=no_sync
+    ).rowcount
 
     # Update any members that were managed by this guest to be managed by the new user
-    managed_members_updated = db.query(models.GroupMember).filter(
-        models.GroupMember.managed_by_id == guest_id,
-        models.GroupMember.managed_by_type == 'guest'
-    ).update({
-        "managed_by_id": current_user.id,
-        "managed_by_type": 'user'
-    })
+    managed_members_updated = db.execute(
+        update(models.GroupMember).where(
+            models.GroupMember.managed_by_id == guest_id,
+            models.GroupMember.managed_by_type == 'guest'
+        ).values(managed_by_id=current_user.id, managed_by_type='user'),
+        execution_options=no_sync
+    ).rowcount
 
     # Mark guest as claimed
     guest.claimed_by_id = current_user.id
 
     # Add user to group if not already member
-    existing_member = db.query(models.GroupMember).filter(
-        models.GroupMember.group_id == group_id,
-        models.GroupMember.user_id == current_user.id
-    ).first()
+    is_member = db.query(
+        db.query(models.GroupMember).filter(
+            models.GroupMember.group_id == group_id,
+            models.GroupMember.user_id == current_user.id
+        ).exists()
+    ).scalar()
 
-    if not existing_member:
+    if not is_member:
         new_member = models.GroupMember(group_id=group_id, user_id=current_user.id)
 
         # If this guest was being managed by another guest, check if that manager has been claimed
         # If so, update the new member to be managed by the manager's new user ID
         if guest.managed_by_id and guest.managed_by_type == 'guest':
-            manager_guest = db.query(models.GuestMember).filter(
+            manager_guest = db.query(models.GuestMember.claimed_by_id).filter(
                 models.GuestMember.id == guest.managed_by_id
             ).first()
             if manager_guest and manager_guest.claimed_by_id:
@@ -317,14 +334,13 @@ def manage_guest(
     db: Session = Depends(get_db)
 ):
     """Link a guest to a manager (user or guest) for aggregated balance tracking"""
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
     # Get the guest
-    guest = db.query(models.GuestMember).filter(
+    guest = db.scalars(lambda_stmt(lambda: select(models.GuestMember).where(
         models.GuestMember.id == guest_id,
         models.GuestMember.group_id == group_id
-    ).first()
+    ))).first()
 
     if not guest:
         raise HTTPException(status_code=404, detail="Guest not found")
@@ -340,7 +356,7 @@ def manage_guest(
     # Verify manager exists and is in the group
     if request.is_guest:
         # Manager is a guest - verify it exists and is in this group
-        manager_guest = db.query(models.GuestMember).filter(
+        manager_guest = db.query(models.GuestMember.name).filter(
             models.GuestMember.id == request.user_id,
             models.GuestMember.group_id == group_id,
             models.GuestMember.claimed_by_id == None  # Cannot use claimed guests as managers
@@ -349,15 +365,19 @@ def manage_guest(
             raise HTTPException(status_code=400, detail="Manager guest not found or already claimed")
         managed_by_name = manager_guest.name
     else:
-        # Manager is a user - verify they are a group member
-        manager_membership = db.query(models.GroupMember).filter(
+        # Manager is a user - verify they are a group member, fetching their
+        # name in the same query
+        manager = db.query(
+            models.GroupMember.id, models.User.full_name, models.User.email
+        ).outerjoin(
+            models.User, models.User.id == models.GroupMember.user_id
+        ).filter(
             models.GroupMember.group_id == group_id,
             models.GroupMember.user_id == request.user_id
         ).first()
-        if not manager_membership:
+        if not manager:
             raise HTTPException(status_code=400, detail="Manager must be a group member")
-        manager = db.query(models.User).filter(models.User.id == request.user_id).first()
-        managed_by_name = manager.full_name or manager.email if manager else None
+        managed_by_name = manager.full_name or manager.email
 
     # Update guest's manager
     guest.managed_by_id = request.user_id
@@ -388,13 +408,14 @@ def unmanage_guest(
     db: Session = Depends(get_db)
 ):
     """Remove guest's manager link"""
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
-    guest = db.query(models.GuestMember).filter(
+    guest = db.scalars(lambda_stmt(lambda: select(models.GuestMember).options(
+        load_only(models.GuestMember.managed_by_id, models.GuestMember.managed_by_type)
+    ).where(
         models.GuestMember.id == guest_id,
         models.GuestMember.group_id == group_id
-    ).first()
+    ))).first()
 
     if not guest:
         raise HTTPException(status_code=404, detail="Guest not found")
@@ -416,14 +437,13 @@ def manage_member(
     db: Session = Depends(get_db)
 ):
     """Link a registered member to a manager (user or guest) for aggregated balance tracking"""
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
     # Get the member
-    member = db.query(models.GroupMember).filter(
+    member = db.scalars(lambda_stmt(lambda: select(models.GroupMember).where(
         models.GroupMember.group_id == group_id,
         models.GroupMember.user_id == member_user_id
-    ).first()
+    ))).first()
 
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
@@ -435,7 +455,7 @@ def manage_member(
     # Verify manager exists and is in the group
     if request.is_guest:
         # Manager is a guest - verify it exists and is in this group
-        manager_guest = db.query(models.GuestMember).filter(
+        manager_guest = db.query(models.GuestMember.name).filter(
             models.GuestMember.id == request.user_id,
             models.GuestMember.group_id == group_id,
             models.GuestMember.claimed_by_id == None  # Cannot use claimed guests as managers
@@ -444,15 +464,19 @@ def manage_member(
             raise HTTPException(status_code=400, detail="Manager guest not found or already claimed")
         managed_by_name = manager_guest.name
     else:
-        # Manager is a user - verify they are a group member
-        manager_membership = db.query(models.GroupMember).filter(
+        # Manager is a user - verify they are a group member, fetching their
+        # name in the same query
+        manager = db.query(
+            models.GroupMember.id, models.User.full_name, models.User.email
+        ).outerjoin(
+            models.User, models.User.id == models.GroupMember.user_id
+        ).filter(
             models.GroupMember.group_id == group_id,
             models.GroupMember.user_id == request.user_id
         ).first()
-        if not manager_membership:
+        if not manager:
             raise HTTPException(status_code=400, detail="Manager must be a group member")
-        manager = db.query(models.User).filter(models.User.id == request.user_id).first()
-        managed_by_name = manager.full_name or manager.email if manager else None
+        managed_by_name = manager.full_name or manager.email
 
     # Update member's manager
     member.managed_by_id = request.user_id
@@ -485,13 +509,14 @@ def unmanage_member(
     db: Session = Depends(get_db)
 ):
     """Remove member's manager link"""
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
-    member = db.query(models.GroupMember).filter(
+    member = db.scalars(lambda_stmt(lambda: select(models.GroupMember).options(
+        load_only(models.GroupMember.managed_by_id, models.GroupMember.managed_by_type)
+    ).where(
         models.GroupMember.group_id == group_id,
         models.GroupMember.user_id == member_user_id
-    ).first()
+    ))).first()
 
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
@@ -516,11 +541,10 @@ def claim_unknown_items(
     Allows users to claim items that were assigned to 'Unknown' when the expense
     was created. The assignments are transferred to the claiming user.
     """
-    get_group_or_404(db, group_id)
-    verify_group_membership(db, group_id, current_user.id)
+    get_group_for_member(db, group_id, current_user.id)
 
-    # Get the unknown guest for this group
-    unknown_guest = db.query(models.GuestMember).filter(
+    # Get the unknown guest for this group - only its id is needed
+    unknown_guest = db.query(models.GuestMember.id).filter(
         models.GuestMember.group_id == group_id,
         models.GuestMember.is_unknown_placeholder == True
     ).first()
@@ -530,14 +554,17 @@ def claim_unknown_items(
 
     item_assignment_ids = request.item_assignment_ids
 
-    # Get all the item assignments that belong to the Unknown guest
-    assignments = db.query(models.ExpenseItemAssignment).filter(
-        models.ExpenseItemAssignment.id.in_(item_assignment_ids),
-        models.ExpenseItemAssignment.user_id == unknown_guest.id,
-        models.ExpenseItemAssignment.is_guest == True
+    # Get the items of the requested assignments that belong to the Unknown
+    # guest - one column is all the validation and recalculation need
+    assigned_item_ids = db.scalars(
+        select(models.ExpenseItemAssignment.expense_item_id).where(
+            models.ExpenseItemAssignment.id.in_(item_assignment_ids),
+            models.ExpenseItemAssignment.user_id == unknown_guest.id,
+            models.ExpenseItemAssignment.is_guest == True
+        )
     ).all()
 
-    if len(assignments) != len(item_assignment_ids):
+    if len(assigned_item_ids) != len(item_assignment_ids):
         raise HTTPException(
             status_code=400,
             detail="Some item assignments are not from the Unknown guest or do not exist"
@@ -553,58 +580,70 @@ def claim_unknown_items(
 
     # Recalculate splits for the affected expenses
     # Get unique expense IDs from the items
-    item_ids = [a.expense_item_id for a in assignments]
-    items = db.query(models.ExpenseItem).filter(
-        models.ExpenseItem.id.in_(item_ids)
-    ).all()
-    expense_ids = list(set(item.expense_id for item in items))
+    expense_ids = [row.expense_id for row in db.query(models.ExpenseItem.expense_id).filter(
+        models.ExpenseItem.id.in_(assigned_item_ids)
+    ).distinct()]
+
+    # Load every item of the affected itemized expenses together with its
+    # assignments in one query. Plain columns are selected so the transferred
+    # assignments are read as updated above, not from stale ORM instances.
+    rows = db.query(
+        models.ExpenseItem.expense_id,
+        models.ExpenseItem.id,
+        models.ExpenseItem.description,
+        models.ExpenseItem.price,
+        models.ExpenseItem.is_tax_tip,
+        models.ExpenseItem.split_type,
+        models.ExpenseItem.split_details,
+        models.ExpenseItemAssignment.user_id.label("assignee_id"),
+        models.ExpenseItemAssignment.is_guest.label("assignee_is_guest")
+    ).join(
+        models.Expense, models.Expense.id == models.ExpenseItem.expense_id
+    ).outerjoin(
+        models.ExpenseItemAssignment,
+        models.ExpenseItemAssignment.expense_item_id == models.ExpenseItem.id
+    ).filter(
+        models.Expense.id.in_(expense_ids),
+        models.Expense.split_type == 'ITEMIZED'
+    ).order_by(models.ExpenseItem.id, models.ExpenseItemAssignment.id).all()
+
+    # Build items data structure for split calculation, per expense
+    items_by_expense = {}
+    for row in rows:
+        expense_items = items_by_expense.setdefault(row.expense_id, {})
+        item = expense_items.get(row.id)
+        if item is None:
+            item = expense_items[row.id] = schemas.ExpenseItemCreate(
+                description=row.description,
+                price=row.price,
+                is_tax_tip=row.is_tax_tip,
+                split_type=row.split_type or "EQUAL",
+                split_details=json.loads(row.split_details) if row.split_details else None
+            )
+        if row.assignee_id is not None:
+            item.assignments.append(
+                schemas.ItemAssignment(user_id=row.assignee_id, is_guest=row.assignee_is_guest)
+            )
 
     # Recalculate splits for each affected expense
-    from utils.splits import calculate_itemized_splits
-    for expense_id in expense_ids:
-        expense = db.query(models.Expense).filter(models.Expense.id == expense_id).first()
-        if expense and expense.split_type == 'ITEMIZED':
-            # Get all items for this expense
-            expense_items = db.query(models.ExpenseItem).filter(
-                models.ExpenseItem.expense_id == expense_id
-            ).all()
-
-            # Get all assignments for these items
-            all_item_ids = [item.id for item in expense_items]
-            all_assignments = db.query(models.ExpenseItemAssignment).filter(
-                models.ExpenseItemAssignment.expense_item_id.in_(all_item_ids)
-            ).all()
-
-            # Build items data structure for split calculation
-            items_data = []
-            for item in expense_items:
-                item_assignments = [a for a in all_assignments if a.expense_item_id == item.id]
-                items_data.append({
-                    "price": item.price,
-                    "is_tax_tip": item.is_tax_tip,
-                    "assignments": [{"user_id": a.user_id, "is_guest": a.is_guest} for a in item_assignments],
-                    "split_type": item.split_type or "EQUAL",
-                    "split_details": item.split_details
-                })
-
-            # Calculate new splits
-            new_splits = calculate_itemized_splits(items_data)
-
-            # Delete old splits
-            db.query(models.ExpenseSplit).filter(
-                models.ExpenseSplit.expense_id == expense_id
-            ).delete(synchronize_session=False)
-
-            # Create new splits
-            for user_key, amount in new_splits.items():
-                is_guest = user_key.startswith("guest_")
-                user_id = int(user_key.split("_")[1])
-                db.add(models.ExpenseSplit(
-                    expense_id=expense_id,
-                    user_id=user_id,
-                    is_guest=is_guest,
-                    amount_owed=amount
-                ))
+    new_split_rows = [
+        {
+            "expense_id": expense_id,
+            "user_id": split.user_id,
+            "is_guest": split.is_guest,
+            "amount_owed": split.amount_owed
+        }
+        for expense_id, expense_items in items_by_expense.items()
+        for split in calculate_itemized_splits(list(expense_items.values()))
+    ]
+
+    if items_by_expense:
+        # Replace the old splits: one DELETE and one batched INSERT for all
+        # recalculated expenses
+        db.query(models.ExpenseSplit).filter(
+            models.ExpenseSplit.expense_id.in_(list(items_by_expense))
+        ).delete(synchronize_session=False)
+        db.bulk_insert_mappings(models.ExpenseSplit, new_split_rows)
 
     db.commit()
 
@@ -2,7 +2,9 @@
 
 from typing import Annotated
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
 
 import models
@@ -16,9 +18,23 @@ from utils.email import send_password_reset_email, send_password_changed_notific
 router = APIRouter(tags=["password-recovery"])
 
 
+async def _send_reset_email(user_email: str, user_name: str, reset_token: str):
+    """Send the reset email after the response, logging a failure"""
+    email_sent = await send_password_reset_email(
+        user_email=user_email,
+        user_name=user_name,
+        reset_token=reset_token
+    )
+
+    if not email_sent:
+        # Log error but don't reveal to user
+        print(f"Failed to send password reset email to {user_email}")
+
+
 @router.post("/auth/forgot-password", dependencies=[Depends(password_reset_rate_limiter)])
 async def forgot_password(
     request: schemas.ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -35,50 +51,128 @@ async def forgot_password(
     # Always return success, even if user doesn't exist (security)
     # This prevents email enumeration attacks
 
-    # Check if user exists
-    user = db.query(models.User).filter(models.User.email == request.email).first()
+    # Check if user exists - only the columns the email needs
+    user = db.query(
+        models.User.id, models.User.email, models.User.full_name
+    ).filter(models.User.email == request.email).first()
 
     if user:
-        # Invalidate old password reset tokens for this user
-        db.query(models.PasswordResetToken).filter(
-            models.PasswordResetToken.user_id == user.id,
-            models.PasswordResetToken.used == False,
-            models.PasswordResetToken.expires_at > datetime.utcnow()
-        ).update({"used": True})
-
         # Create new password reset token
         reset_token = auth.create_password_reset_token()
         token_hash = auth.hash_token(reset_token)
         expires_at = auth.get_password_reset_token_expiry()
 
-        db_token = models.PasswordResetToken(
-            user_id=user.id,
-            token_hash=token_hash,
-            expires_at=expires_at
+        # Invalidate old password reset tokens for this user and insert the
+        # new one as two Core statements in the same write transaction, so no
+        # other request can issue a token in between
+        db.execute(
+            update(models.PasswordResetToken).where(
+                models.PasswordResetToken.user_id == user.id,
+                models.PasswordResetToken.used == False,
+                # Evaluated by SQLite: CURRENT_TIMESTAMP is UTC, like the
+                # utcnow() values stored in expires_at
+                models.PasswordResetToken.expires_at > func.now()
+            ).values(used=True)
+        )
+        db.execute(
+            insert(models.PasswordResetToken).values(
+                user_id=user.id,
+                token_hash=token_hash,
+                expires_at=expires_at
+            )
         )
-        db.add(db_token)
         db.commit()
 
-        # Send password reset email
-        email_sent = await send_password_reset_email(
+        # Send password reset email once the response has gone out, so the
+        # request does not wait on the email API
+        background_tasks.add_task(
+            _send_reset_email,
             user_email=user.email,
             user_name=user.full_name or user.email,
             reset_token=reset_token
         )
 
-        if not email_sent:
-            # Log error but don't reveal to user
-            print(f"Failed to send password reset email to {user.email}")
-
     # Always return success
     return {
         "message": "If an account with that email exists, you will receive a password reset link shortly."
     }
 
 
+def _do_reset(db: Session, request: schemas.ResetPasswordRequest) -> tuple[str, str]:
+    """
+    Validate the reset token and set the new password.
+
+    Runs in the threadpool: the queries and the bcrypt hash are blocking, so
+    they must stay off the event loop. The session is committed and closed
+    here so its connection is released before the notification email is sent.
+
+    Returns:
+        (email, display name) of the user whose password was reset
+    """
+    try:
+        # Hash the token to find it in database
+        token_hash = auth.hash_token(request.token)
+
+        # Find token in database
+        db_token = db.query(models.PasswordResetToken).filter(
+            models.PasswordResetToken.token_hash == token_hash
+        ).first()
+
+        if not db_token:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired reset token"
+            )
+
+        # Check if token is used
+        if db_token.used:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Reset token has already been used"
+            )
+
+        # Check if token is expired
+        if db_token.expires_at < datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Reset token has expired. Please request a new one."
+            )
+
+        # Get user
+        user = db.query(models.User).filter(models.User.id == db_token.user_id).first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+        # Update password
+        user.hashed_password = auth.get_password_hash(request.new_password)
+        user.password_changed_at = datetime.utcnow()
+
+        # Mark token as used
+        db_token.used = True
+
+        # Invalidate all refresh tokens (force re-login on all devices)
+        db.query(models.RefreshToken).filter(
+            models.RefreshToken.user_id == user.id,
+            models.RefreshToken.revoked == False
+        ).update({"revoked": True})
+
+        # Read what the email needs before commit expires the instance
+        user_email = user.email
+        user_name = user.full_name or user.email
+
+        db.commit()
+        return user_email, user_name
+    finally:
+        db.close()
+
+
 @router.post("/auth/reset-password", dependencies=[Depends(auth_rate_limiter)])
 async def reset_password(
     request: schemas.ResetPasswordRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -91,61 +185,13 @@ async def reset_password(
             detail="Email service not configured. Please contact administrator."
         )
 
-    # Hash the token to find it in database
-    token_hash = auth.hash_token(request.token)
-
-    # Find token in database
-    db_token = db.query(models.PasswordResetToken).filter(
-        models.PasswordResetToken.token_hash == token_hash
-    ).first()
-
-    if not db_token:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or expired reset token"
-        )
-
-    # Check if token is used
-    if db_token.used:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Reset token has already been used"
-        )
-
-    # Check if token is expired
-    if db_token.expires_at < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Reset token has expired. Please request a new one."
-        )
-
-    # Get user
-    user = db.query(models.User).filter(models.User.id == db_token.user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
-    # Update password
-    user.hashed_password = auth.get_password_hash(request.new_password)
-    user.password_changed_at = datetime.utcnow()
-
-    # Mark token as used
-    db_token.used = True
-
-    # Invalidate all refresh tokens (force re-login on all devices)
-    db.query(models.RefreshToken).filter(
-        models.RefreshToken.user_id == user.id,
-        models.RefreshToken.revoked == False
-    ).update({"revoked": True})
-
-    db.commit()
+    user_email, user_name = await run_in_threadpool(_do_reset, db, request)
 
-    # Send confirmation email
-    await send_password_changed_notification(
-        user_email=user.email,
-        user_name=user.full_name or user.email
+    # Send confirmation email after the response
+    background_tasks.add_task(
+        send_password_changed_notification,
+        user_email=user_email,
+        user_name=user_name
     )
 
     return {
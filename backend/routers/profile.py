@@ -2,7 +2,7 @@
 
 from typing import Annotated
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 import models
@@ -134,6 +134,7 @@ async def update_profile(
 @router.post("/auth/change-password", dependencies=[Depends(profile_update_rate_limiter)])
 async def change_password(
     request: schemas.PasswordChangeRequest,
+    background_tasks: BackgroundTasks,
     current_user: Annotated[models.User, Depends(get_current_user)],
     db: Session = Depends(get_db)
 ):
@@ -175,8 +176,9 @@ async def change_password(
 
     db.commit()
 
-    # Send confirmation email
-    await send_password_changed_notification(
+    # Send confirmation email after the response; nothing here depends on it
+    background_tasks.add_task(
+        send_password_changed_notification,
         user_email=current_user.email,
         user_name=current_user.full_name or current_user.email
     )
@@ -189,6 +191,7 @@ async def change_password(
 @router.post("/auth/verify-email", dependencies=[Depends(email_verification_rate_limiter)])
 async def verify_email(
     request: schemas.VerifyEmailRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -264,8 +267,10 @@ async def verify_email(
     db.commit()
 
     # Send notification to old email address (only if email was changed)
+    # after the response
     if is_email_change:
-        await send_email_change_notification(
+        background_tasks.add_task(
+            send_email_change_notification,
             old_email=old_email,
             user_name=user.full_name or old_email,
             new_email=db_token.new_email
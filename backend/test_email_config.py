@@ -11,27 +11,29 @@ import asyncio
 # Add backend to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from utils.email import (
-    is_email_configured,
-    send_email,
-    BREVO_API_KEY,
-    FROM_EMAIL,
-    FROM_NAME,
-    FRONTEND_URL
-)
+# This is a manual script, not a test module: keep pytest from collecting
+# test_email() when it walks the backend directory
+__test__ = False
+
+
+def _load():
+    """Import the email service only when the script actually runs"""
+    from utils import email
+    return email
 
 
 def print_config():
     """Print current email configuration"""
+    email = _load()
     print("=" * 60)
     print("EMAIL CONFIGURATION (Brevo API)")
     print("=" * 60)
-    print(f"BREVO_API_KEY: {'✓ SET (hidden)' if BREVO_API_KEY else '❌ NOT SET'}")
-    print(f"FROM_EMAIL:    {FROM_EMAIL or '❌ NOT SET'}")
-    print(f"FROM_NAME:     {FROM_NAME}")
-    print(f"FRONTEND_URL:  {FRONTEND_URL}")
+    print(f"BREVO_API_KEY: {'✓ SET (hidden)' if email.BREVO_API_KEY else '❌ NOT SET'}")
+    print(f"FROM_EMAIL:    {email.FROM_EMAIL or '❌ NOT SET'}")
+    print(f"FROM_NAME:     {email.FROM_NAME}")
+    print(f"FRONTEND_URL:  {email.FRONTEND_URL}")
     print()
-    print(f"Status: {'✓ CONFIGURED' if is_email_configured() else '❌ NOT CONFIGURED'}")
+    print(f"Status: {'✓ CONFIGURED' if email.is_email_configured() else '❌ NOT CONFIGURED'}")
     print("=" * 60)
 
 
@@ -67,7 +69,7 @@ If you received this, your email configuration is working correctly! ✓
 Sent from Splitwiser email service
     """
 
-    success = await send_email(recipient, subject, html_content, text_content)
+    success = await _load().send_email(recipient, subject, html_content, text_content)
 
     if success:
         print("✓ Email sent successfully!")
@@ -84,7 +86,7 @@ async def main():
     print()
     print_config()
 
-    if not is_email_configured():
+    if not _load().is_email_configured():
         print("\n❌ Email service is not configured.")
         print("\nTo configure, set these environment variables:")
         print("  export BREVO_API_KEY=<your-brevo-api-key>")
@@ -49,6 +49,15 @@ def client(db_session):
         yield c
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="session")
+def app_client():
+    """
+    One TestClient shared by the whole session, without the database override.
+    For tests that never reach the database (e.g. middleware behaviour).
+    """
+    with TestClient(app) as c:
+        yield c
+
 @pytest.fixture
 def test_user(db_session):
     """Create a test user and return the user object."""
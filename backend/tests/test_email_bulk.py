@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+import utils.email as email_service
+
+
+@pytest.fixture
+def configured_email():
+    """Configure the email service for the duration of a test"""
+    sender = {"name": "Splitwiser", "email": "noreply@example.com"}
+    with patch.object(email_service, "BREVO_API_KEY", "test-key"), \
+         patch.object(email_service, "FROM_EMAIL", sender["email"]), \
+         patch.object(email_service, "FROM_NAME", sender["name"]):
+        email_service.is_email_configured.cache_clear()
+        yield sender
+    email_service.is_email_configured.cache_clear()
+
+
+def test_send_email_bulk_sends_one_version_per_recipient(configured_email, caplog):
+    """Verify a bulk send is one request with a message version per recipient"""
+    caplog.set_level("INFO", logger=email_service.logger.name)
+    response = MagicMock(status_code=201)
+    response.json.return_value = {"messageIds": ["<m1>", "<m2>"]}
+
+    with patch.object(email_service._brevo_session, "post", return_value=response) as mock_post:
+        sent = asyncio.run(email_service.send_email_bulk(
+            ["a@example.com", "b@example.com"], "Subject", "<p>Hi</p>", "Hi"
+        ))
+
+    assert sent is True
+    assert "to 2 recipients (Message ID: ['<m1>', '<m2>'])" in caplog.text
+    mock_post.assert_called_once()
+    assert mock_post.call_args.kwargs["headers"] == {"api-key": "test-key"}
+    payload = mock_post.call_args.kwargs["json"]
+    assert payload["sender"] == configured_email
+    assert payload["subject"] == "Subject"
+    assert payload["htmlContent"] == "<p>Hi</p>"
+    assert payload["textContent"] == "Hi"
+    assert "to" not in payload
+    assert payload["messageVersions"] == [
+        {"to": [{"email": "a@example.com"}]},
+        {"to": [{"email": "b@example.com"}]},
+    ]
+
+
+def test_send_email_bulk_reports_api_error(configured_email):
+    """Verify a rejected bulk send returns False"""
+    response = MagicMock(status_code=400, text="bad request")
+
+    with patch.object(email_service._brevo_session, "post", return_value=response):
+        sent = asyncio.run(email_service.send_email_bulk(
+            ["a@example.com"], "Subject", "<p>Hi</p>", "Hi"
+        ))
+
+    assert sent is False
+
+
+def test_send_email_bulk_with_no_recipients_makes_no_request(configured_email):
+    """Verify an empty recipient list succeeds without calling the API"""
+    with patch.object(email_service._brevo_session, "post") as mock_post:
+        sent = asyncio.run(email_service.send_email_bulk([], "Subject", "<p>Hi</p>", "Hi"))
+
+    assert sent is True
+    mock_post.assert_not_called()
@@ -0,0 +1,19 @@
+from utils.email import _render
+
+
+def test_html_body_escapes_user_values():
+    """Verify user-controlled names cannot inject markup into HTML emails"""
+    subject, html, text = _render(
+        "friend_request",
+        to_name="<b>Ann</b>",
+        from_name="<script>alert(1)</script>",
+        friend_requests_link="http://localhost:5173/account"
+    )
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "Hi &lt;b&gt;Ann&lt;/b&gt;," in html
+
+    # Subject and plain text body are not HTML, so values are left as-is
+    assert subject == "<script>alert(1)</script> sent you a friend request on Splitwiser"
+    assert "Hi <b>Ann</b>," in text
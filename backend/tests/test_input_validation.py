@@ -2,74 +2,46 @@ import pytest
 from pydantic import ValidationError
 from backend.schemas import UserCreate, ExpenseCreate, GroupCreate, ExpenseSplitBase
 
-def test_user_create_validation():
-    long_string = "a" * 10001
-    valid_string = "a" * 10
-
-    # Test valid user
-    UserCreate(email="test@example.com", password=valid_string, full_name=valid_string)
-
-    # Test long full_name
-    with pytest.raises(ValidationError) as excinfo:
-        UserCreate(email="test@example.com", password=valid_string, full_name=long_string)
-    assert "String should have at most 100 characters" in str(excinfo.value)
+LONG_STRING = "a" * 10001
+VALID_STRING = "a" * 10
 
-    # Test long password
-    with pytest.raises(ValidationError) as excinfo:
-        UserCreate(email="test@example.com", password=long_string, full_name=valid_string)
-    assert "String should have at most 128 characters" in str(excinfo.value)
+_BASE_USER = {"email": "test@example.com", "password": VALID_STRING, "full_name": VALID_STRING}
 
-    # Test short password
-    with pytest.raises(ValidationError) as excinfo:
-        UserCreate(email="test@example.com", password="short", full_name=valid_string)
-    assert "String should have at least 8 characters" in str(excinfo.value)
+_BASE_EXPENSE = {
+    "description": "Valid",
+    "amount": 100,
+    "date": "2023-01-01",
+    "payer_id": 1,
+    "splits": [ExpenseSplitBase(user_id=1, amount_owed=100)],
+    "split_type": "EQUAL"
+}
 
-def test_expense_create_validation():
-    long_string = "a" * 10001
-    split = ExpenseSplitBase(user_id=1, amount_owed=100)
-
-    # Test long description
-    with pytest.raises(ValidationError) as excinfo:
-        ExpenseCreate(
-            description=long_string,
-            amount=100,
-            date="2023-01-01",
-            payer_id=1,
-            splits=[split],
-            split_type="EQUAL"
-        )
-    assert "String should have at most 200 characters" in str(excinfo.value)
-
-    # Test long currency
+def test_user_create_validation():
+    # Test valid user
+    UserCreate(**_BASE_USER)
+
+@pytest.mark.parametrize("field,value,message", [
+    ("full_name", LONG_STRING, "String should have at most 100 characters"),
+    ("password", LONG_STRING, "String should have at most 128 characters"),
+    ("password", "short", "String should have at least 8 characters"),
+])
+def test_user_create_rejects_invalid_field(field, value, message):
     with pytest.raises(ValidationError) as excinfo:
-        ExpenseCreate(
-            description="Valid",
-            amount=100,
-            currency="USDD", # 4 chars
-            date="2023-01-01",
-            payer_id=1,
-            splits=[split],
-            split_type="EQUAL"
-        )
-    assert "String should have at most 3 characters" in str(excinfo.value)
-
-    # Test long notes
+        UserCreate(**{**_BASE_USER, field: value})
+    assert message in str(excinfo.value)
+
+@pytest.mark.parametrize("field,value,message", [
+    ("description", LONG_STRING, "String should have at most 200 characters"),
+    ("currency", "USDD", "String should have at most 3 characters"),  # 4 chars
+    ("notes", LONG_STRING, "String should have at most 1000 characters"),
+])
+def test_expense_create_validation(field, value, message):
     with pytest.raises(ValidationError) as excinfo:
-        ExpenseCreate(
-            description="Valid",
-            amount=100,
-            date="2023-01-01",
-            payer_id=1,
-            splits=[split],
-            split_type="EQUAL",
-            notes=long_string
-        )
-    assert "String should have at most 1000 characters" in str(excinfo.value)
+        ExpenseCreate(**{**_BASE_EXPENSE, field: value})
+    assert message in str(excinfo.value)
 
 def test_group_create_validation():
-    long_string = "a" * 10001
-
     # Test long name
     with pytest.raises(ValidationError) as excinfo:
-        GroupCreate(name=long_string)
+        GroupCreate(name=LONG_STRING)
     assert "String should have at most 100 characters" in str(excinfo.value)
@@ -1,5 +1,5 @@
 from auth import get_password_hash
-from models import User
+from models import User, GuestMember, Expense, ExpenseSplit, ExpenseItem, ExpenseItemAssignment
 
 def test_add_registered_member(client, auth_headers, db_session):
     # Create another user to add
@@ -34,6 +34,34 @@ def test_add_registered_member(client, auth_headers, db_session):
     assert len(members) == 2
     assert any(m["email"] == "other@example.com" for m in members)
 
+def test_add_existing_member_rejected(client, auth_headers, db_session):
+    other_user = User(
+        email="twice@example.com",
+        hashed_password=get_password_hash("password123"),
+        full_name="Twice User",
+        is_active=True
+    )
+    db_session.add(other_user)
+    db_session.commit()
+
+    group_resp = client.post(
+        "/groups/",
+        headers=auth_headers,
+        json={"name": "Duplicate Group", "default_currency": "USD"}
+    )
+    group_id = group_resp.json()["id"]
+
+    first = client.post(f"/groups/{group_id}/members", headers=auth_headers, json={"email": "twice@example.com"})
+    assert first.status_code == 200
+    assert first.json()["user_id"] == other_user.id
+
+    second = client.post(f"/groups/{group_id}/members", headers=auth_headers, json={"email": "twice@example.com"})
+    assert second.status_code == 400
+    assert second.json()["detail"] == "User is already a member of this group"
+
+    details_resp = client.get(f"/groups/{group_id}", headers=auth_headers)
+    assert len(details_resp.json()["members"]) == 2
+
 def test_add_guest_member(client, auth_headers):
     # Create a group
     group_resp = client.post(
@@ -91,3 +119,119 @@ def test_manage_guest(client, auth_headers, db_session, test_user):
     details_resp = client.get(f"/groups/{group_id}", headers=auth_headers)
     guests = details_resp.json()["guests"]
     assert guests[0]["managed_by_id"] == test_user.id
+
+def test_remove_member_unlinks_managed_guests(client, auth_headers, db_session):
+    other_user = User(
+        email="manager@example.com",
+        hashed_password=get_password_hash("password123"),
+        full_name="Manager User",
+        is_active=True
+    )
+    db_session.add(other_user)
+    db_session.commit()
+
+    group_resp = client.post(
+        "/groups/",
+        headers=auth_headers,
+        json={"name": "Unlink Group", "default_currency": "USD"}
+    )
+    group_id = group_resp.json()["id"]
+    client.post(f"/groups/{group_id}/members", headers=auth_headers, json={"email": "manager@example.com"})
+    guest_resp = client.post(f"/groups/{group_id}/guests", headers=auth_headers, json={"name": "Managed Guest"})
+    guest_id = guest_resp.json()["id"]
+
+    guest = db_session.get(GuestMember, guest_id)
+    guest.managed_by_id = other_user.id
+    guest.managed_by_type = "user"
+    db_session.commit()
+
+    response = client.delete(f"/groups/{group_id}/members/{other_user.id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    # The delete trigger clears the link in the same statement
+    db_session.expire_all()
+    guest = db_session.get(GuestMember, guest_id)
+    assert guest.managed_by_id is None
+    assert guest.managed_by_type is None
+
+
+def test_remove_guest_deletes_guest_expenses(client, auth_headers, db_session, test_user):
+    group_resp = client.post(
+        "/groups/",
+        headers=auth_headers,
+        json={"name": "Guest Cascade Group", "default_currency": "USD"}
+    )
+    group_id = group_resp.json()["id"]
+    guest_resp = client.post(f"/groups/{group_id}/guests", headers=auth_headers, json={"name": "Leaving Guest"})
+    guest_id = guest_resp.json()["id"]
+
+    paid_by_guest = Expense(
+        description="Guest paid", amount=1000, currency="USD", date="2024-01-01",
+        payer_id=guest_id, payer_is_guest=True, group_id=group_id, created_by_id=test_user.id
+    )
+    paid_by_user = Expense(
+        description="User paid", amount=1000, currency="USD", date="2024-01-01",
+        payer_id=test_user.id, payer_is_guest=False, group_id=group_id, created_by_id=test_user.id
+    )
+    db_session.add_all([paid_by_guest, paid_by_user])
+    db_session.flush()
+    db_session.add_all([
+        ExpenseSplit(expense_id=paid_by_user.id, user_id=guest_id, is_guest=True, amount_owed=500),
+        ExpenseSplit(expense_id=paid_by_user.id, user_id=test_user.id, is_guest=False, amount_owed=500),
+    ])
+    db_session.commit()
+    paid_by_guest_id = paid_by_guest.id
+    paid_by_user_id = paid_by_user.id
+
+    response = client.delete(f"/groups/{group_id}/guests/{guest_id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    db_session.expire_all()
+    assert db_session.get(Expense, paid_by_guest_id) is None
+    assert db_session.get(Expense, paid_by_user_id) is not None
+    remaining = db_session.query(ExpenseSplit).filter(ExpenseSplit.expense_id == paid_by_user_id).all()
+    assert [(split.user_id, split.is_guest) for split in remaining] == [(test_user.id, False)]
+
+
+def test_claim_unknown_items_recalculates_splits(client, auth_headers, db_session, test_user):
+    group_resp = client.post(
+        "/groups/",
+        headers=auth_headers,
+        json={"name": "Unknown Items Group", "default_currency": "USD"}
+    )
+    group_id = group_resp.json()["id"]
+    unknown_id = client.get(f"/groups/{group_id}/unknown-guest", headers=auth_headers).json()["id"]
+
+    expense = Expense(
+        description="Dinner", amount=1100, currency="USD", date="2024-01-01",
+        payer_id=test_user.id, payer_is_guest=False, group_id=group_id,
+        created_by_id=test_user.id, split_type="ITEMIZED"
+    )
+    db_session.add(expense)
+    db_session.flush()
+    unknown_item = ExpenseItem(expense_id=expense.id, description="Pasta", price=600)
+    user_item = ExpenseItem(expense_id=expense.id, description="Salad", price=400)
+    tip = ExpenseItem(expense_id=expense.id, description="Tip", price=100, is_tax_tip=True)
+    db_session.add_all([unknown_item, user_item, tip])
+    db_session.flush()
+    unknown_assignment = ExpenseItemAssignment(expense_item_id=unknown_item.id, user_id=unknown_id, is_guest=True)
+    db_session.add_all([
+        unknown_assignment,
+        ExpenseItemAssignment(expense_item_id=user_item.id, user_id=test_user.id, is_guest=False),
+        ExpenseSplit(expense_id=expense.id, user_id=unknown_id, is_guest=True, amount_owed=660),
+        ExpenseSplit(expense_id=expense.id, user_id=test_user.id, is_guest=False, amount_owed=440),
+    ])
+    db_session.commit()
+    expense_id = expense.id
+
+    response = client.post(
+        f"/groups/{group_id}/claim-unknown-items",
+        headers=auth_headers,
+        json={"item_assignment_ids": [unknown_assignment.id]}
+    )
+    assert response.status_code == 200
+    assert response.json()["affected_expenses"] == [expense_id]
+
+    db_session.expire_all()
+    splits = db_session.query(ExpenseSplit).filter(ExpenseSplit.expense_id == expense_id).all()
+    assert [(split.user_id, split.is_guest, split.amount_owed) for split in splits] == [(test_user.id, False, 1100)]
@@ -2,17 +2,19 @@
 import pytest
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
 from main import app
 from database import Base, get_db
 from models import User, Expense, ExpenseSplit, Friendship
 from dependencies import get_current_user
+from utils.response_cache import friends_cache
 
 # Setup in-memory DB for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -170,3 +172,127 @@ def test_get_friend_balance_performance(client, session, query_counter):
     # Base queries + 1 batch fetch splits
     # Should be around 5-7 queries
     assert query_counter.count < 10, f"Expected < 10 queries, got {query_counter.count}"
+
+def test_friend_balance_cached_until_next_commit(client, session, query_counter):
+    user1 = create_user(session, "user1@example.com", "User One")
+    user2 = create_user(session, "user2@example.com", "User Two")
+    session.add(Friendship(user_id1=user1.id, user_id2=user2.id))
+    session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user1
+
+    create_expense(session, user1.id, 2000, "Dinner", [
+        {"user_id": user1.id, "amount": 1000},
+        {"user_id": user2.id, "amount": 1000}
+    ])
+
+    first = client.get(f"/friends/{user2.id}/balance")
+    assert first.json() == [{"amount": 10.0, "currency": "USD"}]
+
+    # Warm read is served from the response cache without touching the DB
+    query_counter.count = 0
+    second = client.get(f"/friends/{user2.id}/balance")
+    assert second.json() == first.json()
+    assert query_counter.count == 0, f"Expected cached response, got {query_counter.count} queries"
+
+    # Any commit invalidates the cache
+    cache_key = ("balance", user1.id, user2.id)
+    assert friends_cache.get(cache_key) is not None
+    create_expense(session, user1.id, 2000, "Lunch", [
+        {"user_id": user1.id, "amount": 1000},
+        {"user_id": user2.id, "amount": 1000}
+    ])
+    assert friends_cache.get(cache_key) is None
+
+def create_shared_expenses(session, user1, user2, count):
+    for i in range(count):
+        payer = user1 if i % 2 else user2
+        create_expense(session, payer.id, 2000, f"Expense {i}", [
+            {"user_id": user1.id, "amount": 1000},
+            {"user_id": user2.id, "amount": 1000}
+        ])
+
+@pytest.mark.parametrize("expense_count", [5, 50])
+def test_friend_routes_query_counts_are_constant(client, session, query_counter, expense_count):
+    user1 = create_user(session, "user1@example.com", "User One")
+    user2 = create_user(session, "user2@example.com", "User Two")
+    session.add(Friendship(user_id1=user1.id, user_id2=user2.id))
+    session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user1
+    create_shared_expenses(session, user1, user2, expense_count)
+    # Reload after the commits so the counts don't include refreshing user1
+    session.refresh(user1)
+
+    # Friend list: friendships + one IN query for the users
+    query_counter.count = 0
+    response = client.get("/friends")
+    assert response.status_code == 200
+    assert query_counter.count <= 2, f"/friends: {query_counter.count} queries"
+
+    # Expenses: friendship, shared groups, expenses, splits, users
+    query_counter.count = 0
+    response = client.get(f"/friends/{user2.id}/expenses")
+    assert response.status_code == 200
+    assert len(response.json()) == expense_count
+    assert query_counter.count <= 5, f"/friends/{{id}}/expenses: {query_counter.count} queries"
+
+    # Balance: friendship, shared groups, one aggregate
+    query_counter.count = 0
+    response = client.get(f"/friends/{user2.id}/balance")
+    assert response.status_code == 200
+    assert query_counter.count <= 3, f"/friends/{{id}}/balance: {query_counter.count} queries"
+
+def test_friend_expenses_keyset_pagination(client, session):
+    user1 = create_user(session, "user1@example.com", "User One")
+    user2 = create_user(session, "user2@example.com", "User Two")
+    session.add(Friendship(user_id1=user1.id, user_id2=user2.id))
+    session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user1
+    create_shared_expenses(session, user1, user2, 5)
+
+    full = client.get(f"/friends/{user2.id}/expenses").json()
+    assert len(full) == 5
+
+    # Walk the pages with limit=2: 2 + 2 + 1, same order as the full list
+    paged = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/friends/{user2.id}/expenses", params=params)
+        assert response.status_code == 200
+        paged.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert [e["id"] for e in paged] == [e["id"] for e in full]
+
+    response = client.get(f"/friends/{user2.id}/expenses", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_friend_expenses_page_cached_with_cursor(client, session, query_counter):
+    user1 = create_user(session, "user1@example.com", "User One")
+    user2 = create_user(session, "user2@example.com", "User Two")
+    session.add(Friendship(user_id1=user1.id, user_id2=user2.id))
+    session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user1
+    create_shared_expenses(session, user1, user2, 3)
+    session.refresh(user1)
+
+    first = client.get(f"/friends/{user2.id}/expenses", params={"limit": 2})
+    assert first.headers.get("X-Next-Cursor")
+
+    # Only the friendship check runs; the page and its cursor come from cache
+    query_counter.count = 0
+    second = client.get(f"/friends/{user2.id}/expenses", params={"limit": 2})
+    assert second.json() == first.json()
+    assert second.headers.get("X-Next-Cursor") == first.headers.get("X-Next-Cursor")
+    assert query_counter.count == 1, f"Expected 1 query, got {query_counter.count}"
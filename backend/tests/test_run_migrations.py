@@ -0,0 +1,86 @@
+import sqlite3
+
+import models  # noqa: F401 - registers the tables on Base.metadata
+from sqlalchemy import create_engine
+from database import Base
+from migrations.run_migrations import run_migrations
+
+
+def make_db_with_duplicate_memberships(db_path):
+    """Create a current-schema DB at version 12 whose memberships are not yet unique"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        DROP INDEX idx_group_members_group_user;
+        INSERT INTO group_members (id, group_id, user_id, managed_by_id, managed_by_type) VALUES
+            (1, 1, 10, NULL, NULL),
+            (2, 1, 10, 20, 'user'),
+            (3, 1, 11, 5, 'guest'),
+            (4, 1, 11, 20, 'user'),
+            (5, 1, 12, NULL, NULL);
+        INSERT INTO guest_members (id, group_id, name, created_by_id, managed_by_id, managed_by_type)
+        VALUES (1, 1, 'Guest', 10, 10, 'user');
+        PRAGMA user_version = 12;
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_duplicate_memberships_merged_into_oldest_row(tmp_path, capsys):
+    """Verify step 13 keeps the duplicates' manager and builds the unique index"""
+    db_path = str(tmp_path / "dupes.sqlite3")
+    make_db_with_duplicate_memberships(db_path)
+
+    assert run_migrations(db_path)
+    # User 11's rows disagree on the manager, which is reported
+    assert "User 11 in group 1 had managers" in capsys.readouterr().out
+
+    conn = sqlite3.connect(db_path)
+    members = conn.execute(
+        "SELECT id, user_id, managed_by_id, managed_by_type FROM group_members ORDER BY id"
+    ).fetchall()
+    # The oldest row survives and takes over the manager of a later duplicate;
+    # a kept row that already has a manager keeps it
+    assert members == [(1, 10, 20, "user"), (3, 11, 5, "guest"), (5, 12, None, None)]
+
+    # Deleting the extra rows did not unlink the guest managed by user 10
+    assert conn.execute("SELECT managed_by_id FROM guest_members WHERE id = 1").fetchone() == (10,)
+
+    assert conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_group_members_group_user'"
+    ).fetchone()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] >= 13
+    conn.close()
+
+
+def test_friend_query_indexes_replace_two_column_splits_index(tmp_path):
+    """Verify step 15 rebuilds the older splits index and adds the friendship indexes"""
+    db_path = str(tmp_path / "friends.sqlite3")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        DROP INDEX idx_expense_splits_user_guest;
+        CREATE INDEX idx_expense_splits_user_guest ON expense_splits(user_id, is_guest);
+        DROP INDEX idx_friendships_pair;
+        DROP INDEX idx_friendships_pair_reverse;
+        PRAGMA user_version = 14;
+    """)
+    conn.close()
+
+    assert run_migrations(db_path)
+
+    conn = sqlite3.connect(db_path)
+    columns = [row[0] for row in conn.execute(
+        "SELECT name FROM pragma_index_info('idx_expense_splits_user_guest') ORDER BY seqno"
+    )]
+    assert columns == ["user_id", "is_guest", "expense_id"]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {"idx_friendships_pair", "idx_friendships_pair_reverse"} <= indexes
+    assert conn.execute("PRAGMA user_version").fetchone()[0] >= 15
+    conn.close()
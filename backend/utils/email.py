@@ -1,9 +1,17 @@
 """Email service using Brevo API for Splitwiser"""
 
 import os
+import re
+import atexit
 import logging
 import requests
+from functools import lru_cache
+from html import escape
+from string import Template
 from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,40 +25,65 @@ FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 # Brevo API endpoint
 BREVO_API_URL = "https://api.brevo.com/v3/smtp/email"
 
-
+# (connect, read) timeouts in seconds: an unreachable Brevo fails fast
+# instead of holding a worker thread for the full read timeout
+BREVO_TIMEOUT = (3, 10)
+
+# One keep-alive session shared by every send: the TCP connection and TLS
+# session to Brevo are reused instead of a fresh handshake per email.
+# urllib3 checks a pooled connection is still open before reusing it and
+# reconnects transparently if the server dropped it. A failed connect is
+# retried once; nothing is retried once the request may have reached Brevo,
+# so an email is never sent twice.
+#
+# Sends run through run_in_threadpool, so up to 40 (AnyIO's default thread
+# limit) can be in flight at once. The pool is sized to match rather than
+# blocking with pool_block=True: a burst never waits on a connection slot,
+# and no connection is opened only to be discarded as "pool is full".
+BREVO_POOL_SIZE = 40
+
+_brevo_session = requests.Session()
+_brevo_session.headers.update({
+    "accept": "application/json",
+    "content-type": "application/json"
+})
+_brevo_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=BREVO_POOL_SIZE,
+    max_retries=Retry(total=1, connect=1, read=0, status=0, other=0)
+))
+atexit.register(_brevo_session.close)
+
+
+@lru_cache(maxsize=1)
 def is_email_configured() -> bool:
-    """Check if email service is properly configured"""
+    """Check if email service is properly configured
+
+    The configuration is read from the environment once at import, so the
+    answer is fixed for the life of the process and computed only once.
+    Sends read BREVO_API_KEY, FROM_EMAIL and FROM_NAME on every request, so
+    after changing them (e.g. in tests) only is_email_configured.cache_clear()
+    is needed.
+    """
     return bool(BREVO_API_KEY and FROM_EMAIL)
 
 
-async def send_email(
-    to_email: str,
-    subject: str,
-    html_content: str,
-    text_content: str
-) -> bool:
+async def _post_to_brevo(payload: dict, recipients: str) -> bool:
     """
-    Send an email via Brevo API
+    POST a prepared payload to the Brevo API
 
     Args:
-        to_email: Recipient email address
-        subject: Email subject line
-        html_content: HTML version of email body
-        text_content: Plain text version of email body
+        payload: Request body, without the sender (added here)
+        recipients: Recipient description used in log messages
 
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if Brevo accepted the email(s), False otherwise
     """
-    if not is_email_configured():
-        logger.error("Email service not configured: BREVO_API_KEY and FROM_EMAIL required")
-        return False
-
     try:
-        # Prepare Brevo API request
+        # Content headers come from the session; the key and sender are read
+        # per request so they always match the current configuration
         headers = {
-            "accept": "application/json",
-            "api-key": BREVO_API_KEY,
-            "content-type": "application/json"
+            "api-key": BREVO_API_KEY
         }
 
         payload = {
@@ -58,27 +91,24 @@ async def send_email(
                 "name": FROM_NAME,
                 "email": FROM_EMAIL
             },
-            "to": [
-                {
-                    "email": to_email
-                }
-            ],
-            "subject": subject,
-            "htmlContent": html_content,
-            "textContent": text_content
+            **payload
         }
 
-        # Send request to Brevo API
-        response = requests.post(
+        # Send request to Brevo API; requests is blocking, so the call runs in
+        # the threadpool to keep the event loop serving other requests
+        response = await run_in_threadpool(
+            _brevo_session.post,
             BREVO_API_URL,
             json=payload,
             headers=headers,
-            timeout=10
+            timeout=BREVO_TIMEOUT
         )
 
         # Check response
         if response.status_code == 201:
-            logger.info(f"Email sent successfully to {to_email} (Message ID: {response.json().get('messageId')})")
+            body = response.json()
+            message_ids = body.get("messageId") or body.get("messageIds")
+            logger.info(f"Email sent successfully to {recipients} (Message ID: {message_ids})")
             return True
         else:
             logger.error(f"Brevo API error ({response.status_code}): {response.text}")
@@ -95,38 +125,97 @@ async def send_email(
         return False
 
 
-async def send_password_reset_email(
-    user_email: str,
-    user_name: str,
-    reset_token: str
+async def send_email(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: str
 ) -> bool:
     """
-    Send password reset email with reset link
+    Send an email via Brevo API
 
     Args:
-        user_email: User's email address
-        user_name: User's full name
-        reset_token: Password reset token (not hashed)
+        to_email: Recipient email address
+        subject: Email subject line
+        html_content: HTML version of email body
+        text_content: Plain text version of email body
 
     Returns:
-        bool: True if email sent successfully
+        bool: True if email sent successfully, False otherwise
     """
-    reset_link = f"{FRONTEND_URL}/reset-password/{reset_token}"
+    if not is_email_configured():
+        logger.error("Email service not configured: BREVO_API_KEY and FROM_EMAIL required")
+        return False
+
+    payload = {
+        "to": [
+            {
+                "email": to_email
+            }
+        ],
+        "subject": subject,
+        "htmlContent": html_content,
+        "textContent": text_content
+    }
+
+    return await _post_to_brevo(payload, to_email)
+
+
+async def send_email_bulk(
+    recipients: list[str],
+    subject: str,
+    html_content: str,
+    text_content: str
+) -> bool:
+    """
+    Send the same email to several recipients in one Brevo API request
+
+    Each recipient gets a separate message (a Brevo message version), so
+    recipients never see each other's addresses.
+
+    Args:
+        recipients: Recipient email addresses
+        subject: Email subject line
+        html_content: HTML version of email body
+        text_content: Plain text version of email body
+
+    Returns:
+        bool: True if all emails were accepted, False otherwise
+    """
+    if not recipients:
+        return True
+
+    if not is_email_configured():
+        logger.error("Email service not configured: BREVO_API_KEY and FROM_EMAIL required")
+        return False
+
+    payload = {
+        "subject": subject,
+        "htmlContent": html_content,
+        "textContent": text_content,
+        "messageVersions": [
+            {"to": [{"email": email}]}
+            for email in recipients
+        ]
+    }
+
+    return await _post_to_brevo(payload, f"{len(recipients)} recipients")
 
-    subject = "Reset Your Splitwiser Password"
 
-    html_content = f"""
+# Email bodies are string.Template objects built once at import, so a send
+# only substitutes the per-recipient values into them
+_PASSWORD_RESET_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background-color: #4F46E5; color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; background-color: #f9f9f9; }}
-            .button {{ display: inline-block; padding: 12px 24px; background-color: #4F46E5; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .link-text {{ word-break: break-all; color: #1E40AF; background-color: #EFF6FF; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 14px; }}
-            .footer {{ padding: 20px; text-align: center; font-size: 12px; color: #666; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background-color: #4F46E5; color: white; padding: 20px; text-align: center; }
+            .content { padding: 20px; background-color: #f9f9f9; }
+            .button { display: inline-block; padding: 12px 24px; background-color: #4F46E5; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+            .link-text { word-break: break-all; color: #1E40AF; background-color: #EFF6FF; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 14px; }
+            .footer { padding: 20px; text-align: center; font-size: 12px; color: #666; }
         </style>
     </head>
     <body>
@@ -135,14 +224,14 @@ async def send_password_reset_email(
                 <h1>Password Reset Request</h1>
             </div>
             <div class="content">
-                <p>Hi {user_name},</p>
+                <p>Hi ${user_name},</p>
                 <p>We received a request to reset your password for your Splitwiser account.</p>
                 <p>Click the button below to reset your password:</p>
                 <p style="text-align: center;">
-                    <a href="{reset_link}" class="button">Reset Password</a>
+                    <a href="${reset_link}" class="button">Reset Password</a>
                 </p>
                 <p>Or copy and paste this link into your browser:</p>
-                <p class="link-text">{reset_link}</p>
+                <p class="link-text">${reset_link}</p>
                 <p><strong>This link will expire in 1 hour.</strong></p>
                 <p>If you didn't request a password reset, you can safely ignore this email. Your password will not be changed.</p>
             </div>
@@ -152,15 +241,15 @@ async def send_password_reset_email(
         </div>
     </body>
     </html>
-    """
+    """)
 
-    text_content = f"""
-Hi {user_name},
+_PASSWORD_RESET_TEXT = Template("""
+Hi ${user_name},
 
 We received a request to reset your password for your Splitwiser account.
 
 Click the link below to reset your password:
-{reset_link}
+${reset_link}
 
 This link will expire in 1 hour.
 
@@ -168,45 +257,20 @@ If you didn't request a password reset, you can safely ignore this email. Your p
 
 ---
 This is an automated message from Splitwiser.
-    """
-
-    return await send_email(user_email, subject, html_content, text_content)
-
-
-async def send_email_verification_email(
-    user_email: str,
-    user_name: str,
-    new_email: str,
-    verification_token: str
-) -> bool:
-    """
-    Send email verification link to new email address
-
-    Args:
-        user_email: User's current email (not used, but kept for consistency)
-        user_name: User's full name
-        new_email: New email address to verify
-        verification_token: Email verification token (not hashed)
+    """)
 
-    Returns:
-        bool: True if email sent successfully
-    """
-    verification_link = f"{FRONTEND_URL}/verify-email/{verification_token}"
-
-    subject = "Verify Your New Email Address - Splitwiser"
-
-    html_content = f"""
+_EMAIL_VERIFICATION_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background-color: #4F46E5; color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; background-color: #f9f9f9; }}
-            .button {{ display: inline-block; padding: 12px 24px; background-color: #4F46E5; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .link-text {{ word-break: break-all; color: #1E40AF; background-color: #EFF6FF; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 14px; }}
-            .footer {{ padding: 20px; text-align: center; font-size: 12px; color: #666; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background-color: #4F46E5; color: white; padding: 20px; text-align: center; }
+            .content { padding: 20px; background-color: #f9f9f9; }
+            .button { display: inline-block; padding: 12px 24px; background-color: #4F46E5; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+            .link-text { word-break: break-all; color: #1E40AF; background-color: #EFF6FF; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 14px; }
+            .footer { padding: 20px; text-align: center; font-size: 12px; color: #666; }
         </style>
     </head>
     <body>
@@ -215,14 +279,14 @@ async def send_email_verification_email(
                 <h1>Verify Your Email Address</h1>
             </div>
             <div class="content">
-                <p>Hi {user_name},</p>
+                <p>Hi ${user_name},</p>
                 <p>Please verify your new email address for your Splitwiser account.</p>
                 <p>Click the button below to verify this email address:</p>
                 <p style="text-align: center;">
-                    <a href="{verification_link}" class="button">Verify Email</a>
+                    <a href="${verification_link}" class="button">Verify Email</a>
                 </p>
                 <p>Or copy and paste this link into your browser:</p>
-                <p class="link-text">{verification_link}</p>
+                <p class="link-text">${verification_link}</p>
                 <p><strong>This link will expire in 24 hours.</strong></p>
                 <p>If you didn't request this email change, please contact support immediately.</p>
             </div>
@@ -232,15 +296,15 @@ async def send_email_verification_email(
         </div>
     </body>
     </html>
-    """
+    """)
 
-    text_content = f"""
-Hi {user_name},
+_EMAIL_VERIFICATION_TEXT = Template("""
+Hi ${user_name},
 
 Please verify your new email address for your Splitwiser account.
 
 Click the link below to verify this email address:
-{verification_link}
+${verification_link}
 
 This link will expire in 24 hours.
 
@@ -248,47 +312,19 @@ If you didn't request this email change, please contact support immediately.
 
 ---
 This is an automated message from Splitwiser.
-    """
-
-    return await send_email(new_email, subject, html_content, text_content)
+    """)
 
-
-async def send_email_change_notification(
-    old_email: str,
-    user_name: str,
-    new_email: str
-) -> bool:
-    """
-    Send notification to old email that address was changed
-
-    Args:
-        old_email: User's old email address
-        user_name: User's full name
-        new_email: New email address (partially masked for security)
-
-    Returns:
-        bool: True if email sent successfully
-    """
-    # Mask the new email for security
-    new_email_parts = new_email.split('@')
-    if len(new_email_parts) == 2:
-        masked_email = new_email_parts[0][:2] + "***@" + new_email_parts[1]
-    else:
-        masked_email = "***"
-
-    subject = "Your Splitwiser Email Address Has Been Changed"
-
-    html_content = f"""
+_EMAIL_CHANGE_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background-color: #EF4444; color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; background-color: #f9f9f9; }}
-            .warning {{ background-color: #FEF2F2; border-left: 4px solid #EF4444; padding: 10px; margin: 20px 0; }}
-            .footer {{ padding: 20px; text-align: center; font-size: 12px; color: #666; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background-color: #EF4444; color: white; padding: 20px; text-align: center; }
+            .content { padding: 20px; background-color: #f9f9f9; }
+            .warning { background-color: #FEF2F2; border-left: 4px solid #EF4444; padding: 10px; margin: 20px 0; }
+            .footer { padding: 20px; text-align: center; font-size: 12px; color: #666; }
         </style>
     </head>
     <body>
@@ -297,10 +333,10 @@ async def send_email_change_notification(
                 <h1>Security Alert</h1>
             </div>
             <div class="content">
-                <p>Hi {user_name},</p>
+                <p>Hi ${user_name},</p>
                 <p>This is a security notification that the email address for your Splitwiser account has been changed.</p>
                 <div class="warning">
-                    <strong>New email address:</strong> {masked_email}
+                    <strong>New email address:</strong> ${masked_email}
                 </div>
                 <p>If you made this change, you can safely ignore this email.</p>
                 <p><strong>If you did NOT make this change:</strong></p>
@@ -316,16 +352,16 @@ async def send_email_change_notification(
         </div>
     </body>
     </html>
-    """
+    """)
 
-    text_content = f"""
-Hi {user_name},
+_EMAIL_CHANGE_TEXT = Template("""
+Hi ${user_name},
 
 SECURITY ALERT
 
 This is a security notification that the email address for your Splitwiser account has been changed.
 
-New email address: {masked_email}
+New email address: ${masked_email}
 
 If you made this change, you can safely ignore this email.
 
@@ -336,38 +372,19 @@ If you did NOT make this change:
 
 ---
 This is an automated security message from Splitwiser.
-    """
-
-    return await send_email(old_email, subject, html_content, text_content)
-
-
-async def send_password_changed_notification(
-    user_email: str,
-    user_name: str
-) -> bool:
-    """
-    Send notification that password was changed
-
-    Args:
-        user_email: User's email address
-        user_name: User's full name
-
-    Returns:
-        bool: True if email sent successfully
-    """
-    subject = "Your Splitwiser Password Has Been Changed"
+    """)
 
-    html_content = f"""
+_PASSWORD_CHANGED_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background-color: #10B981; color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; background-color: #f9f9f9; }}
-            .info {{ background-color: #F0FDF4; border-left: 4px solid #10B981; padding: 10px; margin: 20px 0; }}
-            .footer {{ padding: 20px; text-align: center; font-size: 12px; color: #666; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background-color: #10B981; color: white; padding: 20px; text-align: center; }
+            .content { padding: 20px; background-color: #f9f9f9; }
+            .info { background-color: #F0FDF4; border-left: 4px solid #10B981; padding: 10px; margin: 20px 0; }
+            .footer { padding: 20px; text-align: center; font-size: 12px; color: #666; }
         </style>
     </head>
     <body>
@@ -376,7 +393,7 @@ async def send_password_changed_notification(
                 <h1>Password Changed Successfully</h1>
             </div>
             <div class="content">
-                <p>Hi {user_name},</p>
+                <p>Hi ${user_name},</p>
                 <p>This is a confirmation that your Splitwiser account password has been changed successfully.</p>
                 <div class="info">
                     <p>For your security, you have been logged out of all other devices.</p>
@@ -395,10 +412,10 @@ async def send_password_changed_notification(
         </div>
     </body>
     </html>
-    """
+    """)
 
-    text_content = f"""
-Hi {user_name},
+_PASSWORD_CHANGED_TEXT = Template("""
+Hi ${user_name},
 
 This is a confirmation that your Splitwiser account password has been changed successfully.
 
@@ -413,44 +430,21 @@ If you did NOT make this change:
 
 ---
 This is an automated security message from Splitwiser.
-    """
-
-    return await send_email(user_email, subject, html_content, text_content)
-
-
-async def send_friend_request_email(
-    to_email: str,
-    to_name: str,
-    from_name: str
-) -> bool:
-    """
-    Send friend request notification email
-
-    Args:
-        to_email: Email address of the user receiving the friend request
-        to_name: Full name of the user receiving the request
-        from_name: Full name of the user sending the request
+    """)
 
-    Returns:
-        bool: True if email sent successfully
-    """
-    friend_requests_link = f"{FRONTEND_URL}/account"
-
-    subject = f"{from_name} sent you a friend request on Splitwiser"
-
-    html_content = f"""
+_FRIEND_REQUEST_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background-color: #4F46E5; color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; background-color: #f9f9f9; }}
-            .button {{ display: inline-block; padding: 12px 24px; background-color: #4F46E5; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .info {{ background-color: #EFF6FF; border-left: 4px solid #4F46E5; padding: 10px; margin: 20px 0; }}
-            .link-text {{ word-break: break-all; color: #1E40AF; background-color: #EFF6FF; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 14px; }}
-            .footer {{ padding: 20px; text-align: center; font-size: 12px; color: #666; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background-color: #4F46E5; color: white; padding: 20px; text-align: center; }
+            .content { padding: 20px; background-color: #f9f9f9; }
+            .button { display: inline-block; padding: 12px 24px; background-color: #4F46E5; color: white; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+            .info { background-color: #EFF6FF; border-left: 4px solid #4F46E5; padding: 10px; margin: 20px 0; }
+            .link-text { word-break: break-all; color: #1E40AF; background-color: #EFF6FF; padding: 12px; border-radius: 4px; font-family: monospace; font-size: 14px; }
+            .footer { padding: 20px; text-align: center; font-size: 12px; color: #666; }
         </style>
     </head>
     <body>
@@ -459,17 +453,17 @@ async def send_friend_request_email(
                 <h1>New Friend Request</h1>
             </div>
             <div class="content">
-                <p>Hi {to_name},</p>
-                <p><strong>{from_name}</strong> has sent you a friend request on Splitwiser!</p>
+                <p>Hi ${to_name},</p>
+                <p><strong>${from_name}</strong> has sent you a friend request on Splitwiser!</p>
                 <div class="info">
                     <p>Adding friends makes it easy to split expenses and keep track of who owes what.</p>
                 </div>
                 <p>Click the button below to view and respond to the request:</p>
                 <p style="text-align: center;">
-                    <a href="{friend_requests_link}" class="button">View Friend Request</a>
+                    <a href="${friend_requests_link}" class="button">View Friend Request</a>
                 </p>
                 <p>Or copy and paste this link into your browser:</p>
-                <p class="link-text">{friend_requests_link}</p>
+                <p class="link-text">${friend_requests_link}</p>
             </div>
             <div class="footer">
                 <p>This is an automated message from Splitwiser. Please do not reply to this email.</p>
@@ -477,20 +471,183 @@ async def send_friend_request_email(
         </div>
     </body>
     </html>
-    """
+    """)
 
-    text_content = f"""
-Hi {to_name},
+_FRIEND_REQUEST_TEXT = Template("""
+Hi ${to_name},
 
-{from_name} has sent you a friend request on Splitwiser!
+${from_name} has sent you a friend request on Splitwiser!
 
 Adding friends makes it easy to split expenses and keep track of who owes what.
 
 Click the link below to view and respond to the request:
-{friend_requests_link}
+${friend_requests_link}
 
 ---
 This is an automated message from Splitwiser.
+    """)
+
+# Keeps the first two characters of the local part and the domain of an
+# address with exactly one "@"
+_MASK_RE = re.compile(r"^([^@]{0,2})[^@]*(@[^@]*)$")
+
+# name -> (subject, HTML body, text body)
+_TEMPLATES = {
+    "password_reset": (Template("Reset Your Splitwiser Password"), _PASSWORD_RESET_HTML, _PASSWORD_RESET_TEXT),
+    "email_verification": (Template("Verify Your New Email Address - Splitwiser"), _EMAIL_VERIFICATION_HTML, _EMAIL_VERIFICATION_TEXT),
+    "email_change": (Template("Your Splitwiser Email Address Has Been Changed"), _EMAIL_CHANGE_HTML, _EMAIL_CHANGE_TEXT),
+    "password_changed": (Template("Your Splitwiser Password Has Been Changed"), _PASSWORD_CHANGED_HTML, _PASSWORD_CHANGED_TEXT),
+    "friend_request": (Template("${from_name} sent you a friend request on Splitwiser"), _FRIEND_REQUEST_HTML, _FRIEND_REQUEST_TEXT),
+}
+
+
+def _render(name: str, **values: str) -> tuple[str, str, str]:
+    """
+    Return the (subject, html, text) of template `name` filled with `values`
+
+    Values are HTML-escaped for the HTML body only, so a user-controlled name
+    cannot inject markup; the subject and text body use them as-is.
     """
+    subject, html, text = _TEMPLATES[name]
+    html_values = {key: escape(value) for key, value in values.items()}
+    return subject.substitute(values), html.substitute(html_values), text.substitute(values)
 
+
+async def _send_template(to_email: str, name: str, **values: str) -> bool:
+    """Render template `name` and send it, skipping the render when email is off"""
+    if not is_email_configured():
+        logger.error("Email service not configured: BREVO_API_KEY and FROM_EMAIL required")
+        return False
+
+    subject, html_content, text_content = _render(name, **values)
     return await send_email(to_email, subject, html_content, text_content)
+
+
+async def send_password_reset_email(
+    user_email: str,
+    user_name: str,
+    reset_token: str
+) -> bool:
+    """
+    Send password reset email with reset link
+
+    Args:
+        user_email: User's email address
+        user_name: User's full name
+        reset_token: Password reset token (not hashed)
+
+    Returns:
+        bool: True if email sent successfully
+    """
+    reset_link = f"{FRONTEND_URL}/reset-password/{reset_token}"
+
+    return await _send_template(
+        user_email,
+        "password_reset",
+        user_name=user_name,
+        reset_link=reset_link
+    )
+
+
+async def send_email_verification_email(
+    user_email: str,
+    user_name: str,
+    new_email: str,
+    verification_token: str
+) -> bool:
+    """
+    Send email verification link to new email address
+
+    Args:
+        user_email: User's current email (not used, but kept for consistency)
+        user_name: User's full name
+        new_email: New email address to verify
+        verification_token: Email verification token (not hashed)
+
+    Returns:
+        bool: True if email sent successfully
+    """
+    verification_link = f"{FRONTEND_URL}/verify-email/{verification_token}"
+
+    return await _send_template(
+        new_email,
+        "email_verification",
+        user_name=user_name,
+        verification_link=verification_link
+    )
+
+
+async def send_email_change_notification(
+    old_email: str,
+    user_name: str,
+    new_email: str
+) -> bool:
+    """
+    Send notification to old email that address was changed
+
+    Args:
+        old_email: User's old email address
+        user_name: User's full name
+        new_email: New email address (partially masked for security)
+
+    Returns:
+        bool: True if email sent successfully
+    """
+    # Mask the new email for security
+    match = _MASK_RE.match(new_email)
+    masked_email = match.expand(r"\1***\2") if match else "***"
+
+    return await _send_template(
+        old_email,
+        "email_change",
+        user_name=user_name,
+        masked_email=masked_email
+    )
+
+
+async def send_password_changed_notification(
+    user_email: str,
+    user_name: str
+) -> bool:
+    """
+    Send notification that password was changed
+
+    Args:
+        user_email: User's email address
+        user_name: User's full name
+
+    Returns:
+        bool: True if email sent successfully
+    """
+    return await _send_template(
+        user_email,
+        "password_changed",
+        user_name=user_name
+    )
+
+
+async def send_friend_request_email(
+    to_email: str,
+    to_name: str,
+    from_name: str
+) -> bool:
+    """
+    Send friend request notification email
+
+    Args:
+        to_email: Email address of the user receiving the friend request
+        to_name: Full name of the user receiving the request
+        from_name: Full name of the user sending the request
+
+    Returns:
+        bool: True if email sent successfully
+    """
+    friend_requests_link = f"{FRONTEND_URL}/account"
+
+    return await _send_template(
+        to_email,
+        "friend_request",
+        to_name=to_name,
+        from_name=from_name,
+        friend_requests_link=friend_requests_link
+    )
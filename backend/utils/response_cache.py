@@ -0,0 +1,72 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class ResponseCache:
+    """
+    In-memory TTL cache for read endpoint responses.
+
+    Entries are tagged with the write generation they were computed at.
+    Every committed session bumps the generation, so a cached response is
+    only served while nothing has been written since it was built - no
+    per-endpoint invalidation bookkeeping is needed.
+    """
+
+    def __init__(self, ttl_seconds: int = 30):
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.entries: Dict[Hashable, Tuple[Any, int, float]] = {}
+        self.lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing, expired or stale."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        value, generation, expires_at = entry
+        if generation != self.generation or time.monotonic() > expires_at:
+            with self.lock:
+                if self.entries.get(key) is entry:
+                    del self.entries[key]
+            return None
+
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int):
+        """
+        Store a value computed at `generation`.
+
+        Callers read self.generation before querying; if a write committed
+        in the meantime, the value is already stale and is dropped.
+        """
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (value, generation, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self):
+        """Discard every cached response."""
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+
+# 30 second cache for friend list / friend balance reads
+# Note: In a real distributed system, use Redis. For this app (single uvicorn
+# process), memory is fine.
+friends_cache = ResponseCache(ttl_seconds=30)
+
+# Shared expense lists are the heaviest friend read, so they are kept longer;
+# a commit still invalidates them immediately
+friend_expenses_cache = ResponseCache(ttl_seconds=120)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    friends_cache.invalidate()
+    friend_expenses_cache.invalidate()
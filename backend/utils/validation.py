@@ -1,5 +1,6 @@
 """Validation utilities for group membership, access control, and expense participants."""
 
+from sqlalchemy import and_, lambda_stmt, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -22,13 +23,39 @@ def get_group_or_404(db: Session, group_id: int):
 
 def verify_group_membership(db: Session, group_id: int, user_id: int):
     """Verify that a user is a member of a group, raise 403 if not."""
-    member = db.query(models.GroupMember).filter(
-        models.GroupMember.group_id == group_id,
-        models.GroupMember.user_id == user_id
-    ).first()
-    if not member:
+    is_member = db.query(
+        db.query(models.GroupMember).filter(
+            models.GroupMember.group_id == group_id,
+            models.GroupMember.user_id == user_id
+        ).exists()
+    ).scalar()
+    if not is_member:
         raise HTTPException(status_code=403, detail="You are not a member of this group")
-    return member
+
+
+def get_group_for_member(db: Session, group_id: int, user_id: int):
+    """Get a group the user belongs to in one query.
+
+    Raises 404 if the group does not exist and 403 if the user is not a
+    member - the same checks as get_group_or_404 followed by
+    verify_group_membership, without the second round-trip.
+    """
+    # Runs on nearly every group endpoint, so it is a cached lambda statement:
+    # built and compiled once, with group_id / user_id bound per call
+    row = db.execute(lambda_stmt(lambda: select(models.Group, models.GroupMember.id).outerjoin(
+        models.GroupMember,
+        and_(
+            models.GroupMember.group_id == models.Group.id,
+            models.GroupMember.user_id == user_id
+        )
+    ).where(models.Group.id == group_id))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    group, member_id = row
+    if member_id is None:
+        raise HTTPException(status_code=403, detail="You are not a member of this group")
+    return group
 
 
 def verify_group_ownership(db: Session, group_id: int, user_id: int):
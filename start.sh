@@ -6,8 +6,9 @@ echo "Running database initialization..."
 python init_db.py
 
 # Run migrations to ensure all updates are applied
+# (tracked via PRAGMA user_version, so this is a no-op once up to date)
 echo "Running migrations..."
-python migrations/add_profile_password_recovery.py --db-path "$DATABASE_PATH"
+python migrations/run_migrations.py --db-path "$DATABASE_PATH"
 
 # Start supervisor
 echo "Starting Supervisor..."